@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Prueba de carga en proceso de la API (sin red).
+
+Envía una mezcla configurable de peticiones a /api/optimize, /api/ingredients
+y / directamente contra la aplicación ASGI, con concurrencia fija, e informa
+en JSON del rendimiento y de la latencia p50/p95/p99 por ruta. Con
+--baseline compara contra una ejecución guardada y termina con código 1 si
+la latencia o el rendimiento empeoran más de la tolerancia.
+
+Uso (desde la raíz del repositorio):
+    python -m scripts.benchmark_api --requests 5000 --concurrency 32
+    python -m scripts.benchmark_api --save-baseline benchmarks/api.json
+    python -m scripts.benchmark_api --baseline benchmarks/api.json --tolerance 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+import numpy as np
+
+from src.api import main as api
+
+# Ruta -> (método, ruta HTTP)
+ENDPOINTS = {
+    "optimize": ("POST", "/api/optimize"),
+    "ingredients": ("GET", "/api/ingredients"),
+    "home": ("GET", "/"),
+}
+DEFAULT_MIX = "optimize=8,ingredients=1,home=1"
+PERCENTILES = (50, 95, 99)
+# Métricas comparadas con la línea base: latencias (más es peor) y rendimiento (menos es peor)
+LATENCY_KEYS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """ "optimize=8,ingredients=1,home=1" -> pesos por ruta."""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"Ruta desconocida en la mezcla: {name}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def build_schedule(args) -> List[Tuple[str, dict]]:
+    """
+    Secuencia fija (con semilla) de peticiones. Los objetivos de optimización
+    se toman de un conjunto de --distinct-targets combinaciones, así que la
+    proporción de aciertos de caché es controlable.
+    """
+    rng = random.Random(args.seed)
+    targets = [
+        {
+            "target_protein": round(rng.uniform(8, 25), 1),
+            "target_carbs": round(rng.uniform(45, 80), 1),
+            "target_fiber": round(rng.uniform(3, 10), 1),
+            "max_cost": round(rng.uniform(3, 10), 1),
+        }
+        for _ in range(args.distinct_targets)
+    ]
+    names = list(args.mix)
+    weights = [args.mix[name] for name in names]
+    schedule = []
+    for name in rng.choices(names, weights, k=args.warmup + args.requests):
+        payload = rng.choice(targets) if name == "optimize" else None
+        schedule.append((name, payload))
+    return schedule
+
+
+async def run(args) -> dict:
+    schedule = build_schedule(args)
+    warmup, measured = schedule[: args.warmup], schedule[args.warmup :]
+    latencies: Dict[str, List[float]] = {name: [] for name in args.mix}
+    errors: Dict[str, int] = {name: 0 for name in args.mix}
+
+    async with httpx.AsyncClient(app=api.app, base_url="http://benchmark") as client:
+
+        async def send(name: str, payload) -> Tuple[float, bool]:
+            method, path = ENDPOINTS[name]
+            started = time.perf_counter()
+            response = await client.request(
+                method, path, json=payload, headers={"Accept-Encoding": "gzip, br"}
+            )
+            return time.perf_counter() - started, response.status_code < 400
+
+        async def worker(queue: List[Tuple[str, dict]], record: bool):
+            while queue:
+                name, payload = queue.pop()
+                elapsed, ok = await send(name, payload)
+                if record:
+                    latencies[name].append(elapsed)
+                    errors[name] += not ok
+
+        async def drive(requests: List[Tuple[str, dict]], record: bool) -> float:
+            queue = list(reversed(requests))
+            started = time.perf_counter()
+            await asyncio.gather(*(worker(queue, record) for _ in range(args.concurrency)))
+            return time.perf_counter() - started
+
+        await drive(warmup, record=False)
+        elapsed = await drive(measured, record=True)
+
+    routes = {
+        name: summarize(samples, errors[name], elapsed) for name, samples in latencies.items()
+    }
+    everything = [sample for samples in latencies.values() for sample in samples]
+    return {
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "mix": args.mix,
+            "distinct_targets": args.distinct_targets,
+            "seed": args.seed,
+            # Las líneas base solo son comparables con la misma ejecución del solver
+            "solver_executor": api.SOLVER_EXECUTOR.mode,
+            "solver_workers": api.SOLVER_EXECUTOR.max_workers,
+        },
+        "total": summarize(everything, sum(errors.values()), elapsed),
+        "routes": routes,
+    }
+
+
+def summarize(samples: List[float], errors: int, elapsed: float) -> dict:
+    if not samples:
+        return {"requests": 0, "errors": errors}
+    milliseconds = np.asarray(samples) * 1000.0
+    summary = {
+        "requests": len(samples),
+        "errors": errors,
+        "throughput_rps": len(samples) / elapsed,
+        "mean_ms": float(milliseconds.mean()),
+    }
+    for q, value in zip(PERCENTILES, np.percentile(milliseconds, PERCENTILES)):
+        summary[f"p{q}_ms"] = float(value)
+    return summary
+
+
+def compare_to_baseline(
+    report: dict, baseline: dict, tolerance: float, slack_ms: float = 0.0
+) -> List[str]:
+    """
+    Regresiones frente a la línea base (lista vacía si no hay ninguna). Una
+    latencia empeora si supera la anterior en más de `tolerance` (relativo)
+    y de `slack_ms` (absoluto, para no saltar por el ruido de submilisegundos).
+    """
+    regressions = []
+    for route, current in [("total", report["total"])] + list(report["routes"].items()):
+        previous = baseline["total"] if route == "total" else baseline.get("routes", {}).get(route)
+        if not previous or not current.get("requests"):
+            continue
+        for key in LATENCY_KEYS:
+            if key in previous and current[key] > previous[key] * (1 + tolerance) + slack_ms:
+                regressions.append(
+                    f"{route} {key}: {current[key]:.2f} > {previous[key]:.2f} (+{tolerance:.0%})"
+                )
+        floor = previous.get("throughput_rps", 0.0) * (1 - tolerance)
+        if current["throughput_rps"] < floor:
+            regressions.append(
+                f"{route} throughput_rps: {current['throughput_rps']:.1f} < "
+                f"{previous['throughput_rps']:.1f} (-{tolerance:.0%})"
+            )
+        if current["errors"] > previous.get("errors", 0):
+            regressions.append(f"{route} errors: {current['errors']} > {previous.get('errors', 0)}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=2000, help="peticiones medidas")
+    parser.add_argument("--warmup", type=int, default=200, help="peticiones previas sin medir")
+    parser.add_argument("--concurrency", type=int, default=16, help="peticiones simultáneas")
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=parse_mix(DEFAULT_MIX),
+        help=f"pesos por ruta (por defecto {DEFAULT_MIX})",
+    )
+    parser.add_argument(
+        "--distinct-targets",
+        type=int,
+        default=500,
+        help="combinaciones de objetivos distintas para /api/optimize",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="fichero del informe JSON (por defecto, stdout)")
+    parser.add_argument("--baseline", help="informe JSON previo con el que comparar")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="empeoramiento relativo admitido frente a la línea base",
+    )
+    parser.add_argument(
+        "--slack-ms",
+        type=float,
+        default=0.5,
+        help="empeoramiento absoluto de latencia que se ignora",
+    )
+    parser.add_argument("--save-baseline", help="guarda este informe como nueva línea base")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("config") != report["config"]:
+            print("⚠️ La línea base se midió con otra configuración", file=sys.stderr)
+        report["regressions"] = compare_to_baseline(report, baseline, args.tolerance, args.slack_ms)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+    if report.get("regressions"):
+        for regression in report["regressions"]:
+            print(f"🚨 Regresión: {regression}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Escalabilidad de DoughFormulator con catálogos sintéticos.
+
+Genera catálogos de ingredientes repartidos entre muchas categorías (por
+defecto 10², 10³, 10⁴ y 10⁵ entradas) y mide en cada uno la carga del
+catálogo (en frío, compilando la caché, y en caliente, proyectándola),
+`evaluate_formulation` y `optimize_formulation`. Informa en JSON de las
+latencias y de los picos de memoria: el de asignaciones de Python/NumPy de
+cada fase (tracemalloc, medido en una pasada aparte para no distorsionar
+los tiempos) y el RSS máximo del proceso tras cada tamaño.
+
+Uso (desde la raíz del repositorio):
+    python -m scripts.benchmark_formulator
+    python -m scripts.benchmark_formulator --sizes 100,1000 --output benchmarks/formulator.json
+    python -m scripts.benchmark_formulator --blend-size 2 --sizes 100,1000,10000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows: sin RSS máximo, solo tracemalloc
+    resource = None
+
+from src.trivo_plm.domain.catalog import CatalogProvider
+from src.trivo_plm.domain.models.dough_formulator import DoughFormulation, DoughFormulator
+
+DEFAULT_SIZES = "100,1000,10000,100000"
+NUTRIENTS = ("protein", "fiber", "fat", "carbohydrates")
+TEXTURES = ("elasticity", "firmness", "moisture")
+COLORS = ("cream", "beige", "brown", "yellow", "red", "green", "white")
+PERCENTILES = (50, 95, 99)
+
+
+def generate_catalog(size: int, categories: int, seed: int) -> Dict[str, Dict[str, dict]]:
+    """Catálogo categoría→nombre→propiedades con el formato de data/ingredients.json."""
+    rng = np.random.default_rng(seed)
+    nutrients = rng.uniform(0.0, 80.0, (size, len(NUTRIENTS))).round(2).tolist()
+    textures = rng.uniform(0.0, 1.0, (size, len(TEXTURES))).round(3).tolist()
+    # Algunos ingredientes no declaran todas sus propiedades, como en el catálogo real
+    declared = (rng.random((size, len(NUTRIENTS) + len(TEXTURES))) > 0.1).tolist()
+    costs = rng.uniform(0.5, 15.0, size).round(2).tolist()
+    availability = rng.uniform(0.1, 1.0, size).round(2).tolist()
+    sustainability = rng.uniform(0.1, 1.0, size).round(2).tolist()
+    colors = rng.integers(0, len(COLORS), size).tolist()
+
+    catalog: Dict[str, Dict[str, dict]] = {}
+    for i in range(size):
+        category = f"category_{i % categories:03d}"
+        name = f"ingredient_{i:06d}"
+        has = declared[i]
+        catalog.setdefault(category, {})[name] = {
+            "name": name,
+            "color": COLORS[colors[i]],
+            "nutritional_value": {
+                nutrient: value for nutrient, value, ok in zip(NUTRIENTS, nutrients[i], has) if ok
+            },
+            "cost": costs[i],
+            "availability": availability[i],
+            "sustainability_score": sustainability[i],
+            "texture_properties": {
+                texture: value
+                for texture, value, ok in zip(TEXTURES, textures[i], has[len(NUTRIENTS) :])
+                if ok
+            },
+        }
+    return catalog
+
+
+def random_formulations(
+    names: List[str], count: int, ingredients: int, seed: int
+) -> List[DoughFormulation]:
+    """Formulaciones de `ingredients` ingredientes al azar con proporciones que suman 1."""
+    rng = np.random.default_rng(seed)
+    formulations = []
+    for _ in range(count):
+        chosen = rng.choice(len(names), size=min(ingredients, len(names)), replace=False)
+        proportions = rng.dirichlet(np.ones(chosen.size))
+        formulations.append(
+            DoughFormulation(
+                ingredients=[{names[i]: float(p)} for i, p in zip(chosen, proportions)],
+                target_properties={},
+                nutritional_profile={},
+                cost=float(rng.uniform(1.0, 10.0)),
+                sustainability_score=float(rng.uniform(0.1, 1.0)),
+            )
+        )
+    return formulations
+
+
+def random_targets(count: int, seed: int) -> List[Dict[str, float]]:
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "protein": round(float(rng.uniform(5, 25)), 1),
+            "fiber": round(float(rng.uniform(2, 10)), 1),
+        }
+        for _ in range(count)
+    ]
+
+
+def time_calls(calls: List[Callable[[], object]]) -> dict:
+    """Latencias de cada llamada (en orden) resumidas en ms."""
+    samples = []
+    for call in calls:
+        started = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+def summarize(samples: List[float]) -> dict:
+    milliseconds = np.asarray(samples) * 1000.0
+    summary = {
+        "calls": len(samples),
+        "total_ms": float(milliseconds.sum()),
+        "mean_ms": float(milliseconds.mean()),
+    }
+    for q, value in zip(PERCENTILES, np.percentile(milliseconds, PERCENTILES)):
+        summary[f"p{q}_ms"] = float(value)
+    return summary
+
+
+def peak_allocated(call: Callable[[], object]) -> int:
+    """Pico de memoria asignada (bytes) durante una llamada, según tracemalloc."""
+    tracemalloc.start()
+    try:
+        call()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def max_rss_bytes() -> int:
+    """RSS máximo del proceso hasta ahora (0 si la plataforma no lo da)."""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo da en KiB y macOS en bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure(size: int, args, directory: str) -> dict:
+    """Todas las fases para un catálogo de `size` ingredientes."""
+    started = time.perf_counter()
+    catalog = generate_catalog(size, args.categories, args.seed)
+    path = os.path.join(directory, f"ingredients-{size}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(catalog, f)
+    names = [name for ingredients in catalog.values() for name in ingredients]
+    del catalog
+    result = {
+        "size": size,
+        "categories": min(size, args.categories),
+        "json_bytes": os.path.getsize(path),
+        "generate_ms": (time.perf_counter() - started) * 1000.0,
+    }
+
+    def load() -> DoughFormulator:
+        # Proveedor propio: el compartido del proceso devolvería la versión ya cargada
+        return DoughFormulator(CatalogProvider(path), score_cache_size=0)
+
+    # En frío se lee el JSON y se compila la caché; en caliente se proyecta la caché
+    result["load_ingredients_cold"] = time_calls([load])
+    result["load_ingredients_warm"] = time_calls([load] * args.load_repeats)
+    formulator = load()
+
+    formulations = random_formulations(names, args.evaluations, args.ingredients, args.seed)
+    targets = random_targets(args.optimizations, args.seed)
+    phases = {
+        "evaluate_formulation": [
+            lambda f=f: formulator.evaluate_formulation(f) for f in formulations
+        ],
+        "optimize_formulation": [lambda t=t: formulator.optimize_formulation(t) for t in targets],
+        "optimize_formulation_top_k": [
+            lambda t=t: formulator.optimize_formulation(t, top_k=args.top_k) for t in targets
+        ],
+    }
+    if args.blend_size > 1:
+        phases["optimize_formulation_blend"] = [
+            lambda t=t: formulator.optimize_formulation(t, blend_size=args.blend_size)
+            for t in targets
+        ]
+    for phase, calls in phases.items():
+        result[phase] = time_calls(calls)
+
+    memory = {}
+    if not args.skip_memory:
+        # La caché compilada se borra para repetir la carga en frío con tracemalloc activo
+        for name in os.listdir(directory):
+            if name.startswith(f"ingredients-{size}.compiled"):
+                os.unlink(os.path.join(directory, name))
+        memory["load_ingredients_cold_peak_bytes"] = peak_allocated(load)
+        memory["load_ingredients_warm_peak_bytes"] = peak_allocated(load)
+        for phase, calls in phases.items():
+            memory[f"{phase}_peak_bytes"] = peak_allocated(calls[0])
+    memory["max_rss_bytes"] = max_rss_bytes()
+    result["memory"] = memory
+    formulator.close()
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--sizes",
+        default=DEFAULT_SIZES,
+        help=f"tamaños de catálogo, separados por comas ({DEFAULT_SIZES})",
+    )
+    parser.add_argument(
+        "--categories",
+        type=int,
+        default=200,
+        help="categorías entre las que se reparten los ingredientes",
+    )
+    parser.add_argument(
+        "--evaluations",
+        type=int,
+        default=200,
+        help="llamadas medidas a evaluate_formulation por tamaño",
+    )
+    parser.add_argument(
+        "--ingredients", type=int, default=3, help="ingredientes por formulación evaluada"
+    )
+    parser.add_argument(
+        "--optimizations",
+        type=int,
+        default=10,
+        help="llamadas medidas a optimize_formulation por tamaño",
+    )
+    parser.add_argument("--top-k", type=int, default=10, help="alternativas en la fase top_k")
+    parser.add_argument(
+        "--blend-size",
+        type=int,
+        default=0,
+        help="si es > 1, mide también la búsqueda de mezclas de ese tamaño",
+    )
+    parser.add_argument(
+        "--load-repeats", type=int, default=3, help="cargas en caliente medidas por tamaño"
+    )
+    parser.add_argument(
+        "--skip-memory",
+        action="store_true",
+        help="no repetir las fases con tracemalloc (solo RSS máximo)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="fichero del informe JSON (por defecto, stdout)")
+    args = parser.parse_args(argv)
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+
+    report = {
+        "config": {
+            "sizes": sizes,
+            "categories": args.categories,
+            "evaluations": args.evaluations,
+            "ingredients": args.ingredients,
+            "optimizations": args.optimizations,
+            "top_k": args.top_k,
+            "blend_size": args.blend_size,
+            "seed": args.seed,
+        },
+        "results": [],
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            print(f"⏱️ Catálogo de {size} ingredientes...", file=sys.stderr)
+            try:
+                report["results"].append(measure(size, args, directory))
+            except MemoryError as e:
+                # El punto en el que DoughFormulator deja de escalar también es un resultado
+                report["results"].append({"size": size, "error": f"MemoryError: {e}"})
+                break
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,8 +6,10 @@ import datetime
 import logging
 import os
 import random
-from functools import partial
-from typing import Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from itertools import repeat
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -15,9 +17,9 @@ import pandas as pd
 from deap import base, creator, tools
 from pydantic import BaseModel
 
-from src.core.models.ingredient import Ingredient
-from src.core.models.recipe import Recipe
-from src.core.services.usda_service import USDAService
+from src.trivo_plm.domain.catalog import IngredientMatrix
+from src.trivo_plm.domain.models.ingredient import Ingredient
+from src.trivo_plm.domain.models.recipe import Recipe
 
 # ----------------------------------------------------------------------
 # 1. CONFIGURACIÓN DE LOGGING Y CARPETAS
@@ -106,6 +108,37 @@ except FileNotFoundError:
     INGREDIENTS_DATA = df.set_index("ingredient").to_dict("index")
     logging.info("Datos simulados creados en memoria.")
 
+
+def cargar_catalogo(ingredients_data, ingredient_costs):
+    """
+    Fija los datos y costos de ingredientes del módulo, precalcula por fila
+    las propiedades derivadas y vacía la caché de `vectores_propiedades`.
+    Los workers de PoolGenetico la llaman al arrancar con los del proceso
+    principal.
+    """
+    global INGREDIENTS_DATA, INGREDIENT_COSTS, INGREDIENT_MATRIX
+    global DENSIDADES, ELASTICIDADES, SODIO, PROTEINAS
+    INGREDIENTS_DATA = ingredients_data
+    INGREDIENT_COSTS = ingredient_costs
+    # Catálogo en forma de matriz y propiedades derivadas precalculadas por fila
+    INGREDIENT_MATRIX = IngredientMatrix.from_records(INGREDIENTS_DATA)
+    DENSIDADES = INGREDIENT_MATRIX.column("density", 0.5)
+    ELASTICIDADES = np.where(
+        np.isnan(INGREDIENT_MATRIX.column("elasticity", np.nan)),
+        np.minimum(
+            1.0,
+            0.01 * INGREDIENT_MATRIX.column("carbs", 0.0)
+            + 0.02 * INGREDIENT_MATRIX.column("protein", 0.0)
+            + 0.005 * INGREDIENT_MATRIX.column("fat", 0.0),
+        ),
+        INGREDIENT_MATRIX.column("elasticity", np.nan),
+    )
+    SODIO = INGREDIENT_MATRIX.column("sodium", 0.0)
+    PROTEINAS = INGREDIENT_MATRIX.column("protein", 0.0)
+    # Los vectores guardados se calcularon con el catálogo anterior
+    vectores_propiedades.cache_clear()
+
+
 # ----------------------------------------------------------------------
 # 4. CREACIÓN DE FITNESS E INDIVIDUOS
 #    Minimizar densidad, costo y también (negativo de) elasticidad
@@ -119,75 +152,101 @@ toolbox = base.Toolbox()
 # ----------------------------------------------------------------------
 # 5. FUNCIONES AUXILIARES
 # ----------------------------------------------------------------------
+def _propiedad(ingredientes, valores, defecto):
+    """Vector de una propiedad precalculada para una lista de ingredientes."""
+    filas = INGREDIENT_MATRIX.rows(ingredientes)
+    return np.where(filas >= 0, valores[filas], defecto)
+
+
 def estimar_densidad_ingrediente(ing):
-    data = INGREDIENTS_DATA.get(ing.lower(), {})
     # Valor por defecto si no existe
-    return data.get("density", 0.5)
+    return float(_propiedad([ing.lower()], DENSIDADES, 0.5)[0])
 
 
 def estimar_elasticidad_ingrediente(ing):
-    data = INGREDIENTS_DATA.get(ing.lower(), {})
-    if "elasticity" in data:
-        return data["elasticity"]
-    carbs = data.get("carbs", 0)
-    protein = data.get("protein", 0)
-    fat = data.get("fat", 0)
-    # Ejemplo sencillo
-    return min(1.0, 0.01 * carbs + 0.02 * protein + 0.005 * fat)
+    # Sin datos de elasticidad se estima a partir de carbohidratos, proteína y grasa
+    return float(_propiedad([ing.lower()], ELASTICIDADES, 0.0)[0])
 
 
 def calcular_sodio(receta):
-    return sum(
-        INGREDIENTS_DATA.get(ing, {}).get("sodium", 0) * prop for ing, prop in receta.items()
-    )
+    return float(_propiedad(receta, SODIO, 0.0) @ np.fromiter(receta.values(), float))
 
 
 def calcular_proteinas(receta):
-    return sum(
-        INGREDIENTS_DATA.get(ing, {}).get("protein", 0) * prop for ing, prop in receta.items()
-    )
+    return float(_propiedad(receta, PROTEINAS, 0.0) @ np.fromiter(receta.values(), float))
 
 
 def calcular_contribuciones(receta):
-    densidad = 0.0
-    elasticidad = 0.0
-    for ing, prop in receta.items():
-        densidad += estimar_densidad_ingrediente(ing) * prop
-        elasticidad += estimar_elasticidad_ingrediente(ing) * prop
+    ingredientes = [ing.lower() for ing in receta]
+    props = np.fromiter(receta.values(), float)
+    densidad = float(_propiedad(ingredientes, DENSIDADES, 0.5) @ props)
+    elasticidad = float(_propiedad(ingredientes, ELASTICIDADES, 0.0) @ props)
     return densidad, elasticidad
 
 
-def evaluate_individual(individual, masa_name, all_ingredients):
-    """Devuelve (densidad, costo, -elasticidad)."""
-    receta = dict(zip(all_ingredients, individual))
-    base_ing = BASE_INGREDIENTS[masa_name]
+# Penalización de los individuos sin ingrediente base
+FITNESS_INVALIDO = 9999.0
 
-    # Penalizamos si el ingrediente base está en 0
-    if receta.get(base_ing, 0) <= 0:
-        return (9999.0, 9999.0, 9999.0)
 
-    densidad, elasticidad = calcular_contribuciones(receta)
-    sodio = calcular_sodio(receta)
-    proteinas = calcular_proteinas(receta)
+@lru_cache(maxsize=None)
+def vectores_propiedades(all_ingredients: Tuple[str, ...]) -> np.ndarray:
+    """
+    Matriz (ingredientes × 5) con densidad, elasticidad, sodio, proteína y
+    costo de cada ingrediente, en el orden de los genes del individuo.
+    """
+    ingredientes = [ing.lower() for ing in all_ingredients]
+    vectores = np.column_stack(
+        [
+            _propiedad(ingredientes, DENSIDADES, 0.5),
+            _propiedad(ingredientes, ELASTICIDADES, 0.0),
+            _propiedad(all_ingredients, SODIO, 0.0),
+            _propiedad(all_ingredients, PROTEINAS, 0.0),
+            [INGREDIENT_COSTS.get(ing, 0.1) for ing in all_ingredients],
+        ]
+    )
+    vectores.flags.writeable = False
+    return vectores
+
+
+cargar_catalogo(INGREDIENTS_DATA, INGREDIENT_COSTS)
+
+
+def evaluate_population(population, masa_name, all_ingredients: Sequence[str]) -> np.ndarray:
+    """
+    Fitness (densidad, costo, -elasticidad) de toda la población a la vez:
+    una fila por individuo, con las mismas penalizaciones y bonus que
+    `evaluate_individual`.
+    """
+    all_ingredients = tuple(all_ingredients)
+    proporciones = np.asarray(population, dtype=float).reshape(-1, len(all_ingredients))
+    densidad, elasticidad, sodio, proteinas, costo = (
+        proporciones @ vectores_propiedades(all_ingredients)
+    ).T
 
     # Penalizaciones suaves
-    if sodio > 400:
-        densidad += 200.0
-    if proteinas < 6:
-        elasticidad -= 200.0
+    densidad = densidad + np.where(sodio > 400, 200.0, 0.0)
+    elasticidad = elasticidad - np.where(proteinas < 6, 200.0, 0.0)
 
     # Bonus por vinagre
-    if receta.get("vinegar", 0) > 0.01:
-        elasticidad += 0.05
-
-    # Costo
-    costo = 0.0
-    for ing, prop in receta.items():
-        c = INGREDIENT_COSTS.get(ing, 0.1)
-        costo += c * prop
+    if "vinegar" in all_ingredients:
+        vinagre = proporciones[:, all_ingredients.index("vinegar")]
+        elasticidad = elasticidad + np.where(vinagre > 0.01, 0.05, 0.0)
 
     # Minimizar densidad, costo y -elasticidad (=> maximizar elasticidad)
-    return (densidad, costo, -elasticidad)
+    fitness = np.column_stack([densidad, costo, -elasticidad])
+
+    # Penalizamos si el ingrediente base está en 0
+    base_ing = BASE_INGREDIENTS[masa_name]
+    if base_ing in all_ingredients:
+        fitness[proporciones[:, all_ingredients.index(base_ing)] <= 0] = FITNESS_INVALIDO
+    else:
+        fitness[:] = FITNESS_INVALIDO
+    return fitness
+
+
+def evaluate_individual(individual, masa_name, all_ingredients):
+    """Devuelve (densidad, costo, -elasticidad)."""
+    return tuple(evaluate_population([individual], masa_name, all_ingredients)[0].tolist())
 
 
 def suggest_substitutes(ing):
@@ -271,11 +330,18 @@ def crear_receta_inicial(masa_name, all_ingredients):
 # ----------------------------------------------------------------------
 # 8. ALGORITMO GENÉTICO MÍNIMO (EA MU+LAMBDA)
 # ----------------------------------------------------------------------
+def assign_fitness(individuals, toolbox):
+    """Evalúa a todos los individuos en una sola llamada vectorizada."""
+    fitnesses = toolbox.evaluate_population(individuals)
+    for ind, values in zip(individuals, fitnesses.tolist()):
+        ind.fitness.values = tuple(values)
+
+
 def evaluate_and_repair_population(population, toolbox):
     """Evalúa y repara cada individuo de la población."""
     for ind in population:
         toolbox.repair(ind)
-        ind.fitness.values = toolbox.evaluate(ind)
+    assign_fitness(population, toolbox)
 
 
 def create_offspring(parents, lambda_, toolbox, cxpb, mutpb):
@@ -313,9 +379,7 @@ def custom_ea_mu_plus_lambda(population, toolbox, mu, lambda_, cxpb, mutpb, ngen
         parents = list(map(toolbox.clone, parents))
 
         offspring = create_offspring(parents, lambda_, toolbox, cxpb, mutpb)
-
-        for ind in offspring:
-            ind.fitness.values = toolbox.evaluate(ind)
+        assign_fitness(offspring, toolbox)
 
         population = parents + offspring
         population = toolbox.select(population, mu + lambda_)
@@ -324,7 +388,368 @@ def custom_ea_mu_plus_lambda(population, toolbox, mu, lambda_, cxpb, mutpb, ngen
 
 
 # ----------------------------------------------------------------------
-# 9. GUARDAR ARCHIVOS DE RESULTADOS
+# 9. MOTOR GENÉTICO VECTORIZADO (POBLACIÓN COMO MATRIZ)
+#    Mismo EA mu+lambda con NSGA-II, pero cada generación se hace con
+#    operaciones sobre la matriz (individuos × ingredientes)
+# ----------------------------------------------------------------------
+# Límites de reparación por ingrediente (los de repair_individual); el resto va en [0, 1]
+LIMITES_REPARACION = {
+    "water": (0.4, 0.6),
+    CORN_STARCH: (0.05, 1.0),
+    XANTHAN_GUM: (0.005, 1.0),
+    "vinegar": (0.01, 1.0),
+}
+LIMITES_BASE = (0.2, 0.5)
+# Rangos de la receta inicial (los de crear_receta_inicial); el resto sale de [0, 0.1]
+RANGOS_INICIALES = {
+    "water": (0.4, 0.6),
+    CORN_STARCH: (0.05, 0.15),
+    XANTHAN_GUM: (0.005, 0.02),
+    "vinegar": (0.01, 0.02),
+}
+RANGO_BASE_INICIAL = (0.2, 0.3)
+RANGO_INICIAL = (0.0, 0.1)
+# Pares de individuos comparados por bloque al ordenar por dominancia (acota la memoria)
+BLOQUE_DOMINANCIA = 4_000_000
+
+
+def _limites(masa_name, all_ingredients, tabla, base, defecto):
+    """Vectores (mínimos, máximos) por gen a partir de una tabla por ingrediente."""
+    base_ing = BASE_INGREDIENTS[masa_name]
+    limites = [base if ing == base_ing else tabla.get(ing, defecto) for ing in all_ingredients]
+    return np.array([lo for lo, _ in limites]), np.array([hi for _, hi in limites])
+
+
+def repair_population(poblacion, minimos, maximos):
+    """Recorta cada gen a sus límites y normaliza cada fila para que sume 1."""
+    poblacion = np.clip(poblacion, minimos, maximos)
+    totales = poblacion.sum(axis=1, keepdims=True)
+    # Fallback si todo se va a 0
+    uniforme = np.full_like(poblacion, 1.0 / poblacion.shape[1])
+    return np.divide(poblacion, totales, out=uniforme, where=totales > 0)
+
+
+def crear_poblacion_inicial(n, masa_name, all_ingredients, rng):
+    """Matriz de `n` recetas iniciales (como crear_receta_inicial), ya normalizadas."""
+    minimos, maximos = _limites(
+        masa_name, all_ingredients, RANGOS_INICIALES, RANGO_BASE_INICIAL, RANGO_INICIAL
+    )
+    poblacion = rng.uniform(minimos, maximos, (n, len(all_ingredients)))
+    return poblacion / poblacion.sum(axis=1, keepdims=True)
+
+
+def cx_blend_population(padres1, padres2, alpha, rng):
+    """cxBlend de DEAP sobre pares de filas: devuelve los dos hijos de cada par."""
+    gamma = (1.0 + 2.0 * alpha) * rng.random(padres1.shape) - alpha
+    hijos1 = (1.0 - gamma) * padres1 + gamma * padres2
+    hijos2 = gamma * padres1 + (1.0 - gamma) * padres2
+    return hijos1, hijos2
+
+
+def mut_gaussian_population(poblacion, sigma, indpb, rng):
+    """mutGaussian de DEAP (media 0) aplicado a todas las filas."""
+    mascara = rng.random(poblacion.shape) < indpb
+    return poblacion + np.where(mascara, rng.normal(0.0, sigma, poblacion.shape), 0.0)
+
+
+def _contar_dominadores(unicos, filas, candidatos):
+    """
+    Cuántos puntos de `filas` dominan a cada uno de `candidatos` (índices de
+    `unicos`, puntos distintos en orden lexicográfico sin el primer objetivo).
+    """
+    domina = filas[None, :] < candidatos.astype(np.int32)[:, None]
+    for objetivo in range(unicos.shape[1]):
+        domina &= unicos[filas, objetivo][None, :] <= unicos[candidatos, objetivo][:, None]
+    return np.count_nonzero(domina, axis=1)
+
+
+def frentes_no_dominados(fitness, limite=None, mapa=map):
+    """
+    Frente de Pareto (0, 1, 2...) de cada fila de `fitness` (a minimizar).
+    Con `limite` se deja de ordenar en cuanto los frentes asignados cubren
+    `limite` filas; las que quedan reciben `len(fitness)`.
+
+    Los duplicados se ordenan una sola vez. En orden lexicográfico, un punto
+    solo puede estar dominado por uno anterior, que ya es menor o igual en el
+    primer objetivo: basta comparar el resto. Los pares se comparan por
+    bloques de BLOQUE_DOMINANCIA para no materializar la matriz N × N; con
+    `mapa` (p. ej. PoolGenetico.map) los bloques se reparten entre procesos.
+    """
+    fitness = np.asarray(fitness, dtype=float)
+    n = len(fitness)
+    orden = np.lexsort(fitness.T[::-1])
+    ordenados = fitness[orden]
+    nuevo = np.ones(n, dtype=bool)
+    nuevo[1:] = np.any(ordenados[1:] != ordenados[:-1], axis=1)
+    grupos = np.empty(n, dtype=np.intp)
+    grupos[orden] = np.cumsum(nuevo) - 1
+    unicos = ordenados[nuevo][:, 1:]
+    repeticiones = np.bincount(grupos)
+    m = len(unicos)
+
+    def dominadores(filas, candidatos):
+        """Cuántos de `filas` dominan a cada uno de `candidatos`, por bloques."""
+        paso = max(1, BLOQUE_DOMINANCIA // max(1, len(filas)))
+        bloques = [candidatos[i : i + paso] for i in range(0, len(candidatos), paso)]
+        cuentas = mapa(_contar_dominadores, repeat(unicos), repeat(filas.astype(np.int32)), bloques)
+        return np.concatenate([np.zeros(0, dtype=np.intp)] + list(cuentas))
+
+    # Dominadores de cada punto: solo hace falta mirar los anteriores en el orden
+    paso = max(1, BLOQUE_DOMINANCIA // max(1, m))
+    bloques = [np.arange(inicio, min(m, inicio + paso)) for inicio in range(0, m, paso)]
+    anteriores = [np.arange(bloque[-1] + 1, dtype=np.int32) for bloque in bloques]
+    cuentas = mapa(_contar_dominadores, repeat(unicos), anteriores, bloques)
+    cuentas = np.concatenate([np.zeros(0, dtype=np.intp)] + list(cuentas))
+
+    frentes = np.full(m, n, dtype=np.intp)
+    actual = np.flatnonzero(cuentas == 0)
+    asignados = 0
+    frente = 0
+    while actual.size:
+        frentes[actual] = frente
+        asignados += repeticiones[actual].sum()
+        if limite is not None and asignados >= limite:
+            break
+        restantes = np.flatnonzero(frentes == n)
+        cuentas[restantes] -= dominadores(actual, restantes)
+        actual = restantes[cuentas[restantes] == 0]
+        frente += 1
+    return frentes[grupos]
+
+
+def distancia_crowding(fitness):
+    """assignCrowdingDist de DEAP para las filas de un frente."""
+    distancias = np.zeros(len(fitness))
+    nobj = fitness.shape[1]
+    # Cada objetivo se ordena a partir del orden anterior, igual que en DEAP (importa en empates)
+    orden = np.arange(len(fitness))
+    for i in range(nobj):
+        orden = orden[np.argsort(fitness[orden, i], kind="stable")]
+        valores = fitness[orden, i]
+        distancias[orden[[0, -1]]] = np.inf
+        if valores[-1] == valores[0]:
+            continue
+        norma = nobj * (valores[-1] - valores[0])
+        distancias[orden[1:-1]] += (valores[2:] - valores[:-2]) / norma
+    return distancias
+
+
+def sel_nsga2_population(fitness, k, mapa=map):
+    """Índices de los `k` individuos que elegiría selNSGA2 de DEAP."""
+    frentes = frentes_no_dominados(fitness, limite=k, mapa=mapa)
+    orden = np.argsort(frentes, kind="stable")
+    ultimo = frentes[orden[k - 1]]
+    elegidos = orden[frentes[orden] < ultimo]
+    # Del último frente que cabe a medias se quedan los más aislados
+    empatados = np.flatnonzero(frentes == ultimo)
+    crowding = distancia_crowding(fitness[empatados])
+    resto = empatados[np.argsort(-crowding, kind="stable")[: k - len(elegidos)]]
+    return np.concatenate([elegidos, resto])
+
+
+def ea_mu_plus_lambda_array(
+    poblacion,
+    evaluate,
+    minimos,
+    maximos,
+    mu,
+    lambda_,
+    cxpb,
+    mutpb,
+    ngen,
+    rng,
+    alpha=0.5,
+    sigma=0.05,
+    indpb=0.3,
+    mapa=map,
+    fitness=None,
+):
+    """
+    custom_ea_mu_plus_lambda sobre una matriz (individuos × ingredientes).
+    Devuelve la población final y su fitness (una fila por individuo). Con
+    `fitness` se continúa una población ya reparada y evaluada.
+    """
+    if fitness is None:
+        poblacion = repair_population(poblacion, minimos, maximos)
+        fitness = evaluate(poblacion)
+
+    for _ in range(ngen):
+        elegidos = sel_nsga2_population(fitness, mu, mapa)
+        padres, fitness_padres = poblacion[elegidos], fitness[elegidos]
+
+        # Parejas de padres distintos, como random.sample(parents, 2)
+        parejas = (lambda_ + 1) // 2
+        primeros = rng.integers(0, mu, parejas)
+        segundos = (primeros + rng.integers(1, mu, parejas)) % mu
+        hijos1, hijos2 = padres[primeros], padres[segundos]
+        cruzar = (rng.random(parejas) < cxpb)[:, None]
+        cruzados1, cruzados2 = cx_blend_population(hijos1, hijos2, alpha, rng)
+        hijos1 = np.where(cruzar, cruzados1, hijos1)
+        hijos2 = np.where(cruzar, cruzados2, hijos2)
+        hijos = np.stack([hijos1, hijos2], axis=1).reshape(-1, poblacion.shape[1])[:lambda_]
+
+        mutar = (rng.random(len(hijos)) < mutpb)[:, None]
+        hijos = np.where(mutar, mut_gaussian_population(hijos, sigma, indpb, rng), hijos)
+        hijos = repair_population(hijos, minimos, maximos)
+
+        poblacion = np.concatenate([padres, hijos])
+        fitness = np.concatenate([fitness_padres, evaluate(hijos)])
+
+    return poblacion, fitness
+
+
+# ----------------------------------------------------------------------
+# 10. EVALUACIÓN EN PARALELO (OPCIONAL)
+# ----------------------------------------------------------------------
+# Por debajo de estos individuos evaluar en el proceso es más rápido que repartir
+PARALELO_MIN_INDIVIDUOS = 50_000
+
+
+class PoolGenetico:
+    """
+    Pool de procesos para una ejecución del optimizador. Cada worker recibe
+    al arrancar INGREDIENTS_DATA e INGREDIENT_COSTS del proceso principal.
+    `evaluate_population` reparte la población en trozos a partir de
+    `min_individuals` y devuelve el fitness en el mismo orden que en serie;
+    `map` conserva el orden y sirve para repartir el ordenamiento por
+    dominancia (motor array), que es lo más costoso de cada generación con
+    poblaciones grandes.
+    """
+
+    def __init__(self, workers, chunks_per_worker=4, min_individuals=PARALELO_MIN_INDIVIDUOS):
+        self.workers = workers
+        self.chunks_per_worker = chunks_per_worker
+        self.min_individuals = min_individuals
+        self.executor = ProcessPoolExecutor(
+            workers,
+            initializer=cargar_catalogo,
+            initargs=(INGREDIENTS_DATA, INGREDIENT_COSTS),
+        )
+
+    def evaluate_population(self, population, masa_name, all_ingredients) -> np.ndarray:
+        """Como `evaluate_population`, por trozos en los workers si la población es grande."""
+        poblacion = np.asarray(population, dtype=float).reshape(-1, len(all_ingredients))
+        if len(poblacion) < self.min_individuals:
+            return evaluate_population(poblacion, masa_name, all_ingredients)
+        trozos = np.array_split(poblacion, self.workers * self.chunks_per_worker)
+        fitness = self.executor.map(
+            evaluate_population, trozos, repeat(masa_name), repeat(tuple(all_ingredients))
+        )
+        return np.concatenate(list(fitness))
+
+    def map(self, fn, *iterables):
+        return self.executor.map(fn, *iterables)
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# ----------------------------------------------------------------------
+# 11. MODELO DE ISLAS
+#    Subpoblaciones independientes, cada una en su proceso, que cada K
+#    generaciones envían sus mejores individuos a la siguiente (anillo)
+# ----------------------------------------------------------------------
+def mejores_no_dominados(fitness, n):
+    """Hasta `n` individuos del primer frente, los más aislados si sobran."""
+    primeros = np.flatnonzero(frentes_no_dominados(fitness, limite=1) == 0)
+    if len(primeros) <= n:
+        return primeros
+    crowding = distancia_crowding(fitness[primeros])
+    return primeros[np.argsort(-crowding, kind="stable")[:n]]
+
+
+def _evolucionar_isla(
+    poblacion, fitness, rng, inmigrantes, masa_name, all_ingredients, pop_size, ngen, emigrantes
+):
+    """
+    Época de una isla en un worker: incorpora los inmigrantes en lugar de sus
+    peores individuos, evoluciona `ngen` generaciones y elige sus emigrantes.
+    Devuelve el estado de la isla (con su generador) y los emigrantes.
+    """
+    evaluate = partial(evaluate_population, masa_name=masa_name, all_ingredients=all_ingredients)
+    minimos, maximos = _limites(
+        masa_name, all_ingredients, LIMITES_REPARACION, LIMITES_BASE, (0.0, 1.0)
+    )
+    if inmigrantes is not None:
+        quedan = sel_nsga2_population(fitness, len(fitness) - len(inmigrantes[0]))
+        poblacion = np.concatenate([poblacion[quedan], inmigrantes[0]])
+        fitness = np.concatenate([fitness[quedan], inmigrantes[1]])
+
+    poblacion, fitness = ea_mu_plus_lambda_array(
+        poblacion,
+        evaluate,
+        minimos,
+        maximos,
+        mu=pop_size,
+        lambda_=pop_size,
+        cxpb=0.7,
+        mutpb=0.3,
+        ngen=ngen,
+        rng=rng,
+        fitness=fitness,
+    )
+    salen = mejores_no_dominados(fitness, emigrantes) if emigrantes else np.zeros(0, int)
+    return poblacion, fitness, rng, (poblacion[salen], fitness[salen])
+
+
+def evolucionar_islas(
+    masa_name, all_ingredients, pop_size, ngen, islands, migration_interval, migrants, seed, mapa
+):
+    """
+    Evoluciona `islands` subpoblaciones de `pop_size` con migración en anillo
+    cada `migration_interval` generaciones. Cada isla tiene su propio
+    generador, así que el resultado no depende de cuántos procesos haya.
+    Devuelve las poblaciones y el fitness de cada isla.
+    """
+    all_ingredients = tuple(all_ingredients)
+    rngs = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(islands)]
+    minimos, maximos = _limites(
+        masa_name, all_ingredients, LIMITES_REPARACION, LIMITES_BASE, (0.0, 1.0)
+    )
+    poblaciones = [
+        repair_population(
+            crear_poblacion_inicial(pop_size, masa_name, all_ingredients, rng), minimos, maximos
+        )
+        for rng in rngs
+    ]
+    fitnesses = [evaluate_population(p, masa_name, all_ingredients) for p in poblaciones]
+    inmigrantes = [None] * islands
+
+    hechas = 0
+    while hechas < ngen:
+        epoca = min(migration_interval, ngen - hechas)
+        hechas += epoca
+        # En la última época no hay a quién enviar emigrantes
+        emigrantes = migrants if hechas < ngen and islands > 1 else 0
+        resultados = list(
+            mapa(
+                _evolucionar_isla,
+                poblaciones,
+                fitnesses,
+                rngs,
+                inmigrantes,
+                repeat(masa_name),
+                repeat(all_ingredients),
+                repeat(pop_size),
+                repeat(epoca),
+                repeat(emigrantes),
+            )
+        )
+        poblaciones, fitnesses, rngs, salientes = map(list, zip(*resultados))
+        # Cada isla recibe los emigrantes de la anterior
+        inmigrantes = salientes[-1:] + salientes[:-1] if emigrantes else [None] * islands
+
+    return poblaciones, fitnesses
+
+
+# ----------------------------------------------------------------------
+# 12. GUARDAR ARCHIVOS DE RESULTADOS
 # ----------------------------------------------------------------------
 def _save_file(content: str, folder_path: str, max_files: int = 10):
     """Guarda un archivo .txt y elimina los más antiguos si excede max_files."""
@@ -346,12 +771,11 @@ def _save_file(content: str, folder_path: str, max_files: int = 10):
 
 
 # ----------------------------------------------------------------------
-# 10. OPTIMIZACIÓN PRINCIPAL
+# 13. OPTIMIZACIÓN PRINCIPAL
 # ----------------------------------------------------------------------
-def optimize_genetic(masa_name, pop_size=30, ngen=20):
-    """Optimiza la masa (C12 o G12) y retorna la mejor receta."""
-    all_ingredients = ["water", BASE_INGREDIENTS[masa_name]] + ADJUSTABLE_INGREDIENTS
-
+def _optimize_deap(masa_name, all_ingredients, pop_size, ngen, pool=None):
+    """EA con individuos de DEAP; devuelve la mejor receta y los frentes de Pareto."""
+    evaluate = pool.evaluate_population if pool is not None else evaluate_population
     toolbox.register(
         "individual",
         tools.initIterate,
@@ -363,6 +787,10 @@ def optimize_genetic(masa_name, pop_size=30, ngen=20):
         "evaluate",
         partial(evaluate_individual, masa_name=masa_name, all_ingredients=all_ingredients),
     )
+    toolbox.register(
+        "evaluate_population",
+        partial(evaluate, masa_name=masa_name, all_ingredients=all_ingredients),
+    )
     toolbox.register("mate", tools.cxBlend, alpha=0.5)
     toolbox.register("mutate", tools.mutGaussian, mu=0, sigma=0.05, indpb=0.3)
     toolbox.register("select", tools.selNSGA2)
@@ -383,11 +811,141 @@ def optimize_genetic(masa_name, pop_size=30, ngen=20):
     best_ind = hof[0]
     best_recipe = dict(zip(all_ingredients, best_ind))
 
-    # Graficar frentes de Pareto
     fronts = tools.sortNondominated(final_pop, len(final_pop), first_front_only=False)
+    return best_recipe, [np.array([ind.fitness.values for ind in front]) for front in fronts]
+
+
+def _optimize_array(masa_name, all_ingredients, pop_size, ngen, rng, pool=None):
+    """EA con la población como matriz; devuelve la mejor receta y los frentes de Pareto."""
+    evaluate = pool.evaluate_population if pool is not None else evaluate_population
+    mapa = pool.map if pool is not None else map
+    minimos, maximos = _limites(
+        masa_name, all_ingredients, LIMITES_REPARACION, LIMITES_BASE, (0.0, 1.0)
+    )
+    poblacion, fitness = ea_mu_plus_lambda_array(
+        crear_poblacion_inicial(pop_size, masa_name, all_ingredients, rng),
+        partial(evaluate, masa_name=masa_name, all_ingredients=all_ingredients),
+        minimos,
+        maximos,
+        mu=pop_size,
+        lambda_=pop_size,
+        cxpb=0.7,
+        mutpb=0.3,
+        ngen=ngen,
+        rng=rng,
+        mapa=mapa,
+    )
+    return _resumir_array(poblacion, fitness, all_ingredients, mapa)
+
+
+def _optimize_islands(
+    masa_name, all_ingredients, pop_size, ngen, seed, islands, migration_interval, migrants, pool
+):
+    """Modelo de islas; devuelve la mejor receta y los frentes de la unión de las islas."""
+    mapa = pool.map if pool is not None else map
+    poblaciones, fitnesses = evolucionar_islas(
+        masa_name,
+        all_ingredients,
+        pop_size,
+        ngen,
+        islands,
+        migration_interval,
+        migrants,
+        seed,
+        mapa,
+    )
+    # Se fusionan los frentes de Pareto de cada isla
+    primeros = [frentes_no_dominados(fitness, limite=1) == 0 for fitness in fitnesses]
+    poblacion = np.concatenate([p[frente] for p, frente in zip(poblaciones, primeros)])
+    fitness = np.concatenate([f[frente] for f, frente in zip(fitnesses, primeros)])
+    return _resumir_array(poblacion, fitness, all_ingredients, mapa)
+
+
+def _resumir_array(poblacion, fitness, all_ingredients, mapa):
+    """Mejor receta y frentes de Pareto de una población en forma de matriz."""
+    # La primera en orden lexicográfico de fitness, como hof[0] en el Hall of Fame
+    best = np.lexsort(fitness.T[::-1])[0]
+    best_recipe = dict(zip(all_ingredients, poblacion[best].tolist()))
+
+    frentes = frentes_no_dominados(fitness, mapa=mapa)
+    return best_recipe, [fitness[frentes == i] for i in range(frentes.max() + 1)]
+
+
+def optimize_genetic(
+    masa_name,
+    pop_size=30,
+    ngen=20,
+    engine="deap",
+    seed=None,
+    workers=None,
+    islands=None,
+    migration_interval=10,
+    migrants=None,
+    parallel_min_individuals=PARALELO_MIN_INDIVIDUOS,
+):
+    """
+    Optimiza la masa (C12 o G12) y retorna la mejor receta. Con
+    engine="array" la población es una matriz NumPy (sección 9), lo que
+    permite poblaciones de miles de individuos y miles de generaciones.
+    Con `workers` > 1 la evaluación y la selección se reparten entre
+    procesos (sección 10); el resultado es el mismo que en serie. La
+    evaluación solo se reparte si se evalúan al menos
+    `parallel_min_individuals` individuos a la vez; por debajo se evalúa en
+    el proceso principal.
+
+    Con `islands` (solo engine="array") se evolucionan tantas poblaciones
+    de `pop_size` como islas, en procesos separados (tantos como islas si no
+    se indica `workers`). Cada `migration_interval` generaciones cada isla
+    envía a la siguiente sus `migrants` mejores individuos no dominados (por
+    defecto, un 10 % de `pop_size`) y al final se fusionan sus frentes.
+    """
+    all_ingredients = ["water", BASE_INGREDIENTS[masa_name]] + ADJUSTABLE_INGREDIENTS
+    if engine not in ("deap", "array"):
+        raise ValueError(f"Motor genético desconocido: {engine}")
+    if islands is not None:
+        if engine != "array":
+            raise ValueError("El modelo de islas requiere engine='array'")
+        if islands < 1 or migration_interval < 1:
+            raise ValueError("islands y migration_interval deben ser al menos 1")
+        if migrants is None:
+            migrants = max(1, pop_size // 10)
+        if not 0 <= migrants <= pop_size:
+            raise ValueError("migrants debe estar entre 0 y pop_size")
+        workers = workers or islands
+
+    pool = None
+    if workers and workers > 1:
+        pool = PoolGenetico(workers, min_individuals=parallel_min_individuals)
+    try:
+        if engine == "deap":
+            if seed is not None:
+                random.seed(seed)
+            best_recipe, fronts = _optimize_deap(masa_name, all_ingredients, pop_size, ngen, pool)
+        elif islands is not None:
+            best_recipe, fronts = _optimize_islands(
+                masa_name,
+                all_ingredients,
+                pop_size,
+                ngen,
+                seed,
+                islands,
+                migration_interval,
+                migrants,
+                pool,
+            )
+        else:
+            rng = np.random.default_rng(seed)
+            best_recipe, fronts = _optimize_array(
+                masa_name, all_ingredients, pop_size, ngen, rng, pool
+            )
+    finally:
+        if pool is not None:
+            pool.close()
+
+    # Graficar frentes de Pareto
     for i, front in enumerate(fronts):
-        densidades = [ind.fitness.values[0] for ind in front]
-        elasticidades = [-ind.fitness.values[2] for ind in front]  # inverso
+        densidades = front[:, 0]
+        elasticidades = -front[:, 2]  # inverso
         plt.scatter(densidades, elasticidades, label=f"Frente {i+1}")
 
     plt.xlabel("Densidad")
@@ -419,7 +977,7 @@ def optimize_genetic(masa_name, pop_size=30, ngen=20):
 
 
 # ----------------------------------------------------------------------
-# 11. INFORME AMIGABLE
+# 14. INFORME AMIGABLE
 # ----------------------------------------------------------------------
 def generate_friendly_report(masa_name, best_recipe):
     """Genera un informe en texto más entendible y lo guarda en 'informes_main'."""
@@ -445,7 +1003,7 @@ def generate_friendly_report(masa_name, best_recipe):
 
 
 # ----------------------------------------------------------------------
-# 12. EJEMPLO DE USO (MAIN)
+# 15. EJEMPLO DE USO (MAIN)
 # ----------------------------------------------------------------------
 if __name__ == "__main__":
     # Optimizar masa C12
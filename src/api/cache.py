@@ -0,0 +1,243 @@
+"""
+Caché de resultados de /api/optimize.
+
+Dos niveles: un LRU con caducidad en memoria del proceso y, opcionalmente,
+Redis compartido entre workers. La clave incluye la versión del catálogo,
+así que un cambio de ingredientes o precios invalida las entradas sin
+necesidad de borrarlas. La clave puede ser aproximada (objetivos redondeados):
+`accept` decide si lo guardado sirve para la petición exacta, y si no, la
+consulta cuenta como fallo. Desde código async se usan `lookup_async` y
+`store_async`, que llevan las llamadas de red a Redis a un hilo para no
+bloquear el bucle de eventos.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+try:
+    import redis
+except ImportError:  # Redis es opcional: sin él solo se usa la caché local
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Segundos sin consultar Redis tras un error de conexión
+REDIS_RETRY_AFTER = 30.0
+
+
+def quantize(values: Sequence[float], step: float, round_up: Sequence[bool]) -> Tuple[float, ...]:
+    """
+    Redondea al paso del formulario para la clave de caché. Los mínimos se
+    redondean hacia arriba y los máximos hacia abajo.
+    """
+    quantized = []
+    for value, up in zip(values, round_up):
+        units = value / step
+        units = math.ceil(units - 1e-6) if up else math.floor(units + 1e-6)
+        quantized.append(round(units * step, 10))
+    return tuple(quantized)
+
+
+def redis_from_env(url: Optional[str] = None):
+    """Cliente Redis a partir de REDIS_URL, o None si no está configurado."""
+    url = url or os.getenv("REDIS_URL")
+    if not url or redis is None:
+        return None
+    return redis.Redis.from_url(url, socket_timeout=0.05, socket_connect_timeout=0.05)
+
+
+class OptimizationCache:
+    """LRU + TTL en proceso con segundo nivel Redis opcional."""
+
+    def __init__(
+        self,
+        maxsize: int = 4096,
+        ttl: float = 300.0,
+        redis_client=None,
+        prefix: str = "trivo:optimize:",
+        clock: Callable[[], float] = time.monotonic,
+        on_event: Optional[Callable[[str], None]] = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.redis = redis_client
+        self.prefix = prefix
+        self.clock = clock
+        # Aviso por evento (hit, miss, eviction...) para exportar métricas
+        self.on_event = on_event
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._redis_down_until = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.redis_hits = 0
+        self.redis_errors = 0
+
+    def key(self, targets: Sequence[float], version: str) -> str:
+        return self.prefix + version + ":" + ":".join(f"{value:g}" for value in targets)
+
+    def get_or_compute(
+        self, targets: Sequence[float], version: str, compute: Callable[[], Any]
+    ) -> Any:
+        """Devuelve el resultado en caché o lo calcula y lo guarda en ambos niveles."""
+        result = self.lookup(targets, version)
+        if result is None:
+            result = compute()
+            self.store(targets, version, result)
+        return result
+
+    def lookup(
+        self, targets: Sequence[float], version: str, accept: Optional[Callable[[Any], bool]] = None
+    ) -> Any:
+        """
+        Resultado en caché (local o Redis) o None, que cuenta como fallo. Un
+        resultado que `accept` rechaza también cuenta como fallo. Para calcular
+        fuera del hilo que consulta: `lookup`, calcular y `store`.
+        """
+        key = self.key(targets, version)
+        result = self._get_local(key, version, accept)
+        if result is not None:
+            return result
+        return self._remote_result(key, self._get_redis(key), accept)
+
+    def store(self, targets: Sequence[float], version: str, result: Any):
+        """Guarda un resultado recién calculado en ambos niveles."""
+        key = self.key(targets, version)
+        self._set_redis(key, result)
+        self._set_local(key, result)
+
+    async def lookup_async(
+        self, targets: Sequence[float], version: str, accept: Optional[Callable[[Any], bool]] = None
+    ) -> Any:
+        """Como `lookup`, pero la consulta a Redis se hace en un hilo."""
+        key = self.key(targets, version)
+        result = self._get_local(key, version, accept)
+        if result is not None:
+            return result
+        remote = await asyncio.to_thread(self._get_redis, key) if self._redis_usable() else None
+        return self._remote_result(key, remote, accept)
+
+    async def store_async(self, targets: Sequence[float], version: str, result: Any):
+        """Como `store`, pero la escritura en Redis se hace en un hilo."""
+        key = self.key(targets, version)
+        self._set_local(key, result)
+        if self._redis_usable():
+            await asyncio.to_thread(self._set_redis, key, result)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores para dimensionar la caché."""
+        with self._lock:
+            lookups = self.hits + self.redis_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "redis_hits": self.redis_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "redis_errors": self.redis_errors,
+                "hit_ratio": (self.hits + self.redis_hits) / lookups if lookups else 0.0,
+            }
+
+    def _get_local(
+        self, key: str, version: str, accept: Optional[Callable[[Any], bool]] = None
+    ) -> Any:
+        with self._lock:
+            if version != self._version:
+                # Catálogo nuevo: nada de lo guardado sirve ya
+                self._entries.clear()
+                self._version = version
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, result = entry
+            if accept is not None and not accept(result):
+                # No sirve para esta petición: se sigue buscando como si no estuviera
+                return None
+            if expires_at <= self.clock():
+                del self._entries[key]
+                self.expirations += 1
+                expired = True
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                expired = False
+        self._notify("expiration" if expired else "hit")
+        return None if expired else result
+
+    def _set_local(self, key: str, result: Any):
+        evicted = 0
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                evicted += 1
+            self.evictions += evicted
+        for _ in range(evicted):
+            self._notify("eviction")
+
+    def _remote_result(
+        self, key: str, result: Any, accept: Optional[Callable[[Any], bool]] = None
+    ) -> Any:
+        """Cuenta el fallo o guarda en local lo que vino de Redis."""
+        if result is None or (accept is not None and not accept(result)):
+            with self._lock:
+                self.misses += 1
+            self._notify("miss")
+            return None
+        self._set_local(key, result)
+        return result
+
+    def _redis_usable(self) -> bool:
+        return self.redis is not None and self.clock() >= self._redis_down_until
+
+    def _get_redis(self, key: str) -> Any:
+        if not self._redis_usable():
+            return None
+        try:
+            payload = self.redis.get(key)
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+        if payload is None:
+            return None
+        with self._lock:
+            self.redis_hits += 1
+        self._notify("redis_hit")
+        return json.loads(payload)
+
+    def _set_redis(self, key: str, result: Any):
+        if not self._redis_usable():
+            return
+        try:
+            self.redis.setex(key, max(1, int(self.ttl)), json.dumps(result))
+        except Exception as e:
+            self._redis_failed(e)
+
+    def _redis_failed(self, error: Exception):
+        logger.warning("Redis no disponible para la caché de optimización: %s", error)
+        with self._lock:
+            self.redis_errors += 1
+        self._notify("redis_error")
+        self._redis_down_until = self.clock() + REDIS_RETRY_AFTER
+
+    def _notify(self, event: str):
+        if self.on_event is not None:
+            self.on_event(event)
@@ -0,0 +1,126 @@
+"""
+Ejecución del solver fuera del bucle de eventos.
+
+Las resoluciones son trabajo de CPU: ejecutadas dentro de un `async def`
+bloquean todas las peticiones del worker, incluida /health. Aquí se envían a
+un pool de hilos o de procesos con una cola acotada (si se llena, la petición
+se rechaza en lugar de esperar sin límite) y un tiempo máximo por petición.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Sequence
+
+INLINE = "inline"
+THREAD = "thread"
+PROCESS = "process"
+MODES = (INLINE, THREAD, PROCESS)
+
+
+class SolverBusy(Exception):
+    """La cola del pool está llena."""
+
+
+class SolverTimeout(Exception):
+    """La resolución superó el tiempo máximo de la petición."""
+
+
+class SolverExecutor:
+    """
+    Pool acotado para el trabajo del solver.
+
+    `inline` ejecuta en el propio bucle (comportamiento anterior, útil en
+    pruebas); `thread` libera el bucle mientras numpy calcula; `process`
+    además reparte las resoluciones entre núcleos. Una resolución que supera
+    el tiempo se abandona: si aún estaba en cola se cancela, si ya había
+    empezado sigue ocupando su hueco hasta terminar.
+    """
+
+    def __init__(
+        self,
+        mode: str = THREAD,
+        max_workers: Optional[int] = None,
+        max_queue: int = 64,
+        timeout: float = 10.0,
+        initializer: Optional[Callable] = None,
+        initargs: Sequence[Any] = (),
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Modo de ejecución desconocido: {mode} ({', '.join(MODES)})")
+        self.mode = mode
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.initializer = initializer
+        self.initargs = tuple(initargs)
+        self._pool: Optional[Executor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Resoluciones en curso o en cola."""
+        return self._pending
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Ejecuta `fn(*args)` en el pool; lanza SolverBusy o SolverTimeout."""
+        if self.mode == INLINE:
+            return fn(*args)
+
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                raise SolverBusy()
+            self._pending += 1
+        try:
+            future = self._get_pool().submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        # El hueco se libera cuando el trabajo termina de verdad, no cuando se deja de esperar
+        future.add_done_callback(lambda _: self._release())
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), self.timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            raise SolverTimeout() from None
+        except asyncio.CancelledError:
+            # Trabajo descartado por el cierre del pool: la petición no se atendió
+            if future.cancelled():
+                raise SolverBusy() from None
+            raise
+
+    def restart(self, initargs: Optional[Sequence[Any]] = None):
+        """
+        Sustituye el pool (p. ej. tras cambiar el catálogo, para que los
+        procesos nuevos se inicialicen con él). El trabajo en curso y el que
+        ya estaba en cola termina en el pool anterior.
+        """
+        if initargs is not None:
+            self.initargs = tuple(initargs)
+        self.shutdown(cancel_pending=False)
+
+    def shutdown(self, cancel_pending: bool = True):
+        """
+        Cierra el pool sin esperar. Con `cancel_pending` se descarta lo que
+        aún estaba en cola, y quien lo esperaba recibe SolverBusy.
+        """
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=cancel_pending)
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.mode == PROCESS:
+                self._pool = ProcessPoolExecutor(
+                    self.max_workers, initializer=self.initializer, initargs=self.initargs
+                )
+            else:
+                self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix="solver")
+        return self._pool
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
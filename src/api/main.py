@@ -1,10 +1,26 @@
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
+import json
+import os
+import time
+from functools import partial
+from typing import AsyncIterator, List, Literal
+
+import numpy as np
+from fastapi import Body, Depends, FastAPI, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from src.api import metrics
+from src.api.cache import OptimizationCache, quantize, redis_from_env
+from src.api.executor import THREAD, SolverBusy, SolverExecutor, SolverTimeout
+from src.api.static_responses import PrecompressedPayload
+from src.trivo_plm.domain.catalog import IngredientMatrix, SharedCatalog
+from src.trivo_plm.domain.optimization import CONSTRAINT_SIGNS, BlendSolver
 
 app = FastAPI(title="TRIVO-AI-PLM MVP")
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
+app.add_middleware(metrics.PrometheusMiddleware)
 
 # Base de datos de ingredientes sin gluten con precios reales
 INGREDIENTS = {
@@ -16,46 +32,287 @@ INGREDIENTS = {
     "proteina_guisante": {"name": "Proteína de Guisante", "cost": 6.20, "protein": 80.0, "carbs": 7.0, "fiber": 6.0},
 }
 
+# Límites de proporción por ingrediente (mínimo, máximo)
+PROPORTION_LIMITS = {
+    "goma_xantana": (0.01, 0.03),  # Aglutinante imprescindible en masas sin gluten
+}
+
+# Nombres legibles de las restricciones para los mensajes de infactibilidad
+CONSTRAINT_NAMES = {
+    "target_protein": "proteína mínima",
+    "target_carbs": "carbohidratos máximos",
+    "target_fiber": "fibra mínima",
+    "max_cost": "presupuesto máximo",
+}
+
+# Catálogo en forma de matriz (ingredientes × propiedades), compartido por el solver
+INGREDIENT_MATRIX = IngredientMatrix.from_records(INGREDIENTS)
+
+# Programa lineal compilado una sola vez a partir del catálogo
+SOLVER = BlendSolver(INGREDIENT_MATRIX, PROPORTION_LIMITS)
+
+# Resultados por fragmento al transmitir NDJSON
+NDJSON_LINES_PER_CHUNK = 256
+
+# Puntos de un lote o barrido que se resuelven en cada trabajo del pool
+STREAM_JOB_SIZE = 256
+STREAM_ERRORS = {
+    "busy": "Demasiadas optimizaciones en curso; el resto del flujo no se resolvió",
+    "timeout": "La optimización superó el tiempo máximo; el resto del flujo no se resolvió",
+}
+
+# Puntos máximos de un barrido paramétrico y peticiones máximas de un lote
+MAX_SWEEP_STEPS = 100_000
+MAX_BATCH_SIZE = 10_000
+
+# Rangos admitidos de los objetivos: gramos por 100 g y costo en USD/kg
+GRAMS_LIMITS = {"ge": 0.0, "le": 100.0}
+COST_LIMITS = {"ge": 0.0, "le": 1000.0}
+
+# Caché de resultados: la clave redondea los objetivos al paso del formulario (0.1)
+CACHE_STEP = 0.1
+RESULT_CACHE = OptimizationCache(
+    maxsize=int(os.getenv("OPTIMIZE_CACHE_SIZE", "4096")),
+    ttl=float(os.getenv("OPTIMIZE_CACHE_TTL", "300")),
+    redis_client=redis_from_env(),
+    on_event=metrics.cache_event,
+)
+
+
+# Catálogo compilado compartido entre workers (opcional). Conviene un directorio
+# en memoria y propio de cada despliegue, p. ej. /dev/shm/trivo-catalog
+SHARED_CATALOG = (
+    SharedCatalog(os.environ["CATALOG_SHARED_DIR"]) if os.getenv("CATALOG_SHARED_DIR") else None
+)
+
+
+def set_catalog(ingredients):
+    """
+    Sustituye el catálogo y recompila matriz y programa lineal. Las entradas
+    de caché anteriores dejan de usarse porque su clave lleva la versión.
+    Con catálogo compartido, el resto de workers adopta la nueva versión en
+    su siguiente `sync_catalog`.
+    """
+    matrix = IngredientMatrix.from_records(ingredients)
+    if SHARED_CATALOG is not None:
+        SHARED_CATALOG.publish(matrix, {"ingredients": ingredients})
+        matrix, metadata = SHARED_CATALOG.attach()
+        ingredients = metadata["ingredients"]
+    install_catalog(ingredients, matrix)
+    # Los procesos del pool se reinician para que arranquen con el catálogo nuevo
+    SOLVER_EXECUTOR.restart((ingredients,))
+
+
+def sync_catalog():
+    """Adopta la versión publicada por otro worker, si ha cambiado."""
+    if SHARED_CATALOG is None:
+        return
+    attached = SHARED_CATALOG.refresh()
+    if attached is not None:
+        matrix, metadata = attached
+        install_catalog(metadata["ingredients"], matrix)
+
+
+def attach_shared_catalog():
+    """Al arrancar un worker: usa la versión ya publicada o publica la de este módulo."""
+    attached = SHARED_CATALOG.attach()
+    if attached is None:
+        set_catalog(INGREDIENTS)
+    else:
+        matrix, metadata = attached
+        install_catalog(metadata["ingredients"], matrix)
+
+
+def install_catalog(ingredients, matrix):
+    """Recompila el programa lineal y el catálogo servido, y los cambia de una vez."""
+    global INGREDIENTS, INGREDIENT_MATRIX, SOLVER, CATALOG_PAYLOAD
+    solver = BlendSolver(matrix, PROPORTION_LIMITS)
+    payload = render_catalog(ingredients)
+    INGREDIENTS, INGREDIENT_MATRIX, SOLVER, CATALOG_PAYLOAD = ingredients, matrix, solver, payload
+
+
+def init_solver_process(ingredients):
+    """Inicializador de cada proceso del pool: compila su propia copia del catálogo."""
+    if SHARED_CATALOG is not None:
+        attach_shared_catalog()
+    else:
+        install_catalog(ingredients, IngredientMatrix.from_records(ingredients))
+
+
+# Resoluciones fuera del bucle de eventos: inline, thread o process
+SOLVER_EXECUTOR = SolverExecutor(
+    mode=os.getenv("SOLVER_EXECUTOR", THREAD),
+    max_workers=int(os.getenv("SOLVER_WORKERS", "0")) or None,
+    max_queue=int(os.getenv("SOLVER_QUEUE_DEPTH", "64")),
+    timeout=float(os.getenv("SOLVER_TIMEOUT", "10")),
+    initializer=init_solver_process,
+    initargs=(INGREDIENTS,),
+)
+
+
 class OptimizeRequest(BaseModel):
-    target_protein: float = 15.0
-    target_carbs: float = 50.0
-    target_fiber: float = 12.0
-    max_cost: float = 5.0
+    """Objetivos por 100 g: proteína y fibra mínimas, carbohidratos máximos; costo en USD/kg."""
+
+    target_protein: float = Field(15.0, allow_inf_nan=False, **GRAMS_LIMITS)
+    target_carbs: float = Field(50.0, allow_inf_nan=False, **GRAMS_LIMITS)
+    target_fiber: float = Field(8.0, allow_inf_nan=False, **GRAMS_LIMITS)
+    max_cost: float = Field(5.0, allow_inf_nan=False, **COST_LIMITS)
+
+    def targets(self):
+        return [self.target_protein, self.target_carbs, self.target_fiber, self.max_cost]
+
+def optimize_query(
+    target_protein: float = Query(15.0, **GRAMS_LIMITS),
+    target_carbs: float = Query(50.0, **GRAMS_LIMITS),
+    target_fiber: float = Query(8.0, **GRAMS_LIMITS),
+    max_cost: float = Query(5.0, **COST_LIMITS),
+) -> OptimizeRequest:
+    """Objetivos en la query string, validados antes de construir el modelo."""
+    return OptimizeRequest(
+        target_protein=target_protein,
+        target_carbs=target_carbs,
+        target_fiber=target_fiber,
+        max_cost=max_cost,
+    )
+
+@app.exception_handler(RequestValidationError)
+async def validation_error(request: Request, exc: RequestValidationError):
+    # Sin la entrada ni el contexto: un NaN recibido no se puede serializar como JSON
+    errors = [
+        {key: value for key, value in error.items() if key not in ("input", "ctx")}
+        for error in exc.errors()
+    ]
+    return JSONResponse(status_code=422, content={"detail": errors})
 
 def optimize_formulation(target_protein, target_carbs, target_fiber, max_cost):
-    # Estrategia económica optimizada
-    best_mix = {
-        "harina_arroz": 0.45,      # 45% - Base económica
-        "harina_garbanzo": 0.35,   # 35% - Proteína y sabor
-        "harina_avena": 0.15,      # 15% - Textura
-        "goma_xantana": 0.02,      # 2% - Aglutinante
-        "proteina_guisante": 0.03  # 3% - Boost proteínico
-    }
-    
+    # Mezcla de menor costo que cumple los objetivos
+    solver = SOLVER
+    started = time.perf_counter()
+    solution = solver.solve(target_protein, target_carbs, target_fiber, max_cost)
+    metrics.observe_solution("optimize", time.perf_counter() - started, solution)
+    return build_result(solution, solver)
+
+def meets_targets(result, targets, key, tolerance=1e-9):
+    """Si un resultado guardado bajo `key` sirve para los objetivos exactos."""
+    if not result.get("success"):
+        # La clave es la petición más estricta de su celda: su infactibilidad vale para todas
+        return tuple(targets) == tuple(key)
+    values = [result["protein"], result["carbs"], result["fiber"], result["total_cost"]]
+    return bool(np.all(CONSTRAINT_SIGNS * (np.asarray(values) - targets) <= tolerance))
+
+def solve_targets(targets):
+    """Trabajo enviado al pool; en modo proceso cada proceso sigue el catálogo compartido."""
+    sync_catalog()
+    return optimize_formulation(*targets)
+
+def solve_batch(targets):
+    """Trabajo del pool para un tramo de un lote: un resultado por fila de objetivos."""
+    sync_catalog()
+    solver = SOLVER
+    solutions = metrics.observe_solutions("batch", solver.solve_many(np.asarray(targets)))
+    return [build_result(solution, solver) for solution in solutions]
+
+def solve_sweep(targets, parameter, values, warm_start=None):
+    """
+    Trabajo del pool para un tramo de un barrido. Devuelve los resultados y la
+    base óptima del último punto, que arranca el tramo siguiente.
+    """
+    sync_catalog()
+    solver = SOLVER
+    solutions = metrics.observe_solutions(
+        "sweep", solver.sweep(targets, parameter, values, warm_start)
+    )
+    results = []
+    for value, solution in zip(values, solutions):
+        if solution.is_optimal:
+            warm_start = solution.basis
+        results.append({"parameter": parameter, "value": value, **build_result(solution, solver)})
+    return results, warm_start
+
+async def stream_jobs(fn, chunks, carry=False):
+    """
+    Resuelve los tramos en el pool de uno en uno y los entrega en orden. El
+    primero se resuelve antes de responder, así que la saturación o el tiempo
+    agotado iniciales siguen siendo un 503 o 504; si ocurren a mitad del
+    flujo, se emite una última línea con el error y se corta. Con `carry`,
+    `fn` devuelve (resultados, estado) y el estado se pasa como último
+    argumento del tramo siguiente.
+    """
+    chunks = iter(chunks)
+    state = None
+
+    async def solve(run, args):
+        nonlocal state
+        if not carry:
+            return await run(fn, *args)
+        output, state = await run(fn, *args, state)
+        return output
+
+    first_args = next(chunks, None)
+    first = [] if first_args is None else await solve(run_solver, first_args)
+
+    async def results():
+        yield first
+        for args in chunks:
+            try:
+                yield await solve(SOLVER_EXECUTOR.run, args)
+            except (SolverBusy, SolverTimeout) as e:
+                status = "busy" if isinstance(e, SolverBusy) else "timeout"
+                yield [{"success": False, "status": status, "message": STREAM_ERRORS[status]}]
+                return
+
+    return results()
+
+async def run_solver(fn, *args):
+    """Ejecuta trabajo del solver en el pool y traduce la saturación y el tiempo agotado a HTTP."""
+    try:
+        return await SOLVER_EXECUTOR.run(fn, *args)
+    except SolverBusy:
+        raise HTTPException(
+            status_code=503,
+            detail="Demasiadas optimizaciones en curso, reintenta en unos segundos",
+            headers={"Retry-After": "1"},
+        )
+    except SolverTimeout:
+        raise HTTPException(status_code=504, detail="La optimización superó el tiempo máximo")
+
+def build_result(solution, solver):
+    """Respuesta de la API para una solución del programa lineal."""
+    if not solution.is_optimal:
+        conflicting = solution.conflicting_rows
+        names = [CONSTRAINT_NAMES[name] for name in conflicting]
+        message = "No se encontró una mezcla válida"
+        if names:
+            message = "Ninguna mezcla cumple a la vez: " + ", ".join(names)
+        return {
+            "success": False,
+            "status": solution.status,
+            "conflicting_constraints": conflicting,
+            "message": message,
+            "ingredients": [],
+        }
+
     # Calcular costos y nutrientes
-    total_cost = 0
-    total_protein = 0
-    total_carbs = 0
-    total_fiber = 0
+    proportions = solution.x
+    matrix = solver.matrix
+    total_cost = float(solver.cost @ proportions)
+    total_protein = float(solver.protein @ proportions)
+    total_carbs = float(solver.carbs @ proportions)
+    total_fiber = float(solver.fiber @ proportions)
     ingredients_result = []
-    
-    for ingredient_key, proportion in best_mix.items():
-        ing = INGREDIENTS[ingredient_key]
-        cost = proportion * ing["cost"]
-        total_cost += cost
-        total_protein += ing["protein"] * proportion
-        total_carbs += ing["carbs"] * proportion
-        total_fiber += ing["fiber"] * proportion
-        
+
+    for ingredient_key, proportion, cost in zip(solver.keys, proportions, solver.cost):
+        if proportion <= 1e-9:
+            continue
         ingredients_result.append({
-            "name": ing["name"],
-            "percentage": proportion * 100,
-            "cost": cost
+            "name": INGREDIENTS[ingredient_key]["name"],
+            "percentage": float(proportion) * 100,
+            "cost": float(proportion * cost)
         })
     
     # Costo alternativa comercial típica
-    commercial_cost = (0.4 * INGREDIENTS["harina_almendra"]["cost"] + 
-                      0.6 * INGREDIENTS["harina_arroz"]["cost"])
+    commercial_cost = (0.4 * matrix.value("harina_almendra", "cost") + 
+                      0.6 * matrix.value("harina_arroz", "cost"))
     
     savings = commercial_cost - total_cost
     savings_pct = (savings / commercial_cost) * 100
@@ -69,12 +326,12 @@ def optimize_formulation(target_protein, target_carbs, target_fiber, max_cost):
         "commercial_cost": commercial_cost,
         "savings_usd": savings,
         "savings_percentage": savings_pct,
-        "success": total_cost <= max_cost
+        "success": True,
+        "status": solution.status,
     }
 
-@app.get("/", response_class=HTMLResponse)
-async def home():
-    return """
+# Página principal
+HOME_HTML = """
 <!DOCTYPE html>
 <html>
 <head>
@@ -124,7 +381,7 @@ async def home():
             </div>
             <div class="form-group">
                 <label>🌿 Fibra objetivo (gramos por 100g):</label>
-                <input type="number" id="fiber" value="12" step="0.1" min="3" max="25">
+                <input type="number" id="fiber" value="8" step="0.1" min="3" max="12">
             </div>
             <div class="form-group">
                 <label>💰 Presupuesto máximo (USD por kilogramo):</label>
@@ -167,7 +424,9 @@ async def home():
         
         function displayResult(result, originalData) {
             if (!result.success) {
-                document.getElementById('result').innerHTML = '<p style="color: red;">No se pudo optimizar con estos parámetros. Intente aumentar el presupuesto.</p>';
+                const message = result.message || 'No se pudo optimizar con estos parámetros.';
+                document.getElementById('result').innerHTML =
+                    '<p style="color: red;">' + message + '</p>';
                 document.getElementById('result').style.display = 'block';
                 return;
             }
@@ -241,19 +500,105 @@ async def home():
 </html>
     """
 
+# Cuerpos estáticos renderizados y comprimidos una vez (se regeneran al cambiar el catálogo)
+def render_catalog(ingredients):
+    """Serializa el catálogo como lo haría JSONResponse y lo deja pre-comprimido."""
+    body = json.dumps(
+        {"ingredients": ingredients}, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+    return PrecompressedPayload(body, "application/json")
+
+# Starlette añade "; charset=utf-8" a los tipos text/*
+HOME_PAGE = PrecompressedPayload(HOME_HTML.encode("utf-8"), "text/html")
+CATALOG_PAYLOAD = render_catalog(INGREDIENTS)
+
+if SHARED_CATALOG is not None:
+    attach_shared_catalog()
+
+@app.get("/", response_class=HTMLResponse)
+async def home(request: Request):
+    return HOME_PAGE.response(request)
+
 @app.post("/api/optimize")
 async def optimize(request: OptimizeRequest):
-    result = optimize_formulation(
-        request.target_protein,
-        request.target_carbs,
-        request.target_fiber,
-        request.max_cost
-    )
+    sync_catalog()
+    # Solo la clave se redondea; se resuelven los objetivos exactos de la petición
+    targets = request.targets()
+    key = quantize(targets, CACHE_STEP, CONSTRAINT_SIGNS < 0)
+    version = INGREDIENT_MATRIX.version
+    accept = partial(meets_targets, targets=targets, key=key)
+    result = await RESULT_CACHE.lookup_async(key, version, accept)
+    if result is None:
+        result = await run_solver(solve_targets, targets)
+        await RESULT_CACHE.store_async(key, version, result)
     return result
 
+@app.post("/api/optimize/batch")
+async def optimize_batch(
+    requests: List[OptimizeRequest] = Body(..., max_length=MAX_BATCH_SIZE)
+):
+    # El lote se resuelve en el pool por tramos; los resultados salen en orden
+    targets = [request.targets() for request in requests]
+    chunks = (
+        (targets[start : start + STREAM_JOB_SIZE],)
+        for start in range(0, len(targets), STREAM_JOB_SIZE)
+    )
+    results = await stream_jobs(solve_batch, chunks)
+    return StreamingResponse(ndjson_stream(results), media_type="application/x-ndjson")
+
+@app.get("/api/optimize/sweep")
+async def optimize_sweep(
+    start: float = Query(..., **COST_LIMITS),
+    stop: float = Query(..., **COST_LIMITS),
+    steps: int = Query(50, ge=2, le=MAX_SWEEP_STEPS),
+    parameter: Literal["target_protein", "target_carbs", "target_fiber", "max_cost"] = "max_cost",
+    base: OptimizeRequest = Depends(optimize_query),
+):
+    # Cada punto arranca desde la base óptima del anterior, también entre tramos
+    grid = [start + (stop - start) * i / (steps - 1) for i in range(steps)]
+    chunks = (
+        (base.targets(), parameter, grid[first : first + STREAM_JOB_SIZE])
+        for first in range(0, steps, STREAM_JOB_SIZE)
+    )
+    results = await stream_jobs(solve_sweep, chunks, carry=True)
+    return StreamingResponse(
+        ndjson_stream(results, lines_per_chunk=STREAM_JOB_SIZE), media_type="application/x-ndjson"
+    )
+
+async def ndjson_stream(
+    batches: AsyncIterator[List[dict]], lines_per_chunk: int = NDJSON_LINES_PER_CHUNK
+) -> AsyncIterator[str]:
+    """Serializa tramos de resultados como NDJSON agrupando varias líneas por fragmento."""
+    lines = []
+    async for results in batches:
+        for result in results:
+            lines.append(json.dumps(result))
+            if len(lines) >= lines_per_chunk:
+                yield "\n".join(lines) + "\n"
+                lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    return RESULT_CACHE.stats()
+
 @app.get("/api/ingredients")
-async def get_ingredients():
-    return {"ingredients": INGREDIENTS}
+async def get_ingredients(request: Request):
+    sync_catalog()
+    return CATALOG_PAYLOAD.response(request)
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    return metrics.metrics_response()
+
+@app.on_event("shutdown")
+async def release_metrics():
+    metrics.mark_process_dead(os.getpid())
+
+@app.on_event("shutdown")
+async def stop_solver_executor():
+    SOLVER_EXECUTOR.shutdown()
 
 @app.get("/health")
 async def health():
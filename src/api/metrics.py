@@ -0,0 +1,188 @@
+"""
+Métricas Prometheus de la API.
+
+Con PROMETHEUS_MULTIPROC_DIR definido (varios workers de uvicorn/gunicorn)
+cada proceso escribe sus valores en ficheros mmap de ese directorio y
+/metrics los agrega al responder; sin él se usa el registro del proceso.
+La variable debe existir antes de importar este módulo.
+"""
+
+import os
+import time
+from typing import Iterable, Iterator
+
+from fastapi import Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.routing import Match
+
+# La API responde en cientos de microsegundos; los lotes y barridos tardan segundos
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+SOLVER_BUCKETS = (
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+)
+ITERATION_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# Etiqueta de las rutas inexistentes: evita una serie por cada URL desconocida
+UNMATCHED_ROUTE = "unmatched"
+
+REQUEST_LATENCY = Histogram(
+    "trivo_http_request_duration_seconds",
+    "Latencia de las peticiones HTTP hasta enviar el último byte",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "trivo_http_requests_in_flight",
+    "Peticiones HTTP en curso",
+    ["route"],
+    multiprocess_mode="livesum",
+)
+SOLVER_SECONDS = Histogram(
+    "trivo_solver_duration_seconds",
+    "Tiempo de reloj por resolución del programa lineal",
+    ["operation"],
+    buckets=SOLVER_BUCKETS,
+)
+SOLVER_ITERATIONS = Histogram(
+    "trivo_solver_iterations",
+    "Pivotes del simplex dual por resolución",
+    ["operation"],
+    buckets=ITERATION_BUCKETS,
+)
+SOLVER_RESULTS = Counter(
+    "trivo_solver_results_total",
+    "Resoluciones por estado final",
+    ["operation", "status"],
+)
+CACHE_EVENTS = Counter(
+    "trivo_optimize_cache_events_total",
+    "Eventos de la caché de /api/optimize (hit, redis_hit, miss, eviction, expiration...)",
+    ["event"],
+)
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.getenv("PROMETHEUS_MULTIPROC_DIR") or os.getenv("prometheus_multiproc_dir"))
+
+
+def metrics_response() -> Response:
+    """Exposición en formato texto; en modo multiproceso agrega todos los workers."""
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+def mark_process_dead(pid: int):
+    """Descarta los gauges del worker que termina (solo en modo multiproceso)."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(pid)
+
+
+def cache_event(event: str):
+    CACHE_EVENTS.labels(event).inc()
+
+
+def observe_solution(operation: str, seconds: float, solution):
+    SOLVER_SECONDS.labels(operation).observe(seconds)
+    SOLVER_ITERATIONS.labels(operation).observe(solution.iterations)
+    SOLVER_RESULTS.labels(operation, solution.status).inc()
+
+
+def observe_solutions(operation: str, solutions: Iterable) -> Iterator:
+    """
+    Registra cada solución de un lote o barrido. El tiempo de cada una es el
+    que tarda el generador del solver en entregarla, así que los bloques
+    resueltos de una vez se reparten entre sus primeras soluciones.
+    """
+    iterator = iter(solutions)
+    while True:
+        started = time.perf_counter()
+        try:
+            solution = next(iterator)
+        except StopIteration:
+            return
+        observe_solution(operation, time.perf_counter() - started, solution)
+        yield solution
+
+
+class PrometheusMiddleware:
+    """
+    Middleware ASGI: latencia por ruta (plantilla, no URL) y peticiones en
+    curso. La latencia incluye el cuerpo completo, también en las respuestas
+    transmitidas por fragmentos.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = route_template(scope)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = REQUESTS_IN_FLIGHT.labels(route)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUEST_LATENCY.labels(scope["method"], route, str(status)).observe(
+                time.perf_counter() - started
+            )
+            in_flight.dec()
+
+
+def route_template(scope) -> str:
+    """Ruta declarada que atiende la petición (p. ej. /api/optimize/sweep)."""
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match != Match.NONE:
+            return getattr(route, "path", UNMATCHED_ROUTE)
+    return UNMATCHED_ROUTE
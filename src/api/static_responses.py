@@ -0,0 +1,88 @@
+"""
+Respuestas estáticas pre-renderizadas y pre-comprimidas.
+
+El cuerpo se serializa y comprime una sola vez (gzip y, si está instalado,
+brotli). Cada petición solo negocia la codificación y compara el ETag, de
+modo que un If-None-Match válido se responde con 304 sin cuerpo.
+"""
+
+import gzip
+import hashlib
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él solo se sirve gzip
+    brotli = None
+
+
+class PrecompressedPayload:
+    """Cuerpo fijo con sus variantes comprimidas y un ETag fuerte por variante."""
+
+    def __init__(self, body: bytes, media_type: str, cache_control: str = "public, no-cache"):
+        self.media_type = media_type
+        self.cache_control = cache_control
+        tag = hashlib.sha256(body).hexdigest()[:32]
+
+        # codificación -> (cuerpo, etag); el orden marca la preferencia
+        self.variants: Dict[str, tuple] = {}
+        if brotli is not None:
+            self.variants["br"] = (brotli.compress(body, quality=11), f'"{tag}-br"')
+        self.variants["gzip"] = (gzip.compress(body, compresslevel=9, mtime=0), f'"{tag}-gz"')
+        self.variants["identity"] = (body, f'"{tag}"')
+        self.etags = {etag for _, etag in self.variants.values()}
+
+    def response(self, request: Request) -> Response:
+        encoding = self._negotiate(request.headers.get("accept-encoding", ""))
+        body, etag = self.variants[encoding]
+        headers = {
+            "ETag": etag,
+            "Cache-Control": self.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+
+        if self._matches(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=headers)
+
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type=self.media_type, headers=headers)
+
+    def _negotiate(self, accept_encoding: str) -> str:
+        qualities = _encoding_qualities(accept_encoding)
+        wildcard = qualities.get("*", 0.0)
+        for encoding in self.variants:
+            # Una entrada explícita, también con q=0, manda sobre el comodín
+            if encoding != "identity" and qualities.get(encoding, wildcard) > 0:
+                return encoding
+        return "identity"
+
+    def _matches(self, if_none_match: Optional[str]) -> bool:
+        # Comparación débil (RFC 7232): el contenido es el mismo en todas las variantes
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return any(tag in self.etags for tag in candidates)
+
+
+def _encoding_qualities(header: str) -> Dict[str, float]:
+    """Calidad declarada por codificación (q=1 si no se indica, 0 si no se entiende)."""
+    qualities = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        param = params.strip()
+        if param.startswith("q="):
+            try:
+                quality = float(param[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[name] = quality
+    return qualities
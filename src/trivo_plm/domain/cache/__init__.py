@@ -0,0 +1,7 @@
+"""
+Cachés de resultados del dominio
+"""
+
+from .score_cache import SCORE_CACHE_SIZE, ScoreCache, formulation_fingerprint
+
+__all__ = ["SCORE_CACHE_SIZE", "ScoreCache", "formulation_fingerprint"]
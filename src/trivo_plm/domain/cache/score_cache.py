@@ -0,0 +1,118 @@
+"""
+Caché de evaluaciones de formulaciones.
+
+`formulation_fingerprint` da una huella canónica de una formulación para una
+versión del catálogo, y `ScoreCache` guarda por huella las evaluaciones de
+`DoughFormulator` en un LRU que se vacía al cambiar la versión.
+"""
+
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Union
+
+if TYPE_CHECKING:
+    from ..models.dough_formulator import DoughFormulation
+
+# Formulaciones cuya evaluación se recuerda por instancia de DoughFormulator
+SCORE_CACHE_SIZE = 4096
+# Paso al que se redondean proporciones, costo y sostenibilidad en la huella
+SCORE_TOLERANCE = 1e-9
+
+
+def formulation_fingerprint(
+    formulation: "DoughFormulation", version: str, tolerance: float = SCORE_TOLERANCE
+) -> str:
+    """
+    Huella canónica de una formulación para una versión del catálogo: no
+    depende del orden de los ingredientes ni de si un nombre se repite, y
+    las cantidades se redondean a `tolerance`.
+    """
+
+    def units(value: float) -> Union[int, str]:
+        return int(round(value / tolerance)) if math.isfinite(value) else repr(value)
+
+    totals: Dict[str, float] = {}
+    for ingredient_dict in formulation.ingredients:
+        for name, proportion in ingredient_dict.items():
+            totals[name] = totals.get(name, 0.0) + proportion
+    # Un ingrediente con proporción 0 no cambia la evaluación
+    ingredients = sorted((name, units(p)) for name, p in totals.items() if units(p) != 0)
+    payload = [
+        version,
+        ingredients,
+        units(formulation.cost),
+        units(formulation.sustainability_score),
+    ]
+    return hashlib.sha256(json.dumps(payload).encode("utf-8")).hexdigest()
+
+
+class ScoreCache:
+    """
+    LRU de evaluaciones por huella de formulación. La huella incluye la
+    versión del catálogo y, al llegar una versión nueva, se vacía: nada de
+    lo guardado sirve ya.
+    """
+
+    def __init__(self, maxsize: int = SCORE_CACHE_SIZE, tolerance: float = SCORE_TOLERANCE):
+        self.maxsize = maxsize
+        self.tolerance = tolerance
+        self._entries: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_or_compute(
+        self,
+        formulation: "DoughFormulation",
+        version: str,
+        compute: Callable[[], Dict[str, float]],
+    ) -> Dict[str, float]:
+        """Evaluación guardada de la formulación o la calculada y guardada ahora"""
+        key = formulation_fingerprint(formulation, version, self.tolerance)
+        with self._lock:
+            if version != self._version:
+                if self._entries:
+                    self._entries.clear()
+                    self.invalidations += 1
+                self._version = version
+            scores = self._entries.get(key)
+            if scores is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(scores)
+            self.misses += 1
+
+        scores = compute()
+        with self._lock:
+            # Si mientras tanto cambió la versión, el resultado ya no se guarda
+            if version == self._version:
+                self._entries[key] = dict(scores)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return scores
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Contadores para dimensionar la caché"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,21 @@
+"""
+Catálogo de ingredientes compartido
+"""
+
+from .catalog_provider import CatalogProvider, load_catalog
+from .catalog_snapshot import SCORE_DTYPE, SCORE_NAMES, CatalogSnapshot, CompiledIngredients
+from .compiled_catalog import CompiledCatalog
+from .ingredient_matrix import IngredientMatrix
+from .shared_catalog import SharedCatalog
+
+__all__ = [
+    "CatalogProvider",
+    "CatalogSnapshot",
+    "CompiledCatalog",
+    "CompiledIngredients",
+    "IngredientMatrix",
+    "SCORE_DTYPE",
+    "SCORE_NAMES",
+    "SharedCatalog",
+    "load_catalog",
+]
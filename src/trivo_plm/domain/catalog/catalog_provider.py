@@ -0,0 +1,124 @@
+"""
+Carga y recarga en caliente del catálogo JSON de ingredientes.
+
+`load_catalog` compila un JSON (o su caché compilada) en un
+`CatalogSnapshot`. `CatalogProvider` lo comparte entre las instancias de
+`DoughFormulator` de un proceso y lo sustituye por una versión nueva cuando
+el fichero cambia.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from .catalog_snapshot import CatalogSnapshot
+from .compiled_catalog import CompiledCatalog
+
+# Segundos entre comprobaciones del JSON de un catálogo compartido
+CATALOG_POLL_INTERVAL = 1.0
+
+
+def load_catalog(path: str) -> CatalogSnapshot:
+    """Carga un JSON categoría→nombre→propiedades, o su caché compilada si está al día"""
+    # Diferido: el módulo de modelos importa este al cargarse
+    from ..models.dough_formulator import Ingredient
+
+    # Con la caché compilada al día no se parsea ni se valida el JSON
+    compiled = CompiledCatalog(path)
+    cached = compiled.load()
+    if cached is not None:
+        return CatalogSnapshot.from_compiled(*cached)
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    # Convertir los datos a objetos Ingredient
+    catalog = CatalogSnapshot.from_ingredients(
+        {
+            category: {name: Ingredient(**ingredient) for name, ingredient in ingredients.items()}
+            for category, ingredients in data.items()
+        }
+    )
+    compiled.save(catalog.matrix, catalog.text_columns())
+    return catalog
+
+
+def _source_stat(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class CatalogProvider:
+    """
+    Catálogo de un JSON compartido por las instancias de DoughFormulator del
+    proceso. `snapshot()` devuelve la versión vigente y, como mucho una vez
+    por `poll_interval`, comprueba si el fichero cambió (mtime y tamaño). Si
+    cambió, un solo hilo carga la versión nueva mientras el resto sigue
+    usando la anterior, y la sustituye de una vez. Si la recarga falla (p. ej.
+    un JSON a medio escribir) se conserva la versión vigente y se reintenta.
+    """
+
+    _shared: Dict[str, "CatalogProvider"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        source_path: str,
+        loader: Callable[[str], CatalogSnapshot] = load_catalog,
+        poll_interval: float = CATALOG_POLL_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.source_path = source_path
+        self.loader = loader
+        self.poll_interval = poll_interval
+        self.clock = clock
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._stat: Optional[Tuple[int, int]] = None
+        self._checked_at = -math.inf
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, source_path: str) -> "CatalogProvider":
+        """Proveedor del proceso para `source_path`; un fichero inexistente no se comparte"""
+        if _source_stat(source_path) is None:
+            return cls(source_path)
+        with cls._shared_lock:
+            provider = cls._shared.get(source_path)
+            if provider is None:
+                provider = cls._shared[source_path] = cls(source_path)
+            return provider
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Versión vigente; la primera llamada la carga y propaga sus errores"""
+        if self._snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._load()
+                return self._snapshot
+
+        now = self.clock()
+        if now - self._checked_at >= self.poll_interval and self._lock.acquire(blocking=False):
+            try:
+                self._checked_at = now
+                if _source_stat(self.source_path) != self._stat:
+                    try:
+                        self._load()
+                    except Exception as e:
+                        print(f"Error al recargar ingredientes: {e}")
+            finally:
+                self._lock.release()
+        return self._snapshot
+
+    def _load(self):
+        # La huella se toma antes de leer: un cambio durante la carga se ve en la siguiente
+        stat = _source_stat(self.source_path)
+        snapshot = self.loader(self.source_path)
+        self._stat = stat
+        self._checked_at = self.clock()
+        self._snapshot = snapshot
@@ -0,0 +1,319 @@
+"""
+Versión compilada e inmutable de un catálogo de ingredientes.
+
+`CatalogSnapshot` reúne los ingredientes (modelos `Ingredient` de
+`dough_formulator`), su matriz de propiedades y las columnas de score
+precalculadas, con los núcleos vectorizados que puntúan formulaciones sobre
+ellas. `DoughFormulator` y sus workers solo leen versiones de esta clase.
+"""
+
+import math
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Mapping, Optional
+
+import numpy as np
+
+from .ingredient_matrix import IngredientMatrix
+
+if TYPE_CHECKING:
+    from ..models.dough_formulator import DoughFormulation, Ingredient
+
+# Orden de las puntuaciones que devuelve `score_proportions`
+SCORE_NAMES = (
+    "taste_score",
+    "texture_score",
+    "cost_score",
+    "sustainability_score",
+    "scalability_score",
+    "commercial_viability",
+    "total_score",
+)
+# Registro por formulación de `evaluate_many` (un campo por score)
+SCORE_DTYPE = np.dtype([(name, np.float64) for name in SCORE_NAMES])
+# Costo a partir del cual el score de costo es 0 (menor costo = mayor score)
+MAX_COST = 100.0
+# Valor de las propiedades de textura que un ingrediente no declara
+DEFAULT_TEXTURE = 0.5
+# Proporciones iniciales cuando ningún objetivo coincide con los nutrientes del ingrediente
+DEFAULT_PROPORTIONS = (0.3, 0.4, 0.3)
+# Campos de texto de Ingredient: la matriz solo guarda los numéricos
+TEXT_FIELDS = ("name", "color")
+
+
+class CompiledIngredients(Mapping):
+    """
+    Nombre→Ingredient sobre las filas de un catálogo compilado: cada
+    ingrediente se construye la primera vez que se pide, no al cargar.
+    """
+
+    def __init__(self, rows: Dict[str, int], build: Callable[[int], "Ingredient"]):
+        self.rows = rows
+        self.build = build
+
+    def __getitem__(self, name: str) -> "Ingredient":
+        return self.build(self.rows[name])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+class CatalogSnapshot:
+    """
+    Versión compilada e inmutable del catálogo: ingredientes, matriz de
+    propiedades, índices y columnas de score, con los núcleos vectorizados
+    que solo dependen de ellos. Una recarga crea otra versión en lugar de
+    modificar esta, así que quien la tiene puede terminar con ella.
+    """
+
+    def __init__(
+        self,
+        ingredients_db: Mapping[str, Mapping[str, "Ingredient"]],
+        matrix: IngredientMatrix,
+        ingredients_by_name: Mapping[str, "Ingredient"],
+    ):
+        self.ingredients_db = ingredients_db
+        self.matrix = matrix
+        self.ingredients_by_name = ingredients_by_name
+        self.ingredient_rows: Dict[str, int] = matrix.index
+        # Fila que usa la evaluación para cada fila del catálogo (la primera con su nombre)
+        self.lookup_rows = matrix.rows(matrix.names)
+        self._compile_score_columns()
+        for array in (
+            matrix.values,
+            self.lookup_rows,
+            self.costs,
+            self.sustainability_scores,
+            self.score_columns,
+        ):
+            array.flags.writeable = False
+
+    @classmethod
+    def from_ingredients(
+        cls, ingredients_db: Dict[str, Dict[str, "Ingredient"]]
+    ) -> "CatalogSnapshot":
+        """Compila un catálogo categoría→nombre→Ingredient"""
+        # Índice plano nombre→ingrediente; si un nombre se repite en dos categorías
+        # manda la primera, igual que en el índice nombre→fila de la matriz
+        ingredients_by_name: Dict[str, "Ingredient"] = {}
+        for ingredients in ingredients_db.values():
+            for name, ingredient in ingredients.items():
+                ingredients_by_name.setdefault(name, ingredient)
+        return cls(
+            ingredients_db, IngredientMatrix.from_categories(ingredients_db), ingredients_by_name
+        )
+
+    @classmethod
+    def from_compiled(
+        cls, matrix: IngredientMatrix, text: Dict[str, List[str]]
+    ) -> "CatalogSnapshot":
+        """Catálogo de la caché compilada; los Ingredient se construyen al pedirlos"""
+        # Diferido: el módulo de modelos importa este al cargarse
+        from ..models.dough_formulator import Ingredient
+
+        built: Dict[int, Ingredient] = {}
+        columns = [column.partition(".") for column in matrix.columns]
+
+        def build(row: int) -> Ingredient:
+            ingredient = built.get(row)
+            if ingredient is None:
+                record = {field: values[row] for field, values in text.items()}
+                record.setdefault("nutritional_value", {})
+                record.setdefault("texture_properties", {})
+                for (group, nested, key), value in zip(columns, matrix.values[row].tolist()):
+                    if nested:
+                        record.setdefault(group, {})
+                        if not math.isnan(value):
+                            record[group][key] = value
+                    elif not math.isnan(value):
+                        record[group] = value
+                ingredient = built[row] = Ingredient(**record)
+            return ingredient
+
+        rows_by_category: Dict[str, Dict[str, int]] = {}
+        for row, (category, name) in enumerate(zip(matrix.categories, matrix.names)):
+            rows_by_category.setdefault(category, {})[name] = row
+        ingredients_db = {
+            category: CompiledIngredients(rows, build)
+            for category, rows in rows_by_category.items()
+        }
+        return cls(ingredients_db, matrix, CompiledIngredients(matrix.index, build))
+
+    @property
+    def version(self) -> str:
+        """Huella del contenido del catálogo"""
+        return self.matrix.version
+
+    def text_columns(self) -> Dict[str, List[str]]:
+        """Campos de texto de cada fila de la matriz, para la caché compilada"""
+        ingredients = [
+            ingredient
+            for category in self.ingredients_db.values()
+            for ingredient in category.values()
+        ]
+        return {field: [getattr(i, field) for i in ingredients] for field in TEXT_FIELDS}
+
+    def _compile_score_columns(self):
+        """
+        Precalcula por ingrediente la parte de cada score que solo depende de
+        sus propiedades (sabor, textura, escalabilidad y viabilidad). Así una
+        formulación se puntúa con un único producto proporciones × columnas.
+        """
+        matrix = self.matrix
+        moisture = matrix.column("texture_properties.moisture", DEFAULT_TEXTURE)
+        firmness = matrix.column("texture_properties.firmness", DEFAULT_TEXTURE)
+        elasticity = matrix.column("texture_properties.elasticity", DEFAULT_TEXTURE)
+        availability = matrix.column("availability", 0.0)
+        sustainability = matrix.column("sustainability_score", 0.0)
+        self.costs = matrix.column("cost", 0.0)
+        self.sustainability_scores = sustainability
+        normalized_cost = 1.0 - self.costs / MAX_COST
+
+        self.score_columns = np.ascontiguousarray(
+            np.column_stack(
+                [
+                    (moisture + firmness) / 2,  # sabor
+                    (elasticity + firmness) / 2,  # textura
+                    (availability + normalized_cost) / 2,  # escalabilidad
+                    (normalized_cost + availability + sustainability) / 3,  # viabilidad comercial
+                ]
+            )
+        )
+
+    def candidate_scores(
+        self, target_properties: Dict[str, float], rows: slice = slice(None)
+    ) -> np.ndarray:
+        """
+        Score total de cada ingrediente de `rows` como candidata de un solo
+        ingrediente, calculado sobre columnas para todas a la vez (NaN si no
+        se puede puntuar). Cada fila se calcula igual sea cual sea el rango.
+        """
+        amounts = self.initial_amounts(target_properties, rows)
+        scores = self.score_blends(
+            self.lookup_rows[rows, None],
+            amounts[:, None],
+            cost=self.costs[rows] * amounts,
+            sustainability=self.sustainability_scores[rows] * amounts,
+        )
+        return scores[:, -1]
+
+    def initial_amounts(
+        self, target_properties: Dict[str, float], rows: slice = slice(None)
+    ) -> np.ndarray:
+        """
+        Suma de `_calculate_initial_proportions` para cada fila del catálogo
+        (o de `rows`), calculada por columnas en lugar de ingrediente a
+        ingrediente.
+        """
+        ratios = []
+        for nutrient, target_value in target_properties.items():
+            column = f"nutritional_value.{nutrient}"
+            if column not in self.matrix.column_index:
+                # Ningún ingrediente lo declara: no aporta a ninguna proporción
+                continue
+            values = self.matrix.column(column)[rows]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ratio = np.where(values == 0, 1.0, np.minimum(1.0, target_value / values))
+            ratios.append(np.where(np.isnan(values), np.nan, ratio))
+        if not ratios:
+            return np.full(len(self.lookup_rows[rows]), sum(DEFAULT_PROPORTIONS))
+
+        ratios = np.column_stack(ratios)
+        present = ~np.isnan(ratios)
+        ratios = np.where(present, ratios, 0.0)
+        total = ratios.sum(axis=1)
+        fallback = ~present.any(axis=1) | (total == 0)
+        safe_total = np.where(fallback, 1.0, total)
+        amounts = (ratios / safe_total[:, None]).sum(axis=1)
+        amounts[fallback] = sum(DEFAULT_PROPORTIONS)
+        return amounts
+
+    def proportion_vector(self, formulation: "DoughFormulation") -> np.ndarray:
+        """Proporciones sobre las filas del catálogo (los ingredientes desconocidos se ignoran)"""
+        proportions = np.zeros(len(self.matrix))
+        for ingredient_dict in formulation.ingredients:
+            for name, proportion in ingredient_dict.items():
+                row = self.ingredient_rows.get(name)
+                if row is not None:
+                    proportions[row] += proportion
+        return proportions
+
+    def evaluate_proportions(
+        self,
+        proportions: np.ndarray,
+        cost: Optional[np.ndarray] = None,
+        sustainability: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Variante sin modelos de `evaluate_many`: una fila de proporciones por
+        formulación sobre las filas del catálogo (ver `ingredient_rows`).
+        """
+        scores = self.score_proportions(np.atleast_2d(proportions), cost, sustainability)
+        return np.ascontiguousarray(scores).view(SCORE_DTYPE).reshape(len(scores))
+
+    def score_proportions(
+        self,
+        proportions: np.ndarray,
+        cost: Optional[np.ndarray] = None,
+        sustainability: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Núcleo vectorizado de `evaluate_formulation`.
+
+        `proportions` es un vector sobre las filas del catálogo o una matriz
+        con una formulación por fila. Devuelve las columnas de `SCORE_NAMES`
+        (los seis scores y el total) con la misma forma de lote. Sin `cost` ni
+        `sustainability` se calculan a partir de las proporciones.
+        """
+        proportions = np.asarray(proportions, dtype=float)
+        weights = proportions.sum(axis=-1)
+        if cost is None:
+            cost = proportions @ self.costs
+        if sustainability is None:
+            sustainability = proportions @ self.sustainability_scores
+
+        return self._finish_scores(proportions @ self.score_columns, weights, cost, sustainability)
+
+    def score_blends(
+        self,
+        rows: np.ndarray,
+        amounts: np.ndarray,
+        cost: Optional[np.ndarray] = None,
+        sustainability: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Como `score_proportions` pero con mezclas dispersas: `rows` y `amounts`
+        de forma (N, k) dan las k filas del catálogo de cada mezcla y sus
+        proporciones. Evita materializar N × catálogo cuando k es pequeño.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        amounts = np.asarray(amounts, dtype=float)
+        if cost is None:
+            cost = (amounts * self.costs[rows]).sum(axis=-1)
+        if sustainability is None:
+            sustainability = (amounts * self.sustainability_scores[rows]).sum(axis=-1)
+        weighted = np.einsum("nk,nkc->nc", amounts, self.score_columns[rows])
+        return self._finish_scores(weighted, amounts.sum(axis=-1), cost, sustainability)
+
+    def _finish_scores(
+        self,
+        weighted: np.ndarray,
+        weights: np.ndarray,
+        cost: np.ndarray,
+        sustainability: np.ndarray,
+    ) -> np.ndarray:
+        """Scores a partir de las sumas ponderadas de las columnas y el peso total"""
+        # Medias ponderadas por proporción; sin ingredientes conocidos valen 0.5
+        safe_weights = np.where(weights > 0, weights, 1.0)[..., None]
+        weighted = np.where((weights > 0)[..., None], weighted / safe_weights, 0.5)
+
+        scores = np.empty(weights.shape + (len(SCORE_NAMES),))
+        scores[..., 0] = weighted[..., 0]
+        scores[..., 1] = weighted[..., 1]
+        scores[..., 2] = np.clip(1.0 - np.asarray(cost, dtype=float) / MAX_COST, 0.0, 1.0)
+        scores[..., 3] = sustainability
+        scores[..., 4] = weighted[..., 2]
+        scores[..., 5] = weighted[..., 3]
+        scores[..., 6] = scores[..., :6].mean(axis=-1)
+        return scores
@@ -0,0 +1,142 @@
+"""
+Caché compilada de un catálogo JSON (p. ej. data/ingredients.json).
+
+Parsear el JSON y validar cada ingrediente es lo que más tarda al cargar un
+catálogo grande. La caché guarda junto al JSON la matriz de propiedades en
+un .npy, que se proyecta con mmap, y una tabla JSON pequeña con nombres,
+categorías, columnas y campos de texto. Está ligada al fichero fuente por su
+mtime y tamaño; si cambian sin que cambie el contenido (p. ej. tras un
+checkout), se compara el SHA-256 y se reaprovecha.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .ingredient_matrix import IngredientMatrix
+from .shared_catalog import write_atomic
+
+# Se incrementa si cambia el formato de la caché: las anteriores se recompilan
+FORMAT_VERSION = 1
+SUFFIX = ".compiled"
+HASH_CHUNK = 1 << 20
+
+
+class CompiledCatalog:
+    """
+    Caché de `source_path` en `<fuente>.compiled.json` y
+    `<fuente>.compiled-<versión>.npy`, en el mismo directorio.
+    """
+
+    def __init__(self, source_path: str):
+        self.source_path = source_path
+        self.base = os.path.splitext(source_path)[0] + SUFFIX
+        self.meta_path = self.base + ".json"
+        # (mtime_ns, tamaño) de la fuente cuando se llamó a `load`
+        self.source_stat: Optional[Tuple[int, int]] = None
+
+    def load(self) -> Optional[Tuple[IngredientMatrix, Dict[str, List[str]]]]:
+        """
+        Matriz proyectada en memoria y campos de texto por fila si la caché
+        está al día, o None si no existe, está obsoleta o no se puede leer.
+        """
+        self.source_stat = self._stat()
+        if self.source_stat is None:
+            return None
+        meta = self._read_meta()
+        if meta is None or meta.get("format") != FORMAT_VERSION:
+            return None
+        source = meta["source"]
+        if (source["mtime_ns"], source["size"]) != self.source_stat:
+            if source["sha256"] != self._hash():
+                return None
+            # Mismo contenido con otra fecha: se actualiza la clave sin recompilar
+            source["mtime_ns"], source["size"] = self.source_stat
+            try:
+                self._write_meta(meta)
+            except OSError:
+                pass
+        try:
+            values = np.load(self._values_path(meta["version"]), mmap_mode="r", allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+        matrix = IngredientMatrix(meta["names"], meta["columns"], values, meta["categories"])
+        # La huella ya se calculó al compilar: recalcularla leería todas las páginas
+        matrix._version = meta["version"]
+        return matrix, meta["text"]
+
+    def save(self, matrix: IngredientMatrix, text: Dict[str, List[str]]) -> bool:
+        """
+        Compila la caché de la matriz leída del JSON tras un `load` fallido.
+        No escribe nada si la fuente cambió desde entonces; devuelve si se
+        guardó (un directorio de solo lectura no es un error).
+        """
+        if self.source_stat is None:
+            return False
+        try:
+            digest = self._hash()
+            if self._stat() != self.source_stat:
+                return False
+            version = matrix.version
+            values_path = self._values_path(version)
+            if not os.path.exists(values_path):
+                write_atomic(values_path, lambda f: np.save(f, matrix.values, allow_pickle=False))
+            mtime_ns, size = self.source_stat
+            self._write_meta(
+                {
+                    "format": FORMAT_VERSION,
+                    "source": {"mtime_ns": mtime_ns, "size": size, "sha256": digest},
+                    "version": version,
+                    "names": matrix.names,
+                    "columns": list(matrix.columns),
+                    "categories": matrix.categories,
+                    "text": text,
+                }
+            )
+            self._prune(version)
+        except OSError:
+            return False
+        return True
+
+    def _values_path(self, version: str) -> str:
+        return f"{self.base}-{version}.npy"
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.source_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _hash(self) -> str:
+        digest = hashlib.sha256()
+        with open(self.source_path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _read_meta(self) -> Optional[dict]:
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, meta: dict):
+        encoded = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+        write_atomic(self.meta_path, lambda f: f.write(encoded))
+
+    def _prune(self, current: str):
+        """Borra las matrices anteriores; las proyecciones abiertas siguen siendo válidas."""
+        directory = os.path.dirname(self.base) or "."
+        prefix = os.path.basename(self.base) + "-"
+        keep = f"{prefix}{current}.npy"
+        for name in os.listdir(directory):
+            if name.startswith(prefix) and name.endswith(".npy") and name != keep:
+                try:
+                    os.unlink(os.path.join(directory, name))
+                except FileNotFoundError:
+                    pass
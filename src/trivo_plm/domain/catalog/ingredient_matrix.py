@@ -0,0 +1,147 @@
+"""
+Catálogo de ingredientes en forma columnar.
+"""
+
+import hashlib
+from numbers import Real
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+
+class IngredientMatrix:
+    """
+    Matriz contigua de propiedades (ingredientes × columnas) con un índice
+    nombre→fila y el esquema de columnas. Las propiedades anidadas se aplanan
+    como "grupo.propiedad" (p. ej. "texture_properties.moisture") y los
+    valores ausentes quedan como NaN.
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        columns: Sequence[str],
+        values: np.ndarray,
+        categories: Optional[Sequence[str]] = None,
+    ):
+        self.names = list(names)
+        self.columns = tuple(columns)
+        self.values = np.ascontiguousarray(values, dtype=float).reshape(
+            len(self.names), len(self.columns)
+        )
+        self.categories = list(categories) if categories is not None else None
+
+        # Si un nombre se repite (p. ej. en dos categorías) manda la primera fila
+        self.index: Dict[str, int] = {}
+        for row, name in enumerate(self.names):
+            self.index.setdefault(name, row)
+        self.column_index = {column: j for j, column in enumerate(self.columns)}
+        self._version: Optional[str] = None
+
+    @property
+    def version(self) -> str:
+        """Huella del contenido: cambia con cualquier ingrediente, columna, precio o propiedad."""
+        if self._version is None:
+            digest = hashlib.sha1()
+            digest.update("\0".join(self.names).encode("utf-8"))
+            digest.update(b"\1" + "\0".join(self.columns).encode("utf-8") + b"\1")
+            digest.update(self.values.tobytes())
+            self._version = digest.hexdigest()[:16]
+        return self._version
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def column(self, name: str, default: Optional[float] = None) -> np.ndarray:
+        """
+        Columna completa. Sin `default` se devuelve una vista (con NaN en los
+        huecos); con `default` se devuelve una copia con los huecos rellenos.
+        """
+        if name not in self.column_index:
+            if default is None:
+                raise KeyError(name)
+            return np.full(len(self.names), default, dtype=float)
+        values = self.values[:, self.column_index[name]]
+        if default is None:
+            return values
+        return np.where(np.isnan(values), default, values)
+
+    def rows(self, names: Iterable[str]) -> np.ndarray:
+        """Filas de los nombres dados (-1 si el ingrediente no está)."""
+        return np.array([self.index.get(name, -1) for name in names], dtype=np.intp)
+
+    def lookup(self, names: Iterable[str], column: str, default: float = np.nan) -> np.ndarray:
+        """Valores de una columna para una lista de nombres, con `default` para ausentes."""
+        rows = self.rows(names)
+        values = np.full(rows.size, default, dtype=float)
+        found = rows >= 0
+        values[found] = self.column(column, default)[rows[found]]
+        return values
+
+    def value(self, name: str, column: str, default: float = np.nan) -> float:
+        """Valor de una propiedad de un ingrediente."""
+        row = self.index.get(name)
+        j = self.column_index.get(column)
+        if row is None or j is None or np.isnan(self.values[row, j]):
+            return default
+        return float(self.values[row, j])
+
+    @classmethod
+    def from_records(
+        cls, records: Mapping[str, Mapping[str, Any]], columns: Optional[Sequence[str]] = None
+    ) -> "IngredientMatrix":
+        """Construye la matriz desde un diccionario nombre→propiedades."""
+        return cls._build(list(records), [_flatten(record) for record in records.values()], columns)
+
+    @classmethod
+    def from_categories(
+        cls,
+        data: Mapping[str, Mapping[str, Mapping[str, Any]]],
+        columns: Optional[Sequence[str]] = None,
+    ) -> "IngredientMatrix":
+        """Construye la matriz desde categoría→nombre→propiedades (como ingredients.json)."""
+        names: List[str] = []
+        categories: List[str] = []
+        flat: List[Dict[str, float]] = []
+        for category, ingredients in data.items():
+            for name, record in ingredients.items():
+                names.append(name)
+                categories.append(category)
+                flat.append(_flatten(record))
+        return cls._build(names, flat, columns, categories)
+
+    @classmethod
+    def _build(
+        cls,
+        names: List[str],
+        flat: List[Dict[str, float]],
+        columns: Optional[Sequence[str]],
+        categories: Optional[List[str]] = None,
+    ) -> "IngredientMatrix":
+        if columns is None:
+            # Orden de primera aparición, estable entre cargas del mismo archivo
+            columns = list(dict.fromkeys(key for record in flat for key in record))
+        column_index = {column: j for j, column in enumerate(columns)}
+        values = np.full((len(names), len(columns)), np.nan)
+        for row, record in enumerate(flat):
+            for key, value in record.items():
+                j = column_index.get(key)
+                if j is not None:
+                    values[row, j] = value
+        return cls(names, columns, values, categories)
+
+
+def _flatten(record: Mapping[str, Any], prefix: str = "") -> Dict[str, float]:
+    """Aplana un registro dejando solo los valores numéricos."""
+    if hasattr(record, "model_dump"):
+        record = record.model_dump()
+    flat: Dict[str, float] = {}
+    for key, value in record.items():
+        if isinstance(value, Mapping):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, Real) and not isinstance(value, bool):
+            flat[f"{prefix}{key}"] = float(value)
+    return flat
@@ -0,0 +1,140 @@
+"""
+Catálogo compilado compartido entre procesos.
+
+Un proceso publica la matriz de ingredientes en un directorio (en Linux,
+idealmente en /dev/shm) y el resto de workers la proyecta en memoria de solo
+lectura con mmap: todos comparten las mismas páginas en lugar de tener una
+copia cada uno. Cada versión se escribe en sus propios ficheros y el puntero
+CURRENT se sustituye con un rename atómico, así que un worker siempre ve una
+versión completa, la anterior o la nueva.
+"""
+
+import json
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from .ingredient_matrix import IngredientMatrix
+
+POINTER = "CURRENT"
+# Versiones que se conservan en disco: la actual y la anterior, por si un
+# worker leyó el puntero justo antes del cambio y todavía no abrió los ficheros
+KEEP_VERSIONS = 2
+
+
+class SharedCatalog:
+    """Publicación y lectura de un `IngredientMatrix` proyectado en memoria."""
+
+    def __init__(
+        self,
+        directory: str,
+        refresh_interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.directory = directory
+        self.refresh_interval = refresh_interval
+        self.clock = clock
+        self.version: Optional[str] = None
+        self._checked_at = -np.inf
+        os.makedirs(directory, exist_ok=True)
+
+    def publish(self, matrix: IngredientMatrix, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Escribe la matriz (y metadatos JSON opcionales, p. ej. nombres
+        legibles) y la convierte en la versión vigente.
+        """
+        version = matrix.version
+        values_path, meta_path = self._paths(version)
+        if not os.path.exists(values_path):
+            meta = {
+                "names": matrix.names,
+                "columns": list(matrix.columns),
+                "categories": matrix.categories,
+                "metadata": metadata,
+            }
+            # Primero los datos y los metadatos; el puntero solo cuando ambos existen
+            encoded = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+            self._write_atomic(meta_path, lambda f: f.write(encoded))
+            self._write_atomic(values_path, lambda f: np.save(f, matrix.values, allow_pickle=False))
+        self._write_atomic(self._pointer_path(), lambda f: f.write(version.encode("ascii")))
+        self._prune(version)
+        return version
+
+    def current_version(self) -> Optional[str]:
+        try:
+            with open(self._pointer_path(), "r", encoding="ascii") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def attach(self) -> Optional[Tuple[IngredientMatrix, Optional[Dict[str, Any]]]]:
+        """Proyecta la versión vigente (matriz de solo lectura y metadatos), o None si no hay."""
+        version = self.current_version()
+        if version is None:
+            return None
+        values_path, meta_path = self._paths(version)
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        values = np.load(values_path, mmap_mode="r", allow_pickle=False)
+        matrix = IngredientMatrix(meta["names"], meta["columns"], values, meta["categories"])
+        # La huella ya se calculó al publicar: recalcularla leería todas las páginas
+        matrix._version = version
+        self.version = version
+        self._checked_at = self.clock()
+        return matrix, meta["metadata"]
+
+    def refresh(self) -> Optional[Tuple[IngredientMatrix, Optional[Dict[str, Any]]]]:
+        """
+        Devuelve la nueva versión si el puntero cambió desde el último
+        `attach`, o None. Consulta el disco como mucho una vez por intervalo.
+        """
+        now = self.clock()
+        if now - self._checked_at < self.refresh_interval:
+            return None
+        self._checked_at = now
+        version = self.current_version()
+        if version is None or version == self.version:
+            return None
+        return self.attach()
+
+    def _paths(self, version: str) -> Tuple[str, str]:
+        base = os.path.join(self.directory, f"catalog-{version}")
+        return base + ".npy", base + ".json"
+
+    def _pointer_path(self) -> str:
+        return os.path.join(self.directory, POINTER)
+
+    def _write_atomic(self, path: str, write: Callable):
+        write_atomic(path, write)
+
+    def _prune(self, current: str):
+        """Borra las versiones antiguas; las proyecciones abiertas siguen siendo válidas."""
+        versions = []
+        for name in os.listdir(self.directory):
+            if name.startswith("catalog-") and name.endswith(".npy"):
+                version = name[len("catalog-") : -len(".npy")]
+                if version != current:
+                    path = os.path.join(self.directory, name)
+                    versions.append((os.stat(path).st_mtime_ns, version))
+        versions.sort(reverse=True)
+        for _, version in versions[KEEP_VERSIONS - 1 :]:
+            for path in self._paths(version):
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+
+
+def write_atomic(path: str, write: Callable):
+    """Escribe `path` con `write(f)` en un temporal del mismo directorio y lo renombra encima."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
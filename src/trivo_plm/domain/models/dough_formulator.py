@@ -1,10 +1,14 @@
-import json
 import os
-from typing import Dict, List
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Union
 
 import numpy as np
 from pydantic import BaseModel
 
+from src.trivo_plm.domain.cache import SCORE_CACHE_SIZE, ScoreCache
+from src.trivo_plm.domain.catalog import CatalogProvider, CatalogSnapshot
+from src.trivo_plm.domain.catalog.catalog_snapshot import DEFAULT_PROPORTIONS, MAX_COST, SCORE_NAMES
+from src.trivo_plm.domain.optimization import BlendSearch, CandidatePool, top_candidates
+
 
 class Ingredient(BaseModel):
     name: str
@@ -24,27 +28,77 @@ class DoughFormulation(BaseModel):
     sustainability_score: float
 
 
+def _catalog_attribute(name: str) -> property:
+    """Atributo de la versión vigente del catálogo"""
+    return property(lambda self: getattr(self.catalog, name))
+
+
 class DoughFormulator:
-    def __init__(self):
-        self.ingredients_db = {}
+    # Vistas de la versión vigente; las operaciones leen `catalog` una sola vez
+    matrix = _catalog_attribute("matrix")
+    ingredients_by_name = _catalog_attribute("ingredients_by_name")
+    ingredient_rows = _catalog_attribute("ingredient_rows")
+    lookup_rows = _catalog_attribute("lookup_rows")
+    costs = _catalog_attribute("costs")
+    sustainability_scores = _catalog_attribute("sustainability_scores")
+    score_columns = _catalog_attribute("score_columns")
+
+    def __init__(
+        self,
+        provider: Optional[CatalogProvider] = None,
+        workers: Optional[int] = None,
+        score_cache_size: int = SCORE_CACHE_SIZE,
+    ):
+        # Catálogo propio de la instancia; solo se usa si se asigna `ingredients_db`
+        self._catalog: Optional[CatalogSnapshot] = None
+        # Sin proveedor se usa el compartido del ingredients.json del paquete
+        self.provider = provider
+        # Con varios workers los catálogos grandes se puntúan en paralelo
+        self.pool = CandidatePool(workers) if workers and workers > 1 else None
+        # Evaluaciones ya hechas (0 la desactiva); ver `score_cache.stats()`
+        self.score_cache = ScoreCache(score_cache_size) if score_cache_size > 0 else None
         self.load_ingredients()
 
+    def close(self):
+        """Detiene los procesos del modo paralelo, si los hay"""
+        if self.pool is not None:
+            self.pool.close()
+
+    @property
+    def catalog(self) -> CatalogSnapshot:
+        """
+        Versión vigente del catálogo. Cada operación la lee una vez al empezar,
+        así que termina con esa versión aunque el proveedor la sustituya.
+        """
+        if self.provider is not None:
+            return self.provider.snapshot()
+        return self._catalog
+
+    @property
+    def ingredients_db(self) -> Mapping[str, Mapping[str, Ingredient]]:
+        return self.catalog.ingredients_db
+
+    @ingredients_db.setter
+    def ingredients_db(self, ingredients_db: Dict[str, Dict[str, Ingredient]]):
+        """Asignar un catálogo lo compila para esta instancia, que deja de usar el compartido"""
+        self._catalog = CatalogSnapshot.from_ingredients(ingredients_db)
+        self.provider = None
+
+    def get_ingredient(self, name: str) -> Optional[Ingredient]:
+        """Ingrediente por nombre, sin recorrer las categorías"""
+        return self.catalog.ingredients_by_name.get(name)
+
     def load_ingredients(self):
         """Cargar base de datos de ingredientes"""
         try:
-            # Ruta al archivo de ingredientes
-            ingredients_path = os.path.join(
-                os.path.dirname(__file__), "..", "data", "ingredients.json"
-            )
-
-            with open(ingredients_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            # Convertir los datos a objetos Ingredient
-            for category, ingredients in data.items():
-                self.ingredients_db[category] = {
-                    name: Ingredient(**ingredient) for name, ingredient in ingredients.items()
-                }
+            if self.provider is None:
+                # Ruta al archivo de ingredientes
+                ingredients_path = os.path.join(
+                    os.path.dirname(__file__), "..", "data", "ingredients.json"
+                )
+                self.provider = CatalogProvider.shared(ingredients_path)
+            # Solo la primera instancia del proceso lee el archivo; el resto comparte su versión
+            self.provider.snapshot()
         except Exception as e:
             print(f"Error al cargar ingredientes: {e}")
             # Cargar datos de ejemplo si hay error
@@ -67,7 +121,13 @@ class DoughFormulator:
                 }
             }
 
-    def optimize_formulation(self, target_properties: Dict[str, float]) -> DoughFormulation:
+    def optimize_formulation(
+        self,
+        target_properties: Dict[str, float],
+        blend_size: int = 1,
+        min_share: float = 0.05,
+        top_k: Optional[int] = None,
+    ) -> Union[Optional[DoughFormulation], List[DoughFormulation]]:
         """
         Optimizar la formulación considerando:
         - Propiedades nutricionales
@@ -75,37 +135,134 @@ class DoughFormulator:
         - Disponibilidad local
         - Sostenibilidad
         - Textura y sabor
-        """
-        # Inicializar variables
-        best_formulation = None
-        best_score = float("-inf")
-
-        # Generar combinaciones de ingredientes
-        for category, ingredients in self.ingredients_db.items():
-            for name, ingredient in ingredients.items():
-                # Calcular proporciones iniciales
-                proportions = self._calculate_initial_proportions(ingredient, target_properties)
-
-                # Crear formulación
-                formulation = DoughFormulation(
-                    ingredients=[{name: prop} for prop in proportions],
-                    target_properties=target_properties,
-                    nutritional_profile=self._calculate_nutritional_profile(
-                        proportions, ingredient
-                    ),
-                    cost=self._calculate_cost(proportions, ingredient),
-                    sustainability_score=self._calculate_sustainability(proportions, ingredient),
-                )
-
-                # Evaluar formulación
-                score = self._evaluate_formulation_score(formulation)
 
-                # Actualizar mejor formulación
-                if score > best_score:
-                    best_score = score
-                    best_formulation = formulation
-
-        return best_formulation
+        Con `blend_size` > 1 busca la mejor mezcla de hasta `blend_size`
+        ingredientes (cada uno con al menos `min_share`) cuyo perfil
+        nutricional alcance los objetivos (ver `optimize_blend`). Con `top_k`
+        devuelve una lista con las `top_k` mejores alternativas, de mejor a
+        peor (ver `iter_formulations`).
+        """
+        if blend_size > 1:
+            if top_k is not None and top_k > 1:
+                raise ValueError("top_k > 1 solo está disponible con blend_size = 1")
+            blend = self.optimize_blend(target_properties, blend_size, min_share)
+            if top_k is None:
+                return blend
+            return [blend] if blend is not None else []
+
+        if top_k is not None:
+            return list(self.iter_formulations(target_properties, top_k))
+        # La ganadora es la primera de la clasificación; solo ella se construye como modelo
+        return next(self.iter_formulations(target_properties, 1), None)
+
+    def iter_formulations(
+        self, target_properties: Dict[str, float], top_k: int
+    ) -> Iterator[DoughFormulation]:
+        """
+        Las `top_k` mejores formulaciones de un ingrediente, de mejor a peor.
+        Todas las candidatas se puntúan en una sola pasada; cada modelo se
+        construye al pedirlo, así que cortar la iteración no cuesta más.
+        """
+        catalog = self.catalog
+        if self.pool is not None and len(catalog.matrix) >= self.pool.min_candidates:
+            ranking = self.pool.rank(catalog, target_properties, top_k)
+        else:
+            ranking = top_candidates(catalog.candidate_scores(target_properties), top_k)
+        for row in ranking.tolist():
+            yield self._build_formulation(row, target_properties, catalog)
+
+    def _build_formulation(
+        self,
+        row: int,
+        target_properties: Dict[str, float],
+        catalog: Optional[CatalogSnapshot] = None,
+    ) -> DoughFormulation:
+        """Formulación de un solo ingrediente (fila del catálogo) como modelo pydantic"""
+        if catalog is None:
+            catalog = self.catalog
+        name = catalog.matrix.names[row]
+        ingredient = catalog.ingredients_db[catalog.matrix.categories[row]][name]
+        proportions = self._calculate_initial_proportions(ingredient, target_properties)
+        return DoughFormulation(
+            ingredients=[{name: prop} for prop in proportions],
+            target_properties=target_properties,
+            nutritional_profile=self._calculate_nutritional_profile(proportions, ingredient),
+            cost=self._calculate_cost(proportions, ingredient),
+            sustainability_score=self._calculate_sustainability(proportions, ingredient),
+        )
+
+    def optimize_blend(
+        self,
+        target_properties: Dict[str, float],
+        max_ingredients: int,
+        min_share: float = 0.05,
+        max_nodes: int = 100_000,
+    ) -> Optional[DoughFormulation]:
+        """
+        Mejor mezcla de hasta `max_ingredients` ingredientes por ramificación
+        y acotación. Los objetivos son mínimos del perfil nutricional de la
+        mezcla (proporciones que suman 1). Devuelve None si ninguna mezcla los
+        alcanza.
+
+        Con proporciones que suman 1 el score total es lineal salvo por el
+        recorte del score de costo, así que los coeficientes por ingrediente
+        (con el costo recortado) son una cota superior exacta para podar.
+        """
+        catalog = self.catalog
+        # Una fila por nombre: las repetidas se evalúan con la primera
+        rows = np.flatnonzero(catalog.lookup_rows == np.arange(len(catalog.matrix)))
+        if rows.size == 0:
+            return None
+        nutrients = list(target_properties)
+        values = np.zeros((len(nutrients), rows.size))
+        for i, nutrient in enumerate(nutrients):
+            values[i] = catalog.matrix.column(f"nutritional_value.{nutrient}", 0.0)[rows]
+
+        cost_scores = np.clip(1.0 - catalog.costs[rows] / MAX_COST, 0.0, 1.0)
+        columns = catalog.score_columns[rows]
+        linear = (columns.sum(axis=1) + cost_scores + catalog.sustainability_scores[rows]) / 6
+
+        def evaluate(blend: np.ndarray, proportions: np.ndarray) -> float:
+            return float(catalog.score_blends(rows[blend][None], proportions[None])[0, -1])
+
+        search = BlendSearch(
+            linear,
+            values,
+            nutrient_labels=nutrients,
+            var_labels=[catalog.matrix.names[row] for row in rows],
+        )
+        result = search.search(
+            [target_properties[nutrient] for nutrient in nutrients],
+            max_ingredients,
+            min_share=min_share,
+            evaluate=evaluate,
+            max_nodes=max_nodes,
+        )
+        if result is None:
+            return None
+        return self._build_blend(rows[result.rows], result.proportions, target_properties, catalog)
+
+    def _build_blend(
+        self,
+        rows: np.ndarray,
+        proportions: np.ndarray,
+        target_properties: Dict[str, float],
+        catalog: CatalogSnapshot,
+    ) -> DoughFormulation:
+        """Formulación de una mezcla (filas del catálogo y proporciones) como modelo pydantic"""
+        ingredients, profile = [], {}
+        for row, proportion in zip(rows.tolist(), proportions.tolist()):
+            name = catalog.matrix.names[row]
+            ingredients.append({name: proportion})
+            for nutrient, value in catalog.ingredients_by_name[name].nutritional_value.items():
+                profile[nutrient] = profile.get(nutrient, 0.0) + value * proportion
+        return DoughFormulation(
+            ingredients=ingredients,
+            target_properties=target_properties,
+            nutritional_profile=profile,
+            cost=float(proportions @ catalog.costs[rows]),
+            sustainability_score=float(proportions @ catalog.sustainability_scores[rows]),
+        )
 
     def evaluate_formulation(self, formulation: DoughFormulation) -> Dict[str, float]:
         """
@@ -116,19 +273,75 @@ class DoughFormulator:
         - Escalabilidad
         - Viabilidad comercial
         """
-        evaluation = {
-            "taste_score": self._evaluate_taste(formulation),
-            "texture_score": self._evaluate_texture(formulation),
-            "cost_score": self._evaluate_cost(formulation),
-            "sustainability_score": self._evaluate_sustainability(formulation),
-            "scalability_score": self._evaluate_scalability(formulation),
-            "commercial_viability": self._evaluate_commercial_viability(formulation),
-        }
+        catalog = self.catalog
 
-        # Calcular score total
-        evaluation["total_score"] = np.mean(list(evaluation.values()))
+        def compute() -> Dict[str, float]:
+            scores = catalog.score_proportions(
+                catalog.proportion_vector(formulation),
+                cost=formulation.cost,
+                sustainability=formulation.sustainability_score,
+            )
+            return dict(zip(SCORE_NAMES, scores.tolist()))
 
-        return evaluation
+        if self.score_cache is None:
+            return compute()
+        return self.score_cache.get_or_compute(formulation, catalog.version, compute)
+
+    def evaluate_many(self, formulations: Sequence[DoughFormulation]) -> np.ndarray:
+        """
+        Evalúa N formulaciones en una sola llamada. Devuelve un array
+        estructurado de N registros con los campos de `SCORE_NAMES`
+        (p. ej. `scores["total_score"]`), igual que N `evaluate_formulation`.
+        """
+        catalog = self.catalog
+        batch, rows, values = [], [], []
+        for i, formulation in enumerate(formulations):
+            for ingredient_dict in formulation.ingredients:
+                for name, proportion in ingredient_dict.items():
+                    row = catalog.ingredient_rows.get(name)
+                    if row is not None:
+                        batch.append(i)
+                        rows.append(row)
+                        values.append(proportion)
+        proportions = np.zeros((len(formulations), len(catalog.matrix)))
+        np.add.at(proportions, (batch, rows), values)
+        cost = np.fromiter((f.cost for f in formulations), float, len(formulations))
+        sustainability = np.fromiter(
+            (f.sustainability_score for f in formulations), float, len(formulations)
+        )
+        return catalog.evaluate_proportions(proportions, cost, sustainability)
+
+    def evaluate_proportions(
+        self,
+        proportions: np.ndarray,
+        cost: Optional[np.ndarray] = None,
+        sustainability: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Ver `CatalogSnapshot.evaluate_proportions` (sobre la versión vigente)"""
+        return self.catalog.evaluate_proportions(proportions, cost, sustainability)
+
+    def proportion_vector(self, formulation: DoughFormulation) -> np.ndarray:
+        """Ver `CatalogSnapshot.proportion_vector` (sobre la versión vigente)"""
+        return self.catalog.proportion_vector(formulation)
+
+    def score_proportions(
+        self,
+        proportions: np.ndarray,
+        cost: Optional[np.ndarray] = None,
+        sustainability: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Ver `CatalogSnapshot.score_proportions` (sobre la versión vigente)"""
+        return self.catalog.score_proportions(proportions, cost, sustainability)
+
+    def score_blends(
+        self,
+        rows: np.ndarray,
+        amounts: np.ndarray,
+        cost: Optional[np.ndarray] = None,
+        sustainability: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Ver `CatalogSnapshot.score_blends` (sobre la versión vigente)"""
+        return self.catalog.score_blends(rows, amounts, cost, sustainability)
 
     def _calculate_initial_proportions(
         self, ingredient: Ingredient, target_properties: Dict[str, float]
@@ -139,15 +352,18 @@ class DoughFormulator:
 
         for nutrient, target_value in target_properties.items():
             if nutrient in ingredient.nutritional_value:
-                proportion = target_value / ingredient.nutritional_value[nutrient]
+                value = ingredient.nutritional_value[nutrient]
+                # Un nutriente ausente (0) satura la proporción en lugar de dividir por cero
+                proportion = target_value / value if value else 1.0
                 proportions.append(min(1.0, proportion))  # Limitar a 1.0
 
         # Normalizar proporciones
-        if proportions:
-            total = sum(proportions)
+        total = sum(proportions)
+        if proportions and total != 0:
             proportions = [p / total for p in proportions]
         else:
-            proportions = [0.3, 0.4, 0.3]  # Valores por defecto si no hay coincidencias
+            # Valores por defecto si no hay coincidencias
+            proportions = list(DEFAULT_PROPORTIONS)
 
         return proportions
 
@@ -173,118 +389,6 @@ class DoughFormulator:
         evaluation = self.evaluate_formulation(formulation)
         return evaluation["total_score"]
 
-    def _evaluate_taste(self, formulation: DoughFormulation) -> float:
-        """Evaluar sabor de la formulación"""
-        # Calcular score de sabor basado en ingredientes y sus proporciones
-        taste_score = 0.0
-        total_weight = 0.0
-
-        for ingredient_dict in formulation.ingredients:
-            for name, proportion in ingredient_dict.items():
-                # Buscar el ingrediente en la base de datos
-                for category in self.ingredients_db.values():
-                    if name in category:
-                        ingredient = category[name]
-                        # Considerar propiedades que afectan el sabor
-                        taste_score += (
-                            proportion
-                            * (
-                                ingredient.texture_properties.get("moisture", 0.5)
-                                + ingredient.texture_properties.get("firmness", 0.5)
-                            )
-                            / 2
-                        )
-                        total_weight += proportion
-
-        return taste_score / total_weight if total_weight > 0 else 0.5
-
-    def _evaluate_texture(self, formulation: DoughFormulation) -> float:
-        """Evaluar textura de la formulación"""
-        # Calcular score de textura basado en propiedades de los ingredientes
-        texture_score = 0.0
-        total_weight = 0.0
-
-        for ingredient_dict in formulation.ingredients:
-            for name, proportion in ingredient_dict.items():
-                # Buscar el ingrediente en la base de datos
-                for category in self.ingredients_db.values():
-                    if name in category:
-                        ingredient = category[name]
-                        # Considerar propiedades de textura
-                        texture_score += (
-                            proportion
-                            * (
-                                ingredient.texture_properties.get("elasticity", 0.5)
-                                + ingredient.texture_properties.get("firmness", 0.5)
-                            )
-                            / 2
-                        )
-                        total_weight += proportion
-
-        return texture_score / total_weight if total_weight > 0 else 0.5
-
-    def _evaluate_cost(self, formulation: DoughFormulation) -> float:
-        """Evaluar costo de la formulación"""
-        # Calcular score de costo (menor costo = mayor score)
-        max_cost = 100.0  # Costo máximo aceptable
-        cost_score = 1.0 - (formulation.cost / max_cost)
-        return max(0.0, min(1.0, cost_score))
-
-    def _evaluate_sustainability(self, formulation: DoughFormulation) -> float:
-        """Evaluar sostenibilidad de la formulación"""
-        return formulation.sustainability_score
-
-    def _evaluate_scalability(self, formulation: DoughFormulation) -> float:
-        """Evaluar escalabilidad de la formulación"""
-        # Calcular score de escalabilidad basado en disponibilidad de ingredientes
-        scalability_score = 0.0
-        total_weight = 0.0
-
-        for ingredient_dict in formulation.ingredients:
-            for name, proportion in ingredient_dict.items():
-                # Buscar el ingrediente en la base de datos
-                for category in self.ingredients_db.values():
-                    if name in category:
-                        ingredient = category[name]
-                        # Considerar disponibilidad y costos
-                        scalability_score += (
-                            proportion
-                            * (
-                                ingredient.availability
-                                + (1.0 - ingredient.cost / 100.0)  # Normalizar costo
-                            )
-                            / 2
-                        )
-                        total_weight += proportion
-
-        return scalability_score / total_weight if total_weight > 0 else 0.5
-
-    def _evaluate_commercial_viability(self, formulation: DoughFormulation) -> float:
-        """Evaluar viabilidad comercial de la formulación"""
-        # Calcular score de viabilidad comercial basado en múltiples factores
-        viability_score = 0.0
-        total_weight = 0.0
-
-        for ingredient_dict in formulation.ingredients:
-            for name, proportion in ingredient_dict.items():
-                # Buscar el ingrediente en la base de datos
-                for category in self.ingredients_db.values():
-                    if name in category:
-                        ingredient = category[name]
-                        # Considerar costo, disponibilidad y sostenibilidad
-                        viability_score += (
-                            proportion
-                            * (
-                                (1.0 - ingredient.cost / 100.0)  # Normalizar costo
-                                + ingredient.availability
-                                + ingredient.sustainability_score
-                            )
-                            / 3
-                        )
-                        total_weight += proportion
-
-        return viability_score / total_weight if total_weight > 0 else 0.5
-
     def _calculate_nutritional_score(self, nutrients: Dict[str, float]) -> float:
         """Calcula el puntaje nutricional basado en los nutrientes."""
         score = 0.0
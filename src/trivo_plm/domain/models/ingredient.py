@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Optional, List
 from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
-from src.core.models.base import Base
+from .base import Base
 
 class Ingredient(Base):
     """Modelo de ingrediente para el sistema."""
@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Optional, List
 from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text
 from sqlalchemy.orm import relationship
-from src.core.models.base import Base
+from .base import Base
 
 class Recipe(Base):
     """Modelo de receta para el sistema."""
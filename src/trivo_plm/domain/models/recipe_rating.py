@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Optional
 from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
-from src.core.models.base import Base
+from .base import Base
 
 class RecipeRating(Base):
     """Modelo de calificaciones de recetas."""
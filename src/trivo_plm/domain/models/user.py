@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Optional
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, Enum
 from sqlalchemy.orm import relationship
-from src.core.models.base import Base
+from .base import Base
 import enum
 
 class UserRole(enum.Enum):
@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Optional, List
 from sqlalchemy import Column, Integer, String, JSON, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
-from src.core.models.base import Base
+from .base import Base
 
 class UserPreference(Base):
     """Modelo de preferencias de usuario para el sistema."""
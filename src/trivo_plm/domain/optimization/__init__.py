@@ -0,0 +1,24 @@
+"""
+Motores de optimización de formulaciones
+"""
+
+from .blend_search import BlendSearch, BlendSearchResult
+from .blend_solver import CONSTRAINT_SIGNS, CONSTRAINTS, BlendSolver
+from .candidate_pool import CandidatePool, top_candidates
+from .linear_program import INFEASIBLE, ITERATION_LIMIT, OPTIMAL, Basis, LinearProgram, LPSolution
+
+__all__ = [
+    "Basis",
+    "BlendSearch",
+    "BlendSearchResult",
+    "BlendSolver",
+    "CandidatePool",
+    "CONSTRAINT_SIGNS",
+    "CONSTRAINTS",
+    "INFEASIBLE",
+    "ITERATION_LIMIT",
+    "LinearProgram",
+    "LPSolution",
+    "OPTIMAL",
+    "top_candidates",
+]
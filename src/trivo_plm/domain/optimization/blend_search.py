@@ -0,0 +1,172 @@
+"""
+Búsqueda de la mejor mezcla de pocos ingredientes por ramificación y acotación.
+
+    max  score·p
+    s.a. nutrientes·p >= objetivos
+         sum(p) = 1
+         p_j = 0  o  min_share <= p_j <= 1
+         como mucho `max_ingredients` p_j > 0
+
+Cada nodo fija ingredientes dentro (p_j >= min_share) o fuera (p_j = 0); los
+de dentro se marcan aparte de su mínimo, así que `min_share = 0` también
+ramifica (solo limita el número de ingredientes). La
+cota de un nodo se calcula en dos pasos: primero una cota O(n) que ignora los
+nutrientes (la mezcla no puede superar al mejor ingrediente permitido) y, solo
+si esa no basta para podar, la relajación lineal sin el límite de
+ingredientes. La relajación solo lleva las columnas permitidas y ninguna fila
+de cota (p_j <= 1 ya lo impone sum(p) = 1), así que tiene tantas filas como
+nutrientes más dos y el simplex dual la resuelve en pocos pivotes.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .linear_program import LinearProgram, LPSolution
+
+# Diferencia de score por debajo de la cual una rama no se considera mejor
+SCORE_TOLERANCE = 1e-9
+# Proporción por debajo de la cual un ingrediente se considera ausente
+SHARE_TOLERANCE = 1e-9
+
+
+@dataclass
+class BlendSearchResult:
+    """Mejor mezcla encontrada (filas y proporciones) y estadísticas de la búsqueda."""
+
+    rows: np.ndarray
+    proportions: np.ndarray
+    score: float
+    nodes: int
+    pruned: int
+    complete: bool
+
+
+class BlendSearch:
+    """
+    Ramificación y acotación sobre las columnas de un catálogo para un
+    conjunto de nutrientes.
+
+    `scores` son los coeficientes lineales del score (una cota superior del
+    score real, o el score exacto si es lineal); `evaluate(rows, proportions)`
+    puntúa una mezcla concreta con el score real.
+    """
+
+    def __init__(
+        self,
+        scores: Sequence[float],
+        nutrients: np.ndarray,
+        nutrient_labels: Optional[Sequence[str]] = None,
+        var_labels: Optional[Sequence[str]] = None,
+    ):
+        self.scores = np.asarray(scores, dtype=float)
+        n = self.scores.size
+        self.nutrients = np.nan_to_num(np.asarray(nutrients, dtype=float).reshape(-1, n))
+        self.nutrient_labels = list(nutrient_labels) if nutrient_labels is not None else None
+        if var_labels is None:
+            var_labels = [f"x{j}" for j in range(n)]
+        self.var_labels = list(var_labels)
+        # Como sum(p) = 1, maximizar score·p es minimizar (shift - score)·p con costos >= 0
+        self.shift = float(self.scores.max()) if n else 0.0
+
+    def search(
+        self,
+        targets: Sequence[float],
+        max_ingredients: int,
+        min_share: float = 0.05,
+        evaluate: Optional[Callable[[np.ndarray, np.ndarray], float]] = None,
+        max_nodes: int = 100_000,
+    ) -> Optional[BlendSearchResult]:
+        """
+        Mejor mezcla de hasta `max_ingredients` ingredientes, o None si
+        ninguna cumple los objetivos. Con `max_nodes` agotado devuelve la
+        mejor encontrada hasta entonces (`complete=False`).
+        """
+        if max_ingredients < 1:
+            raise ValueError("max_ingredients debe ser al menos 1")
+        if min_share < 0:
+            raise ValueError("min_share no puede ser negativo")
+        if min_share * max_ingredients > 1.0 + SHARE_TOLERANCE:
+            raise ValueError("min_share × max_ingredients no puede superar 1")
+        if evaluate is None:
+            evaluate = lambda rows, proportions: float(proportions @ self.scores[rows])
+
+        n = self.scores.size
+        b_ub = -np.asarray(targets, dtype=float)
+        best: Optional[Tuple[float, np.ndarray, np.ndarray]] = None
+        best_score = -np.inf
+        nodes = pruned = 0
+
+        # Pila de nodos (mínimos, permitidos, dentro): búsqueda en profundidad, incluyendo primero
+        stack: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = [
+            (np.zeros(n), np.ones(n, dtype=bool), np.zeros(n, dtype=bool))
+        ]
+        while stack:
+            if nodes >= max_nodes:
+                break
+            lo, allowed, chosen = stack.pop()
+
+            if self._cheap_bound(lo, allowed) <= best_score + SCORE_TOLERANCE:
+                pruned += 1
+                continue
+
+            nodes += 1
+            solution = self._relaxation(b_ub, lo, allowed)
+            if not solution.is_optimal:
+                continue
+            bound = self.shift - solution.objective
+            if bound <= best_score + SCORE_TOLERANCE:
+                pruned += 1
+                continue
+
+            p = np.zeros(n)
+            p[allowed] = solution.x
+            positive = p > SHARE_TOLERANCE
+            undecided = ~chosen
+            too_small = positive & undecided & (p < min_share - SHARE_TOLERANCE)
+            if positive.sum() <= max_ingredients and not too_small.any():
+                # La relajación ya es una mezcla válida: es el óptimo del nodo
+                rows = np.flatnonzero(positive)
+                proportions = p[rows] / p[rows].sum()
+                score = evaluate(rows, proportions)
+                if score > best_score:
+                    best_score, best = score, (score, rows, proportions)
+                continue
+
+            # Ramificar en el ingrediente sin decidir con mayor proporción
+            j = int(np.argmax(np.where(positive & undecided, p, -1.0)))
+            allowed_out = allowed.copy()
+            allowed_out[j] = False
+            lo_in, allowed_in, chosen_in = lo.copy(), allowed, chosen.copy()
+            lo_in[j] = min_share
+            chosen_in[j] = True
+            if np.count_nonzero(chosen_in) == max_ingredients:
+                # Mezcla completa: el resto queda fuera
+                allowed_in = chosen_in
+            stack.append((lo, allowed_out, chosen))
+            stack.append((lo_in, allowed_in, chosen_in))
+
+        if best is None:
+            return None
+        score, rows, proportions = best
+        return BlendSearchResult(rows, proportions, score, nodes, pruned, complete=not stack)
+
+    def _relaxation(self, b_ub: np.ndarray, lo: np.ndarray, allowed: np.ndarray) -> LPSolution:
+        """Relajación lineal del nodo en las columnas permitidas, sin límite de ingredientes."""
+        program = LinearProgram(
+            self.shift - self.scores[allowed],
+            A_ub=-self.nutrients[:, allowed],
+            A_eq=np.ones((1, int(allowed.sum()))),
+            ub_labels=self.nutrient_labels,
+            eq_labels=["total"],
+            var_labels=[label for label, keep in zip(self.var_labels, allowed) if keep],
+        )
+        return program.solve(b_ub=b_ub, b_eq=[1.0], lo=lo[allowed])
+
+    def _cheap_bound(self, lo: np.ndarray, allowed: np.ndarray) -> float:
+        """Cota sin nutrientes: lo obligatorio y el resto en el mejor ingrediente permitido."""
+        if not allowed.any():
+            return -np.inf
+        fixed = float(lo @ self.scores)
+        return fixed + (1.0 - lo.sum()) * float(self.scores[allowed].max())
@@ -0,0 +1,155 @@
+"""
+Mezcla de harinas de menor costo que cumple objetivos nutricionales.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..catalog import IngredientMatrix
+from .linear_program import BATCH_CHUNK, INFEASIBLE, Basis, LinearProgram, LPSolution
+
+# Filas del programa, en el mismo orden que los campos de la petición
+CONSTRAINTS = ("target_protein", "target_carbs", "target_fiber", "max_cost")
+# Lado derecho que deja una restricción sin efecto
+RELAXED = 1e6
+# Signo de cada objetivo al llevarlo a la forma A_ub x <= b_ub
+CONSTRAINT_SIGNS = np.array([-1.0, 1.0, -1.0, 1.0])
+
+
+class BlendSolver:
+    """
+    Programa lineal compilado a partir del catálogo:
+
+        min  costo·x
+        s.a. proteína·x >= target_protein
+             carbohidratos·x <= target_carbs
+             fibra·x >= target_fiber
+             costo·x <= max_cost
+             sum(x) = 1,  lo <= x <= hi
+
+    El programa se construye una única vez desde las columnas del catálogo;
+    cada petición solo cambia el lado derecho y arranca desde la última base
+    óptima.
+    """
+
+    def __init__(
+        self,
+        matrix: IngredientMatrix,
+        proportion_limits: Optional[Dict[str, Tuple[float, float]]] = None,
+    ):
+        proportion_limits = proportion_limits or {}
+        self.matrix = matrix
+        self.keys = matrix.names
+        n = len(self.keys)
+
+        self.cost = matrix.column("cost", 0.0)
+        self.protein = matrix.column("protein", 0.0)
+        self.carbs = matrix.column("carbs", 0.0)
+        self.fiber = matrix.column("fiber", 0.0)
+
+        self.lo = np.zeros(n)
+        self.hi = np.ones(n)
+        for key, (low, high) in proportion_limits.items():
+            row = matrix.index[key]
+            self.lo[row], self.hi[row] = low, high
+
+        self.program = LinearProgram(
+            self.cost,
+            A_ub=np.vstack([-self.protein, self.carbs, -self.fiber, self.cost]),
+            A_eq=np.ones((1, n)),
+            ub_labels=CONSTRAINTS,
+            eq_labels=["total"],
+            bounded=self.hi < 1.0,
+            var_labels=self.keys,
+        )
+        self._warm_start: Optional[Basis] = None
+
+    def solve(
+        self, target_protein: float, target_carbs: float, target_fiber: float, max_cost: float
+    ) -> LPSolution:
+        """
+        Resuelve una petición; `x` viene en el orden de `keys`. Si no hay
+        solución, `conflicting_rows` contiene un subconjunto mínimo de
+        objetivos que no se pueden cumplir a la vez.
+        """
+        b_ub = CONSTRAINT_SIGNS * [target_protein, target_carbs, target_fiber, max_cost]
+        solution = self.program.solve(
+            b_ub=b_ub, b_eq=[1.0], lo=self.lo, hi=self.hi, warm_start=self._warm_start
+        )
+        if solution.is_optimal:
+            self._warm_start = solution.basis
+        elif solution.status == INFEASIBLE:
+            solution.conflicting_rows = self._irreducible_conflicts(b_ub)[0]
+        return solution
+
+    def solve_many(self, targets: np.ndarray) -> Iterator[LPSolution]:
+        """
+        Resuelve un lote de peticiones (una fila por petición, columnas en el
+        orden de `CONSTRAINTS`) compartiendo bases entre ellas; las soluciones
+        salen en el orden de entrada, bloque a bloque.
+        """
+        b_ub = CONSTRAINT_SIGNS * np.asarray(targets, dtype=float).reshape(-1, len(CONSTRAINTS))
+        for start in range(0, len(b_ub), BATCH_CHUNK):
+            block = b_ub[start : start + BATCH_CHUNK]
+            solutions = list(self._solve_many(block))
+            infeasible = [
+                row for row, solution in enumerate(solutions) if solution.status == INFEASIBLE
+            ]
+            if infeasible:
+                conflicts = self._irreducible_conflicts(block[infeasible])
+                for row, conflict in zip(infeasible, conflicts):
+                    solutions[row].conflicting_rows = conflict
+            yield from solutions
+
+    def sweep(
+        self,
+        targets: Sequence[float],
+        parameter: str,
+        values: Iterable[float],
+        warm_start: Optional[Basis] = None,
+    ) -> Iterator[LPSolution]:
+        """
+        Barrido paramétrico de un objetivo (`parameter`, uno de `CONSTRAINTS`)
+        manteniendo los demás fijos. Cada resolución arranca desde la base
+        óptima del punto anterior, así que los puntos vecinos apenas pivotan.
+        Un barrido partido en tramos pasa como `warm_start` la base del último
+        punto del tramo anterior; sin ella se parte de la última petición.
+        """
+        column = CONSTRAINTS.index(parameter)
+        b_ub = CONSTRAINT_SIGNS * np.asarray(targets, dtype=float)
+        basis = self._warm_start if warm_start is None else warm_start
+        for value in values:
+            b_ub[column] = CONSTRAINT_SIGNS[column] * value
+            solution = self.program.solve(
+                b_ub=b_ub, b_eq=[1.0], lo=self.lo, hi=self.hi, warm_start=basis
+            )
+            if solution.is_optimal:
+                basis = solution.basis
+            elif solution.status == INFEASIBLE:
+                solution.conflicting_rows = self._irreducible_conflicts(b_ub)[0]
+            yield solution
+
+    def _solve_many(self, b_ub: np.ndarray) -> Iterator[LPSolution]:
+        solutions = self.program.solve_many(
+            b_ub=b_ub, b_eq=[1.0], lo=self.lo, hi=self.hi, warm_start=self._warm_start
+        )
+        for solution in solutions:
+            if solution.is_optimal:
+                self._warm_start = solution.basis
+            yield solution
+
+    def _irreducible_conflicts(self, b_ub: np.ndarray) -> List[List[str]]:
+        """
+        Filtro de eliminación, vectorizado sobre las filas: se relaja cada
+        objetivo y se descarta si el problema sigue sin solución.
+        """
+        b_ub = np.array(b_ub, dtype=float, ndmin=2)
+        needed = np.zeros(b_ub.shape, dtype=bool)
+        for column in range(len(CONSTRAINTS)):
+            relaxed = b_ub.copy()
+            relaxed[:, column] = RELAXED
+            still = np.array([s.status == INFEASIBLE for s in self._solve_many(relaxed)])
+            b_ub[still] = relaxed[still]
+            needed[~still, column] = True
+        return [[name for name, keep in zip(CONSTRAINTS, row) if keep] for row in needed]
@@ -0,0 +1,118 @@
+"""
+Clasificación de las mejores candidatas de un catálogo, en serie o repartida
+entre procesos.
+
+`top_candidates` elige las `top_k` filas de mayor score sin ordenar el resto.
+`CandidatePool` reparte la puntuación por rangos de filas entre workers que
+reciben la matriz del catálogo una sola vez y fusiona sus mejores candidatas.
+"""
+
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from ..catalog import CatalogSnapshot, IngredientMatrix
+
+# Por debajo de estas candidatas el reparto entre procesos cuesta más de lo que ahorra
+PARALLEL_MIN_CANDIDATES = 50_000
+
+
+def top_candidates(scores: np.ndarray, top_k: int, rows: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Filas de las `top_k` candidatas de mayor score, de mejor a peor
+    (`rows` son las filas de cada score; por defecto 0..n-1). Se seleccionan
+    en O(n) y solo ellas se ordenan; en un empate va primero la fila menor,
+    como en la comparación estricta en serie. Las de score NaN se descartan.
+    """
+    if top_k < 1:
+        raise ValueError("top_k debe ser al menos 1")
+    if rows is None:
+        rows = np.arange(scores.size)
+    valid = ~np.isnan(scores)
+    rows, scores = rows[valid], scores[valid]
+    if top_k < rows.size:
+        # Umbral del k-ésimo mejor; los empatados con él se desempatan al ordenar
+        threshold = np.partition(scores, rows.size - top_k)[rows.size - top_k]
+        keep = scores >= threshold
+        rows, scores = rows[keep], scores[keep]
+    return rows[np.lexsort((rows, -scores))[:top_k]]
+
+
+# Catálogo de cada proceso de `CandidatePool` (lo fija su inicializador)
+_worker_catalog: Optional[CatalogSnapshot] = None
+
+
+def _init_candidate_worker(matrix: IngredientMatrix):
+    global _worker_catalog
+    _worker_catalog = CatalogSnapshot({}, matrix, {})
+
+
+def _rank_candidate_chunk(
+    target_properties: Dict[str, float], start: int, stop: int, top_k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Mejores `top_k` filas de [start, stop) y sus scores, en un worker"""
+    scores = _worker_catalog.candidate_scores(target_properties, slice(start, stop))
+    rows = top_candidates(scores, top_k, np.arange(start, stop))
+    return rows, scores[rows - start]
+
+
+class CandidatePool:
+    """
+    Puntuación de candidatas repartida entre procesos. Cada worker recibe
+    la matriz del catálogo una sola vez, al arrancar, y cada tarea solo
+    lleva los objetivos y un rango de filas. Cada trozo devuelve sus `top_k`
+    mejores y la fusión da exactamente la misma clasificación que en serie.
+    Si el catálogo cambia de versión se arranca un pool nuevo; las tareas
+    en curso terminan en el anterior.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        chunks_per_worker: int = 4,
+        min_candidates: int = PARALLEL_MIN_CANDIDATES,
+    ):
+        self.workers = workers
+        self.chunks_per_worker = chunks_per_worker
+        self.min_candidates = min_candidates
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._catalog: Optional[CatalogSnapshot] = None
+        self._lock = threading.Lock()
+
+    def rank(
+        self, catalog: CatalogSnapshot, target_properties: Dict[str, float], top_k: int
+    ) -> np.ndarray:
+        """Como `top_candidates(catalog.candidate_scores(...), top_k)`, en paralelo"""
+        if top_k < 1:
+            raise ValueError("top_k debe ser al menos 1")
+        pool = self._get_pool(catalog)
+        bounds = np.linspace(0, len(catalog.matrix), self.workers * self.chunks_per_worker + 1)
+        bounds = bounds.astype(int).tolist()
+        futures = [
+            pool.submit(_rank_candidate_chunk, target_properties, start, stop, top_k)
+            for start, stop in zip(bounds, bounds[1:])
+            if stop > start
+        ]
+        if not futures:
+            return np.zeros(0, dtype=int)
+        rows, scores = zip(*(future.result() for future in futures))
+        return top_candidates(np.concatenate(scores), top_k, np.concatenate(rows))
+
+    def close(self):
+        with self._lock:
+            pool, self._pool, self._catalog = self._pool, None, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    def _get_pool(self, catalog: CatalogSnapshot) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._catalog is not catalog:
+                if self._pool is not None:
+                    self._pool.shutdown(wait=False)
+                self._pool = ProcessPoolExecutor(
+                    self.workers, initializer=_init_candidate_worker, initargs=(catalog.matrix,)
+                )
+                self._catalog = catalog
+            return self._pool
@@ -0,0 +1,291 @@
+"""
+Programación lineal densa con simplex dual.
+
+El programa se compila una sola vez (matriz y costos fijos) y cada resolución
+solo cambia el lado derecho: objetivos, presupuesto y cotas de las variables.
+Como la factibilidad dual de una base no depende del lado derecho, cualquier
+base óptima previa sirve como arranque en caliente para la siguiente.
+"""
+
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Sequence
+
+import numpy as np
+
+OPTIMAL = "optimal"
+INFEASIBLE = "infeasible"
+ITERATION_LIMIT = "iteration_limit"
+
+TOLERANCE = 1e-9
+# Cada cuántos pivotes se recalcula la inversa desde cero para acotar el error numérico
+REFACTOR_EVERY = 50
+# Problemas por bloque en los lotes: acota la memoria y el costo de reprobar bases
+BATCH_CHUNK = 1024
+
+
+@dataclass
+class Basis:
+    """Base del simplex con su inversa y costos reducidos (independientes del lado derecho)."""
+
+    indices: np.ndarray
+    inverse: np.ndarray
+    reduced_costs: np.ndarray
+
+
+@dataclass
+class LPSolution:
+    """Resultado de una resolución."""
+
+    status: str
+    x: Optional[np.ndarray] = None
+    objective: Optional[float] = None
+    iterations: int = 0
+    basis: Optional[Basis] = None
+    conflicting_rows: List[str] = field(default_factory=list)
+
+    @property
+    def is_optimal(self) -> bool:
+        return self.status == OPTIMAL
+
+
+class LinearProgram:
+    """
+    min c·x  s.a.  A_ub x <= b_ub,  A_eq x = b_eq,  lo <= x <= hi
+
+    Internamente se lleva a forma estándar con holguras en todas las filas
+    (cada igualdad se separa en dos desigualdades) y las variables de costo
+    negativo se complementan, de modo que la base de holguras siempre es dual
+    factible y el simplex dual puede arrancar sin fase 1.
+    """
+
+    def __init__(
+        self,
+        c: Sequence[float],
+        A_ub: Optional[np.ndarray] = None,
+        A_eq: Optional[np.ndarray] = None,
+        ub_labels: Optional[Sequence[str]] = None,
+        eq_labels: Optional[Sequence[str]] = None,
+        bounded: Optional[Sequence[bool]] = None,
+        var_labels: Optional[Sequence[str]] = None,
+    ):
+        self.c = np.asarray(c, dtype=float)
+        n = self.c.size
+        self.A_ub = (
+            np.zeros((0, n)) if A_ub is None else np.asarray(A_ub, dtype=float).reshape(-1, n)
+        )
+        self.A_eq = (
+            np.zeros((0, n)) if A_eq is None else np.asarray(A_eq, dtype=float).reshape(-1, n)
+        )
+        self.bounded = np.zeros(n, dtype=bool) if bounded is None else np.asarray(bounded, bool)
+        var_labels = list(var_labels) if var_labels is not None else [f"x{j}" for j in range(n)]
+        ub_labels = (
+            list(ub_labels) if ub_labels is not None else [f"ub{i}" for i in range(len(self.A_ub))]
+        )
+        eq_labels = (
+            list(eq_labels) if eq_labels is not None else [f"eq{i}" for i in range(len(self.A_eq))]
+        )
+
+        # Variables con costo negativo: x = hi - y, para que todos los costos queden >= 0
+        self.flipped = self.c < 0
+        if np.any(self.flipped & ~self.bounded):
+            raise ValueError("Las variables con costo negativo necesitan cota superior")
+        self.sign = np.where(self.flipped, -1.0, 1.0)
+
+        self.bound_vars = np.flatnonzero(self.bounded)
+        bound_rows = np.zeros((self.bound_vars.size, n))
+        bound_rows[np.arange(self.bound_vars.size), self.bound_vars] = 1.0
+
+        structural = np.vstack(
+            [
+                self.A_ub * self.sign,
+                self.A_eq * self.sign,
+                -self.A_eq * self.sign,
+                bound_rows,
+            ]
+        )
+        self.num_vars = n
+        self.num_rows = structural.shape[0]
+        self.matrix = np.ascontiguousarray(np.hstack([structural, np.eye(self.num_rows)]))
+        self.cost = np.concatenate([self.c * self.sign, np.zeros(self.num_rows)])
+        self.row_labels = (
+            ub_labels + eq_labels + eq_labels + [f"{var_labels[j]}:max" for j in self.bound_vars]
+        )
+        self.var_labels = var_labels
+        self.max_iterations = 50 * (self.num_rows + n)
+
+    def slack_basis(self) -> Basis:
+        """Base inicial de holguras (dual factible por construcción)."""
+        indices = np.arange(self.num_vars, self.num_vars + self.num_rows)
+        return Basis(indices, np.eye(self.num_rows), self.cost.copy())
+
+    def offset(self, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        """Punto desde el que se miden las variables desplazadas (lo, o hi si se complementan)."""
+        return np.where(self.flipped, hi, lo)
+
+    def rhs(
+        self,
+        b_ub: Optional[np.ndarray] = None,
+        b_eq: Optional[np.ndarray] = None,
+        lo: Optional[np.ndarray] = None,
+        hi: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Lado derecho en forma estándar. Acepta vectores o matrices (una fila
+        por problema) para preparar lotes completos de una sola vez.
+        """
+        n = self.num_vars
+        lo = np.zeros(n) if lo is None else np.asarray(lo, dtype=float)
+        hi = np.full(n, np.inf) if hi is None else np.asarray(hi, dtype=float)
+        b_ub = np.zeros(len(self.A_ub)) if b_ub is None else np.asarray(b_ub, dtype=float)
+        b_eq = np.zeros(len(self.A_eq)) if b_eq is None else np.asarray(b_eq, dtype=float)
+        if np.any(~np.isfinite(hi[..., self.bound_vars])):
+            raise ValueError("Las variables acotadas necesitan una cota superior finita")
+
+        origin = self.offset(lo, hi)
+        h_ub = b_ub - origin @ self.A_ub.T
+        h_eq = b_eq - origin @ self.A_eq.T
+        h_bound = (hi - lo)[..., self.bound_vars]
+        parts = [h_ub, h_eq, -h_eq, h_bound]
+        if any(part.ndim > 1 for part in parts):
+            leading = np.broadcast_shapes(*(part.shape[:-1] for part in parts))
+            parts = [np.broadcast_to(part, leading + part.shape[-1:]) for part in parts]
+        return np.concatenate(parts, axis=-1)
+
+    def solve(
+        self,
+        b_ub: Optional[np.ndarray] = None,
+        b_eq: Optional[np.ndarray] = None,
+        lo: Optional[np.ndarray] = None,
+        hi: Optional[np.ndarray] = None,
+        warm_start: Optional[Basis] = None,
+    ) -> LPSolution:
+        """Resuelve el programa para un lado derecho concreto."""
+        n = self.num_vars
+        lo = np.zeros(n) if lo is None else np.asarray(lo, dtype=float)
+        hi = np.full(n, np.inf) if hi is None else np.asarray(hi, dtype=float)
+        rhs = self.rhs(b_ub, b_eq, lo, hi)
+        return self._to_original(self.solve_rhs(rhs, warm_start), self.offset(lo, hi))
+
+    def solve_many(
+        self,
+        b_ub: Optional[np.ndarray] = None,
+        b_eq: Optional[np.ndarray] = None,
+        lo: Optional[np.ndarray] = None,
+        hi: Optional[np.ndarray] = None,
+        warm_start: Optional[Basis] = None,
+    ) -> Iterator[LPSolution]:
+        """
+        Resuelve un lote (una fila de `b_ub`/`b_eq` por problema) y entrega
+        las soluciones en el orden de entrada.
+
+        Cada base óptima encontrada se prueba de una sola vez, con un producto
+        matricial, contra todos los problemas pendientes del bloque: los que
+        resultan primal factibles quedan resueltos sin pivotar. El resto
+        arranca el simplex dual desde la última base óptima.
+        """
+        n = self.num_vars
+        lo = np.zeros(n) if lo is None else np.asarray(lo, dtype=float)
+        hi = np.full(n, np.inf) if hi is None else np.asarray(hi, dtype=float)
+        rhs = np.atleast_2d(self.rhs(b_ub, b_eq, lo, hi))
+        origins = np.broadcast_to(self.offset(lo, hi), (len(rhs), n))
+        basis = warm_start if warm_start is not None else self.slack_basis()
+
+        for start in range(0, len(rhs), BATCH_CHUNK):
+            block = rhs[start : start + BATCH_CHUNK]
+            results: List[Optional[LPSolution]] = [None] * len(block)
+            pending = np.ones(len(block), dtype=bool)
+            emitted = 0
+            while emitted < len(block):
+                candidates = np.flatnonzero(pending)
+                x_basic = basis.inverse @ block[candidates].T
+                feasible = (x_basic >= -TOLERANCE).all(axis=0)
+                for row, column in zip(candidates[feasible], x_basic[:, feasible].T):
+                    results[row] = self._optimal(basis, column, 0)
+                pending[candidates[feasible]] = False
+
+                if pending[emitted]:
+                    solution = self.solve_rhs(block[emitted], basis)
+                    results[emitted] = solution
+                    pending[emitted] = False
+                    if solution.is_optimal:
+                        basis = solution.basis
+
+                while emitted < len(block) and not pending[emitted]:
+                    yield self._to_original(results[emitted], origins[start + emitted])
+                    results[emitted] = None
+                    emitted += 1
+
+    def _to_original(self, solution: LPSolution, origin: np.ndarray) -> LPSolution:
+        """Deshace el desplazamiento/complemento de las variables."""
+        if solution.x is not None:
+            solution.x = origin + self.sign * solution.x
+            solution.objective = float(self.c @ solution.x)
+        return solution
+
+    def solve_rhs(self, rhs: np.ndarray, warm_start: Optional[Basis] = None) -> LPSolution:
+        """
+        Simplex dual desde una base dual factible. Devuelve las variables
+        desplazadas (y) y, si no hay solución, las filas del certificado de
+        Farkas que la hacen imposible.
+        """
+        start = warm_start if warm_start is not None else self.slack_basis()
+        basic = start.indices.copy()
+        inverse = start.inverse.copy()
+        reduced = start.reduced_costs.copy()
+        x_basic = inverse @ rhs
+        iterations = 0
+
+        while True:
+            leaving = int(np.argmin(x_basic))
+            if x_basic[leaving] >= -TOLERANCE:
+                break
+            if iterations >= self.max_iterations:
+                return LPSolution(ITERATION_LIMIT, iterations=iterations)
+
+            pivot_row = inverse[leaving] @ self.matrix
+            candidates = pivot_row < -TOLERANCE
+            if not candidates.any():
+                # Fila de la inversa = certificado: combinación de restricciones imposible
+                certificate = inverse[leaving]
+                return LPSolution(
+                    INFEASIBLE,
+                    iterations=iterations,
+                    conflicting_rows=self._rows_in(certificate),
+                )
+
+            ratios = np.full(pivot_row.size, np.inf)
+            ratios[candidates] = np.maximum(reduced[candidates], 0.0) / -pivot_row[candidates]
+            entering = int(np.argmin(ratios))
+
+            column = inverse @ self.matrix[:, entering]
+            pivot = column[leaving]
+            reduced -= (reduced[entering] / pivot_row[entering]) * pivot_row
+            theta = x_basic[leaving] / pivot
+            x_basic -= theta * column
+            x_basic[leaving] = theta
+            inverse[leaving] /= pivot
+            column[leaving] = 0.0
+            inverse -= np.outer(column, inverse[leaving])
+            basic[leaving] = entering
+            iterations += 1
+
+            if iterations % REFACTOR_EVERY == 0:
+                inverse = np.linalg.inv(self.matrix[:, basic])
+                reduced = self.cost - (self.cost[basic] @ inverse) @ self.matrix
+                x_basic = inverse @ rhs
+
+        return self._optimal(Basis(basic, inverse, reduced), x_basic, iterations)
+
+    def _optimal(self, basis: Basis, x_basic: np.ndarray, iterations: int) -> LPSolution:
+        y = np.zeros(self.matrix.shape[1])
+        y[basis.indices] = np.maximum(x_basic, 0.0)
+        return LPSolution(OPTIMAL, x=y[: self.num_vars], iterations=iterations, basis=basis)
+
+    def _rows_in(self, certificate: np.ndarray) -> List[str]:
+        """Etiquetas (sin repetir) de las filas con peso en el certificado."""
+        labels: List[str] = []
+        for row in np.flatnonzero(np.abs(certificate) > TOLERANCE):
+            label = self.row_labels[row]
+            if label not in labels:
+                labels.append(label)
+        return labels
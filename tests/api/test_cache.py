@@ -0,0 +1,158 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+
+from src.api.cache import OptimizationCache, quantize
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestQuantize(unittest.TestCase):
+    def test_rounds_minimums_up_and_maximums_down(self):
+        """Prueba que el redondeo nunca relaje la petición original."""
+        assert quantize([15.04, 50.06, 12.0, 5.0], 0.1, [True, False, True, False]) == (
+            15.1,
+            50.0,
+            12.0,
+            5.0,
+        )
+
+
+class TestOptimizationCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = OptimizationCache(maxsize=2, ttl=10.0, clock=self.clock)
+        self.compute = Mock(side_effect=lambda: {"total_cost": 3.0})
+
+    def test_hit_after_miss(self):
+        """Prueba que la segunda petición igual no recalcule."""
+        self.cache.get_or_compute((15.0, 50.0), "v1", self.compute)
+        result = self.cache.get_or_compute((15.0, 50.0), "v1", self.compute)
+
+        assert result == {"total_cost": 3.0}
+        assert self.compute.call_count == 1
+        stats = self.cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+
+    def test_rejected_entry_counts_as_miss(self):
+        """Prueba que una entrada que no sirve para la petición exacta se recalcule."""
+        self.cache.get_or_compute((15.0, 50.0), "v1", self.compute)
+
+        rejected = self.cache.lookup((15.0, 50.0), "v1", lambda result: result["total_cost"] < 2)
+        accepted = self.cache.lookup((15.0, 50.0), "v1", lambda result: result["total_cost"] < 4)
+
+        assert rejected is None
+        assert accepted == {"total_cost": 3.0}
+        stats = self.cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+
+    def test_lru_eviction(self):
+        """Prueba que se descarte la entrada usada hace más tiempo."""
+        self.cache.get_or_compute((1.0,), "v1", self.compute)
+        self.cache.get_or_compute((2.0,), "v1", self.compute)
+        self.cache.get_or_compute((1.0,), "v1", self.compute)
+        self.cache.get_or_compute((3.0,), "v1", self.compute)
+        self.cache.get_or_compute((1.0,), "v1", self.compute)
+
+        assert self.compute.call_count == 3
+        assert self.cache.stats()["evictions"] == 1
+
+    def test_events_reported(self):
+        """Prueba que cada evento se notifique para exportarlo como métrica."""
+        events = []
+        cache = OptimizationCache(maxsize=1, ttl=10.0, clock=self.clock, on_event=events.append)
+
+        cache.get_or_compute((1.0,), "v1", self.compute)
+        cache.get_or_compute((1.0,), "v1", self.compute)
+        cache.get_or_compute((2.0,), "v1", self.compute)
+
+        assert events == ["miss", "hit", "miss", "eviction"]
+
+    def test_ttl_expiration(self):
+        """Prueba que una entrada caducada se recalcule."""
+        self.cache.get_or_compute((1.0,), "v1", self.compute)
+        self.clock.now = 11.0
+        self.cache.get_or_compute((1.0,), "v1", self.compute)
+
+        assert self.compute.call_count == 2
+        assert self.cache.stats()["expirations"] == 1
+
+    def test_catalog_version_invalidates(self):
+        """Prueba que un cambio de catálogo invalide lo guardado."""
+        self.cache.get_or_compute((1.0,), "v1", self.compute)
+        self.cache.get_or_compute((1.0,), "v2", self.compute)
+
+        assert self.compute.call_count == 2
+        assert self.cache.stats()["size"] == 1
+
+    def test_redis_second_tier(self):
+        """Prueba que un acierto en Redis evite el cálculo y llene la caché local."""
+        redis_client = Mock()
+        redis_client.get.return_value = json.dumps({"total_cost": 2.5})
+        cache = OptimizationCache(redis_client=redis_client, clock=self.clock)
+
+        first = cache.get_or_compute((1.0,), "v1", self.compute)
+        second = cache.get_or_compute((1.0,), "v1", self.compute)
+
+        assert first == second == {"total_cost": 2.5}
+        assert not self.compute.called
+        redis_client.get.assert_called_once_with("trivo:optimize:v1:1")
+        assert cache.stats()["redis_hits"] == 1
+
+    def test_redis_failure_falls_back_to_compute(self):
+        """Prueba que un fallo de Redis no rompa la petición."""
+        redis_client = Mock()
+        redis_client.get.side_effect = ConnectionError("sin conexión")
+        cache = OptimizationCache(redis_client=redis_client, clock=self.clock)
+
+        result = cache.get_or_compute((1.0,), "v1", self.compute)
+
+        assert result == {"total_cost": 3.0}
+        assert cache.stats()["redis_errors"] == 1
+        assert not redis_client.setex.called
+
+    def test_async_redis_calls_leave_event_loop_free(self):
+        """Prueba que un Redis lento no bloquee el bucle de eventos."""
+        loop_threads = set()
+
+        def slow_call(*args):
+            loop_threads.add(threading.get_ident())
+            time.sleep(0.1)
+            return None
+
+        redis_client = Mock()
+        redis_client.get.side_effect = slow_call
+        redis_client.setex.side_effect = slow_call
+        cache = OptimizationCache(redis_client=redis_client, clock=self.clock)
+
+        async def scenario():
+            work = asyncio.ensure_future(cache.lookup_async((1.0,), "v1"))
+            ticks = 0
+            while not work.done():
+                ticks += 1
+                await asyncio.sleep(0.01)
+            missed = await work
+            await cache.store_async((1.0,), "v1", {"total_cost": 3.0})
+            return threading.get_ident(), missed, ticks, await cache.lookup_async((1.0,), "v1")
+
+        loop_thread, missed, ticks, hit = asyncio.run(scenario())
+
+        assert missed is None
+        assert hit == {"total_cost": 3.0}
+        assert ticks >= 5
+        assert loop_thread not in loop_threads
+        redis_client.get.assert_called_once_with("trivo:optimize:v1:1")
+        assert redis_client.setex.call_count == 1
+        assert cache.stats()["misses"] == 1
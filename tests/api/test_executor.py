@@ -0,0 +1,159 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from src.api import main
+from src.api.executor import SolverBusy, SolverExecutor, SolverTimeout
+
+
+class TestSolverExecutor(unittest.TestCase):
+    def test_runs_off_event_loop(self):
+        """Prueba que el trabajo se ejecute en otro hilo sin bloquear el bucle."""
+        executor = SolverExecutor(max_workers=1, timeout=1.0)
+
+        def slow_solve():
+            time.sleep(0.1)
+            return threading.get_ident()
+
+        async def scenario():
+            loop_thread = threading.get_ident()
+            work = asyncio.ensure_future(executor.run(slow_solve))
+            ticks = 0
+            while not work.done():
+                ticks += 1
+                await asyncio.sleep(0.01)
+            return loop_thread, await work, ticks
+
+        loop_thread, worker_thread, ticks = asyncio.run(scenario())
+        executor.shutdown()
+
+        assert worker_thread != loop_thread
+        assert ticks >= 5
+        assert executor.pending == 0
+
+    def test_rejects_when_queue_full(self):
+        """Prueba que con la cola llena se rechace en lugar de esperar."""
+        executor = SolverExecutor(max_workers=1, max_queue=1, timeout=1.0)
+        release = threading.Event()
+
+        async def scenario():
+            running = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+            await asyncio.sleep(0)
+            with self.assertRaises(SolverBusy):
+                await executor.run(release.wait)
+            release.set()
+            await asyncio.gather(*running)
+
+        asyncio.run(scenario())
+        executor.shutdown()
+
+    def test_timeout_keeps_slot_until_work_ends(self):
+        """Prueba que el tiempo agotado libere la petición pero no el hueco del pool."""
+        executor = SolverExecutor(max_workers=1, max_queue=0, timeout=0.05)
+        release = threading.Event()
+
+        async def scenario():
+            with self.assertRaises(SolverTimeout):
+                await executor.run(release.wait)
+            assert executor.pending == 1
+            release.set()
+            await asyncio.sleep(0.05)
+
+        asyncio.run(scenario())
+        executor.shutdown()
+
+        assert executor.pending == 0
+
+    def test_restart_drains_queued_work(self):
+        """Prueba que reiniciar el pool no cancele lo que ya estaba en cola."""
+        executor = SolverExecutor(max_workers=1, max_queue=2, timeout=1.0)
+        release = threading.Event()
+
+        async def scenario():
+            running = asyncio.ensure_future(executor.run(release.wait))
+            queued = asyncio.ensure_future(executor.run(lambda: "resuelto"))
+            await asyncio.sleep(0.01)
+            executor.restart()
+            release.set()
+            return await asyncio.gather(running, queued)
+
+        assert asyncio.run(scenario()) == [True, "resuelto"]
+        executor.shutdown()
+
+    def test_shutdown_fails_queued_work_as_busy(self):
+        """Prueba que el trabajo descartado al cerrar el pool acabe en SolverBusy."""
+        executor = SolverExecutor(max_workers=1, max_queue=2, timeout=1.0)
+        release = threading.Event()
+
+        async def scenario():
+            running = asyncio.ensure_future(executor.run(release.wait))
+            queued = asyncio.ensure_future(executor.run(lambda: "resuelto"))
+            await asyncio.sleep(0.01)
+            executor.shutdown()
+            release.set()
+            assert await running is True
+            with self.assertRaises(SolverBusy):
+                await queued
+
+        asyncio.run(scenario())
+
+    def test_unknown_mode(self):
+        """Prueba que un modo inexistente se rechace al configurar."""
+        with self.assertRaises(ValueError):
+            SolverExecutor(mode="gpu")
+
+
+class TestOptimizeOffloading(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(main.app)
+        main.RESULT_CACHE.clear()
+
+    def test_optimize_timeout(self):
+        """Prueba que una optimización demasiado lenta responda 504."""
+        executor = SolverExecutor(max_workers=1, max_queue=0, timeout=0.05)
+        release = threading.Event()
+
+        with (
+            patch.object(main, "SOLVER_EXECUTOR", executor),
+            patch.object(main, "solve_targets", lambda targets: release.wait()),
+        ):
+            response = self.client.post("/api/optimize", json={"target_protein": 11.1})
+            busy = self.client.post("/api/optimize", json={"target_protein": 11.2})
+            health = self.client.get("/health")
+            release.set()
+        executor.shutdown()
+
+        assert response.status_code == 504
+        assert busy.status_code == 503
+        assert busy.headers["Retry-After"] == "1"
+        assert health.status_code == 200
+
+    def test_batch_and_sweep_use_executor(self):
+        """Prueba que lotes y barridos pasen por el pool y respeten su cola."""
+        executor = SolverExecutor(max_workers=1, max_queue=0, timeout=1.0)
+        release = threading.Event()
+
+        async def occupy():
+            return await executor.run(release.wait)
+
+        with patch.object(main, "SOLVER_EXECUTOR", executor):
+            loop = asyncio.new_event_loop()
+            blocker = loop.create_task(occupy())
+            loop.run_until_complete(asyncio.sleep(0.01))
+            batch = self.client.post("/api/optimize/batch", json=[{"target_protein": 12.0}])
+            sweep = self.client.get("/api/optimize/sweep", params={"start": 2, "stop": 5})
+            release.set()
+            loop.run_until_complete(blocker)
+            loop.close()
+            served = self.client.post("/api/optimize/batch", json=[{"target_protein": 12.0}])
+        executor.shutdown()
+
+        assert batch.status_code == 503
+        assert sweep.status_code == 503
+        assert served.status_code == 200
+        assert json.loads(served.text)["success"] is True
@@ -0,0 +1,95 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from src.api.main import app
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(app)
+
+    def test_request_latency_per_route(self):
+        """Prueba que la latencia se registre con la plantilla de la ruta."""
+        labels = {"method": "GET", "route": "/api/optimize/sweep", "status": "200"}
+        before = sample("trivo_http_request_duration_seconds_count", **labels)
+
+        self.client.get("/api/optimize/sweep", params={"start": 3.0, "stop": 6.0, "steps": 3})
+        self.client.get("/no-existe")
+
+        assert sample("trivo_http_request_duration_seconds_count", **labels) == before + 1
+        assert (
+            sample(
+                "trivo_http_request_duration_seconds_count",
+                method="GET",
+                route="unmatched",
+                status="404",
+            )
+            >= 1
+        )
+        assert sample("trivo_http_requests_in_flight", route="/api/optimize/sweep") == 0
+
+    def test_solver_and_cache_metrics(self):
+        """Prueba que se registren resoluciones, pivotes y eventos de caché."""
+        before = sample("trivo_solver_duration_seconds_count", operation="batch")
+        hits = sample("trivo_optimize_cache_events_total", event="hit")
+        payload = {
+            "target_protein": 12.3,
+            "target_carbs": 61.0,
+            "target_fiber": 7.0,
+            "max_cost": 6.0,
+        }
+
+        self.client.post("/api/optimize/batch", json=[payload, payload])
+        self.client.post("/api/optimize", json=payload)
+        self.client.post("/api/optimize", json=payload)
+
+        assert sample("trivo_solver_duration_seconds_count", operation="batch") == before + 2
+        assert sample("trivo_solver_iterations_count", operation="optimize") >= 1
+        assert sample("trivo_optimize_cache_events_total", event="hit") == hits + 1
+
+    def test_exposition(self):
+        """Prueba que /metrics responda en formato de texto de Prometheus."""
+        self.client.get("/health")
+
+        response = self.client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "trivo_http_request_duration_seconds_bucket" in response.text
+
+    def test_multiprocess_mode(self):
+        """Prueba que con PROMETHEUS_MULTIPROC_DIR se agreguen los ficheros de los workers."""
+        script = (
+            "from fastapi.testclient import TestClient\n"
+            "from src.api.main import app\n"
+            "client = TestClient(app)\n"
+            "client.post('/api/optimize', json={'target_fiber': 5.0})\n"
+            "print(client.get('/metrics').text)\n"
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=directory)
+            env.pop("REDIS_URL", None)
+            output = subprocess.run(
+                [sys.executable, "-c", script],
+                cwd=ROOT,
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+
+            assert os.listdir(directory)
+        assert 'trivo_solver_iterations_count{operation="optimize"} 1.0' in output
+        assert 'route="/api/optimize"' in output
@@ -0,0 +1,281 @@
+import json
+import re
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from src.api import main
+from src.api.main import HOME_HTML, INGREDIENTS, app
+from src.trivo_plm.domain.catalog import IngredientMatrix, SharedCatalog
+
+
+class TestOptimizeEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(app)
+
+    def test_optimize_meets_targets(self):
+        """Prueba que la formulación respete los objetivos de la petición."""
+        payload = {
+            "target_protein": 15.0,
+            "target_carbs": 60.0,
+            "target_fiber": 8.0,
+            "max_cost": 5.0,
+        }
+
+        response = self.client.post("/api/optimize", json=payload)
+
+        assert response.status_code == 200
+        result = response.json()
+        assert result["success"] is True
+        assert result["status"] == "optimal"
+        assert result["protein"] >= 15.0 - 1e-6
+        assert result["carbs"] <= 60.0 + 1e-6
+        assert result["fiber"] >= 8.0 - 1e-6
+        assert result["total_cost"] <= 5.0 + 1e-6
+        assert abs(sum(ing["percentage"] for ing in result["ingredients"]) - 100.0) < 1e-6
+
+    def test_home_form_defaults_are_feasible(self):
+        """Prueba que el formulario de la portada, tal como se carga, tenga solución."""
+        defaults = dict(re.findall(r'<input type="number" id="(\w+)" value="([\d.]+)"', HOME_HTML))
+        payload = {
+            "target_protein": float(defaults["protein"]),
+            "target_carbs": float(defaults["carbs"]),
+            "target_fiber": float(defaults["fiber"]),
+            "max_cost": float(defaults["maxCost"]),
+        }
+
+        result = self.client.post("/api/optimize", json=payload).json()
+
+        assert result["success"] is True
+        assert result["status"] == "optimal"
+        assert self.client.post("/api/optimize", json={}).json()["success"] is True
+
+    def test_optimize_depends_on_targets(self):
+        """Prueba que objetivos distintos den mezclas distintas."""
+        low = self.client.post(
+            "/api/optimize",
+            json={"target_protein": 10.0, "target_fiber": 5.0, "target_carbs": 80.0},
+        ).json()
+        high = self.client.post(
+            "/api/optimize",
+            json={"target_protein": 30.0, "target_fiber": 5.0, "target_carbs": 80.0},
+        ).json()
+
+        assert low["success"] and high["success"]
+        assert high["protein"] >= 30.0 - 1e-6
+        assert high["total_cost"] > low["total_cost"]
+
+    def test_optimize_infeasible(self):
+        """Prueba que la infactibilidad indique qué objetivos chocan."""
+        max_fiber = max(ing["fiber"] for ing in INGREDIENTS.values())
+
+        result = self.client.post("/api/optimize", json={"target_fiber": max_fiber + 1}).json()
+
+        assert result["success"] is False
+        assert result["status"] == "infeasible"
+        assert result["conflicting_constraints"] == ["target_fiber"]
+        assert result["message"]
+
+    def test_optimize_batch_streams_in_order(self):
+        """Prueba que el lote devuelva NDJSON en el orden de las peticiones."""
+        payload = [
+            {"target_protein": protein, "target_carbs": 80.0, "target_fiber": 5.0, "max_cost": 5.0}
+            for protein in (10.0, 30.0, 90.0, 20.0)
+        ]
+
+        response = self.client.post("/api/optimize/batch", json=payload)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        results = [json.loads(line) for line in response.text.splitlines()]
+        assert len(results) == len(payload)
+        for request, result in zip(payload, results):
+            single = self.client.post("/api/optimize", json=request).json()
+            assert result["success"] == single["success"]
+            if single["success"]:
+                assert abs(result["total_cost"] - single["total_cost"]) < 1e-9
+        assert results[2]["success"] is False
+
+    def test_optimize_batch_rejects_oversized_batch(self):
+        """Prueba que un lote con más peticiones que el máximo se rechace sin resolverse."""
+        payload = [{}] * (main.MAX_BATCH_SIZE + 1)
+
+        with patch.object(main, "stream_jobs") as stream_jobs:
+            response = self.client.post("/api/optimize/batch", json=payload)
+
+        assert response.status_code == 422
+        stream_jobs.assert_not_called()
+
+    def test_optimize_uses_cache(self):
+        """Prueba que valores equivalentes al paso del formulario compartan resultado."""
+        payload = {
+            "target_protein": 15.0,
+            "target_carbs": 60.0,
+            "target_fiber": 8.0,
+            "max_cost": 5.0,
+        }
+        before = self.client.get("/api/cache/stats").json()
+
+        first = self.client.post("/api/optimize", json=payload).json()
+        second = self.client.post(
+            "/api/optimize", json={**payload, "target_protein": 14.96, "target_carbs": 60.04}
+        ).json()
+
+        after = self.client.get("/api/cache/stats").json()
+        assert first == second
+        assert first["protein"] >= 15.0 - 1e-6
+        assert after["hits"] >= before["hits"] + 1
+
+    def test_optimize_solves_exact_targets(self):
+        """Prueba que un presupuesto entre dos pasos del formulario no se recorte al inferior."""
+        payload = {"target_protein": 30.0, "target_carbs": 80.0, "target_fiber": 5.0}
+        cheapest = self.client.post("/api/optimize", json={**payload, "max_cost": 100.0}).json()
+        budget = cheapest["total_cost"] + 1e-3
+        below = int(budget * 10) / 10
+        assert below < cheapest["total_cost"]
+
+        # La celda de la caché ya guarda la petición más estricta, que es infactible
+        strict = self.client.post("/api/optimize", json={**payload, "max_cost": below}).json()
+        result = self.client.post("/api/optimize", json={**payload, "max_cost": budget}).json()
+
+        assert strict["success"] is False
+        assert result["success"] is True
+        assert result["total_cost"] <= budget
+        assert abs(result["total_cost"] - cheapest["total_cost"]) < 1e-9
+
+    def test_price_change_invalidates_cache(self):
+        """Prueba que un cambio de precios no devuelva resultados viejos de la caché."""
+        payload = {
+            "target_protein": 15.0,
+            "target_carbs": 80.0,
+            "target_fiber": 5.0,
+            "max_cost": 10.0,
+        }
+        before = self.client.post("/api/optimize", json=payload).json()
+        cheaper = {key: {**ing, "cost": ing["cost"] / 2} for key, ing in INGREDIENTS.items()}
+
+        main.set_catalog(cheaper)
+        try:
+            after = self.client.post("/api/optimize", json=payload).json()
+        finally:
+            main.set_catalog(INGREDIENTS)
+
+        assert abs(after["total_cost"] - before["total_cost"] / 2) < 1e-6
+
+    def test_shared_catalog_published_by_other_worker(self):
+        """Prueba que un worker adopte el catálogo publicado por otro."""
+        payload = {
+            "target_protein": 15.0,
+            "target_carbs": 60.0,
+            "target_fiber": 8.0,
+            "max_cost": 10.0,
+        }
+        cheaper = {key: dict(ing, cost=ing["cost"] / 2) for key, ing in INGREDIENTS.items()}
+
+        with tempfile.TemporaryDirectory() as directory:
+            shared = SharedCatalog(directory, refresh_interval=0.0)
+            with patch.object(main, "SHARED_CATALOG", shared):
+                main.attach_shared_catalog()
+                before = self.client.post("/api/optimize", json=payload).json()
+                # Otro worker publica precios nuevos en el mismo directorio
+                SharedCatalog(directory).publish(
+                    IngredientMatrix.from_records(cheaper), {"ingredients": cheaper}
+                )
+                try:
+                    after = self.client.post("/api/optimize", json=payload).json()
+                    assert not main.INGREDIENT_MATRIX.values.flags.owndata
+                finally:
+                    main.install_catalog(INGREDIENTS, IngredientMatrix.from_records(INGREDIENTS))
+
+        assert abs(after["total_cost"] - before["total_cost"] / 2) < 1e-6
+
+    def test_optimize_sweep_streams_frontier(self):
+        """Prueba que el barrido emita un punto por paso con costo no decreciente."""
+        params = {
+            "parameter": "target_protein",
+            "start": 10.0,
+            "stop": 40.0,
+            "steps": 7,
+            "target_carbs": 80.0,
+            "target_fiber": 5.0,
+            "max_cost": 10.0,
+        }
+
+        response = self.client.get("/api/optimize/sweep", params=params)
+
+        assert response.status_code == 200
+        points = [json.loads(line) for line in response.text.splitlines()]
+        assert [point["value"] for point in points] == [10.0, 15.0, 20.0, 25.0, 30.0, 35.0, 40.0]
+        costs = [point["total_cost"] for point in points]
+        assert all(later >= earlier - 1e-9 for earlier, later in zip(costs, costs[1:]))
+        assert all(point["protein"] >= point["value"] - 1e-6 for point in points)
+
+    def test_optimize_sweep_carries_basis_between_chunks(self):
+        """Prueba que cada tramo del barrido arranque desde la base del tramo anterior."""
+        targets = [5.0, 80.0, 2.0, 20.0]
+        params = {
+            "parameter": "target_protein",
+            "start": 5.0,
+            "stop": 60.0,
+            "steps": 48,
+            "target_carbs": 80.0,
+            "target_fiber": 2.0,
+            "max_cost": 20.0,
+        }
+        grid = [5.0 + 55.0 * i / 47 for i in range(48)]
+        whole = list(main.SOLVER.sweep(targets, "target_protein", grid))
+        pivots = []
+
+        def observe(operation, solutions):
+            for solution in solutions:
+                pivots.append(solution.iterations)
+                yield solution
+
+        with patch.object(main, "STREAM_JOB_SIZE", 6), patch.object(
+            main.metrics, "observe_solutions", observe
+        ):
+            response = self.client.get("/api/optimize/sweep", params=params)
+
+        assert len(response.text.splitlines()) == len(grid)
+        assert pivots == [solution.iterations for solution in whole]
+
+    def test_optimize_rejects_out_of_range_targets(self):
+        """Prueba que objetivos enormes, NaN o infinitos den 422 en lugar de un 500."""
+        for body in (
+            '{"target_protein": 1e308}',
+            '{"target_protein": NaN}',
+            '{"max_cost": Infinity}',
+            '{"target_fiber": -Infinity}',
+            '{"target_carbs": -1}',
+        ):
+            for path, payload in (("/api/optimize", body), ("/api/optimize/batch", f"[{body}]")):
+                response = self.client.post(
+                    path, content=payload, headers={"content-type": "application/json"}
+                )
+
+                assert response.status_code == 422, (path, body)
+                assert response.json()["detail"]
+
+    def test_optimize_sweep_rejects_unknown_parameter(self):
+        """Prueba que solo se puedan barrer los objetivos de la petición."""
+        response = self.client.get(
+            "/api/optimize/sweep", params={"parameter": "sodium", "start": 0, "stop": 1}
+        )
+
+        assert response.status_code == 422
+
+    def test_optimize_sweep_rejects_non_finite_values(self):
+        """Prueba que NaN o infinito se rechacen en lugar de romper el NDJSON."""
+        for params in (
+            {"start": "nan", "stop": 1},
+            {"start": 0, "stop": "inf"},
+            {"start": 0, "stop": "-Infinity"},
+            {"start": 0, "stop": 1, "target_fiber": "nan"},
+            {"start": 0, "stop": 1e308},
+            {"start": 0, "stop": 1, "target_protein": 1e308},
+        ):
+            response = self.client.get("/api/optimize/sweep", params=params)
+
+            assert response.status_code == 422, params
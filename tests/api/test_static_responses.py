@@ -0,0 +1,82 @@
+import unittest
+
+from fastapi.testclient import TestClient
+
+from src.api import main, static_responses
+from src.api.main import INGREDIENTS, app
+
+
+class TestStaticResponses(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(app)
+
+    def test_home_served_gzip_with_etag(self):
+        """Prueba que la portada salga comprimida y con ETag fuerte."""
+        response = self.client.get("/", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"].startswith('"')
+        assert "TRIVO-AI-PLM" in response.text
+
+    def test_home_content_type_declares_charset_once(self):
+        """Prueba que la portada no repita el charset en Content-Type."""
+        response = self.client.get("/")
+
+        assert response.headers["content-type"] == "text/html; charset=utf-8"
+
+    def test_explicit_q0_overrides_wildcard(self):
+        """Prueba que una codificación rechazada con q=0 no se sirva aunque haya comodín."""
+        no_gzip = self.client.get("/", headers={"Accept-Encoding": "gzip;q=0, *"})
+        nothing_compressed = self.client.get(
+            "/", headers={"Accept-Encoding": "*, gzip;q=0, br;q=0"}
+        )
+
+        assert no_gzip.headers.get("content-encoding") != "gzip"
+        assert "content-encoding" not in nothing_compressed.headers
+        assert "TRIVO-AI-PLM" in nothing_compressed.text
+
+    @unittest.skipIf(static_responses.brotli is None, "brotli no está instalado")
+    def test_brotli_preferred(self):
+        """Prueba que brotli tenga preferencia cuando el cliente lo acepta."""
+        response = self.client.get("/", headers={"Accept-Encoding": "gzip, br"})
+
+        assert response.headers["content-encoding"] == "br"
+
+    def test_if_none_match_returns_304(self):
+        """Prueba que un ETag vigente se responda con 304 sin cuerpo."""
+        first = self.client.get("/api/ingredients", headers={"Accept-Encoding": "gzip"})
+
+        second = self.client.get(
+            "/api/ingredients",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]},
+        )
+
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == first.headers["etag"]
+
+    def test_identity_when_no_compression_accepted(self):
+        """Prueba que sin Accept-Encoding se sirva el cuerpo sin comprimir."""
+        response = self.client.get("/api/ingredients", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+        assert response.json() == {"ingredients": INGREDIENTS}
+
+    def test_catalog_change_rerenders_payload(self):
+        """Prueba que un cambio de catálogo cambie el cuerpo y el ETag."""
+        old_etag = self.client.get("/api/ingredients").headers["etag"]
+        changed = {**INGREDIENTS, "harina_arroz": {**INGREDIENTS["harina_arroz"], "cost": 9.99}}
+
+        main.set_catalog(changed)
+        try:
+            response = self.client.get(
+                "/api/ingredients", headers={"Accept-Encoding": "gzip", "If-None-Match": old_etag}
+            )
+        finally:
+            main.set_catalog(INGREDIENTS)
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != old_etag
+        assert response.json()["ingredients"]["harina_arroz"]["cost"] == 9.99
@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.trivo_plm.domain.catalog import CompiledCatalog, IngredientMatrix
+
+
+class TestCompiledCatalog(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.directory.name, "ingredients.json")
+        self.data = {
+            "flours": {
+                "arroz": {"name": "Harina de Arroz", "cost": 3.2, "protein": 7.0},
+                "avena": {"name": "Harina de Avena", "cost": 2.1, "protein": 17.0},
+            }
+        }
+        self.write_source(self.data)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_source(self, data):
+        with open(self.source, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    def compile(self, data) -> IngredientMatrix:
+        """Simula la primera carga: caché ausente, se lee el JSON y se compila."""
+        compiled = CompiledCatalog(self.source)
+        assert compiled.load() is None
+        matrix = IngredientMatrix.from_categories(data)
+        assert compiled.save(matrix, {"name": ["Harina de Arroz", "Harina de Avena"]})
+        return matrix
+
+    def test_load_maps_fresh_cache(self):
+        """Prueba que la caché al día se proyecte sin releer el JSON."""
+        matrix = self.compile(self.data)
+
+        loaded, text = CompiledCatalog(self.source).load()
+
+        assert loaded.names == matrix.names
+        assert loaded.columns == matrix.columns
+        assert loaded.categories == ["flours", "flours"]
+        assert loaded.version == matrix.version
+        assert text == {"name": ["Harina de Arroz", "Harina de Avena"]}
+        np.testing.assert_array_equal(loaded.values, matrix.values)
+        assert not loaded.values.flags.writeable
+        assert not loaded.values.flags.owndata
+
+    def test_touched_source_reuses_cache(self):
+        """Prueba que cambiar solo la fecha del JSON no obligue a recompilar."""
+        self.compile(self.data)
+        stat = os.stat(self.source)
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert CompiledCatalog(self.source).load() is not None
+
+    def test_changed_source_invalidates_cache(self):
+        """Prueba que un JSON modificado deje la caché obsoleta y se recompile."""
+        self.compile(self.data)
+        self.data["flours"]["avena"]["cost"] = 2.5
+        self.write_source(self.data)
+
+        matrix = self.compile(self.data)
+
+        loaded, _ = CompiledCatalog(self.source).load()
+        assert loaded.value("avena", "cost") == 2.5
+        assert loaded.version == matrix.version
+        # Solo queda la matriz de la versión vigente
+        npy = [name for name in os.listdir(self.directory.name) if name.endswith(".npy")]
+        assert npy == [f"ingredients.compiled-{matrix.version}.npy"]
+
+    def test_missing_source(self):
+        """Prueba que sin fuente no se cargue ni se guarde nada."""
+        compiled = CompiledCatalog(os.path.join(self.directory.name, "missing.json"))
+
+        assert compiled.load() is None
+        assert not compiled.save(IngredientMatrix.from_categories(self.data), {})
@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+
+from src.trivo_plm.domain.catalog import IngredientMatrix
+
+
+class TestIngredientMatrix(unittest.TestCase):
+    def setUp(self):
+        self.records = {
+            "arroz": {"name": "Harina de Arroz", "cost": 3.2, "protein": 7.0},
+            "avena": {"name": "Harina de Avena", "cost": 2.1, "protein": 17.0, "fiber": 11.0},
+        }
+
+    def test_from_records(self):
+        """Prueba la construcción desde un diccionario nombre→propiedades."""
+        matrix = IngredientMatrix.from_records(self.records)
+
+        assert matrix.names == ["arroz", "avena"]
+        assert matrix.columns == ("cost", "protein", "fiber")
+        assert matrix.values.flags["C_CONTIGUOUS"]
+        assert matrix.index["avena"] == 1
+        np.testing.assert_allclose(matrix.column("protein"), [7.0, 17.0])
+        # Los huecos quedan como NaN salvo que se pida un valor por defecto
+        assert np.isnan(matrix.column("fiber")[0])
+        np.testing.assert_allclose(matrix.column("fiber", 0.0), [0.0, 11.0])
+
+    def test_from_categories_flattens_nested_properties(self):
+        """Prueba el aplanado de propiedades anidadas por categoría."""
+        data = {
+            "flours": {
+                "wheat_flour": {
+                    "name": "wheat_flour",
+                    "cost": 1.5,
+                    "nutritional_value": {"protein": 10.0},
+                    "texture_properties": {"elasticity": 0.8},
+                }
+            },
+            "vegetables": {"beetroot": {"name": "beetroot", "cost": 2.5}},
+        }
+
+        matrix = IngredientMatrix.from_categories(data)
+
+        assert matrix.categories == ["flours", "vegetables"]
+        assert "nutritional_value.protein" in matrix.column_index
+        assert matrix.value("wheat_flour", "texture_properties.elasticity") == 0.8
+        assert matrix.value("beetroot", "texture_properties.elasticity", 0.5) == 0.5
+
+    def test_lookup_with_missing_names(self):
+        """Prueba la búsqueda vectorizada con ingredientes ausentes."""
+        matrix = IngredientMatrix.from_records(self.records)
+
+        values = matrix.lookup(["avena", "quinoa", "arroz"], "cost", default=0.1)
+
+        np.testing.assert_allclose(values, [2.1, 0.1, 3.2])
+        np.testing.assert_array_equal(matrix.rows(["quinoa", "arroz"]), [-1, 0])
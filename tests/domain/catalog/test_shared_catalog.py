@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.trivo_plm.domain.catalog import IngredientMatrix, SharedCatalog
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSharedCatalog(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.clock = FakeClock()
+        self.records = {
+            "arroz": {"name": "Harina de Arroz", "cost": 3.2, "protein": 7.0},
+            "avena": {"name": "Harina de Avena", "cost": 2.1, "protein": 17.0, "fiber": 11.0},
+        }
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def catalog(self):
+        return SharedCatalog(self.directory.name, refresh_interval=1.0, clock=self.clock)
+
+    def test_attach_maps_published_matrix(self):
+        """Prueba que otro proceso vea la misma matriz, proyectada y de solo lectura."""
+        matrix = IngredientMatrix.from_records(self.records)
+        self.catalog().publish(matrix, {"source": "test"})
+
+        attached, metadata = self.catalog().attach()
+
+        assert attached.names == matrix.names
+        assert attached.columns == matrix.columns
+        assert attached.version == matrix.version
+        assert metadata == {"source": "test"}
+        np.testing.assert_array_equal(attached.values, matrix.values)
+        assert not attached.values.flags.writeable
+        assert not attached.values.flags.owndata
+
+    def test_attach_without_publication(self):
+        """Prueba que sin publicación no haya nada que proyectar."""
+        assert self.catalog().attach() is None
+
+    def test_refresh_detects_new_version(self):
+        """Prueba que un worker adopte la versión nueva tras el intervalo."""
+        publisher, worker = self.catalog(), self.catalog()
+        publisher.publish(IngredientMatrix.from_records(self.records))
+        worker.attach()
+
+        self.records["arroz"]["cost"] = 4.0
+        version = publisher.publish(IngredientMatrix.from_records(self.records))
+
+        assert worker.refresh() is None  # todavía dentro del intervalo
+        self.clock.now = 2.0
+        matrix, _ = worker.refresh()
+        assert matrix.version == version
+        assert matrix.value("arroz", "cost") == 4.0
+        self.clock.now = 4.0
+        assert worker.refresh() is None
+
+    def test_old_versions_pruned(self):
+        """Prueba que solo se conserven la versión vigente y la anterior."""
+        catalog = self.catalog()
+        for cost in (1.0, 2.0, 3.0):
+            self.records["arroz"]["cost"] = cost
+            catalog.publish(IngredientMatrix.from_records(self.records))
+
+        files = [name for name in os.listdir(self.directory.name) if name.endswith(".npy")]
+        assert len(files) == 2
+        assert catalog.attach()[0].value("arroz", "cost") == 3.0
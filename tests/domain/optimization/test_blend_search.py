@@ -0,0 +1,79 @@
+import itertools
+import unittest
+
+import numpy as np
+
+from src.trivo_plm.domain.optimization import BlendSearch, LinearProgram
+
+
+class TestBlendSearch(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.scores = rng.uniform(0.2, 0.9, 8)
+        self.nutrients = rng.uniform(0.0, 20.0, (2, 8))
+        self.targets = [12.0, 11.0]
+
+    def brute_force(self, max_ingredients: int, min_share: float) -> float:
+        """Mejor score recorriendo todos los subconjuntos con un programa lineal cada uno."""
+        best = -np.inf
+        for k in range(1, max_ingredients + 1):
+            for subset in itertools.combinations(range(len(self.scores)), k):
+                subset = list(subset)
+                program = LinearProgram(
+                    -self.scores[subset],
+                    A_ub=-self.nutrients[:, subset],
+                    A_eq=np.ones((1, k)),
+                    bounded=np.ones(k, dtype=bool),
+                )
+                solution = program.solve(
+                    b_ub=-np.asarray(self.targets),
+                    b_eq=[1.0],
+                    lo=np.full(k, min_share),
+                    hi=np.ones(k),
+                )
+                if solution.is_optimal:
+                    best = max(best, -solution.objective)
+        return best
+
+    def test_matches_brute_force(self):
+        """Prueba que la búsqueda encuentra el óptimo de la enumeración completa."""
+        search = BlendSearch(self.scores, self.nutrients)
+
+        for max_ingredients in (1, 2, 3):
+            result = search.search(self.targets, max_ingredients, min_share=0.1)
+
+            assert result.complete
+            assert len(result.rows) <= max_ingredients
+            assert np.all(result.proportions >= 0.1 - 1e-9)
+            assert abs(result.proportions.sum() - 1.0) < 1e-9
+            blend = self.nutrients[:, result.rows] @ result.proportions
+            assert np.all(blend >= np.subtract(self.targets, 1e-9))
+            assert abs(result.score - self.brute_force(max_ingredients, 0.1)) < 1e-9
+
+    def test_zero_min_share(self):
+        """Prueba que sin proporción mínima la búsqueda termine y solo limite el tamaño."""
+        search = BlendSearch(self.scores, self.nutrients)
+
+        for max_ingredients in (1, 2, 3):
+            result = search.search(self.targets, max_ingredients, min_share=0.0, max_nodes=2_000)
+
+            assert result.complete
+            assert len(result.rows) <= max_ingredients
+            assert abs(result.score - self.brute_force(max_ingredients, 0.0)) < 1e-9
+
+    def test_infeasible_targets(self):
+        """Prueba que sin mezcla posible se devuelve None."""
+        search = BlendSearch(self.scores, self.nutrients)
+
+        assert search.search([25.0, 0.0], 3) is None
+
+    def test_invalid_arguments(self):
+        """Prueba que se rechacen tamaños de mezcla imposibles."""
+        search = BlendSearch(self.scores, self.nutrients)
+
+        with self.assertRaises(ValueError):
+            search.search(self.targets, 0)
+        with self.assertRaises(ValueError):
+            search.search(self.targets, 3, min_share=0.5)
+        with self.assertRaises(ValueError):
+            search.search(self.targets, 3, min_share=-0.1)
@@ -0,0 +1,128 @@
+import unittest
+
+import numpy as np
+
+from src.trivo_plm.domain.catalog import IngredientMatrix
+from src.trivo_plm.domain.optimization import BlendSolver, LinearProgram
+
+
+class TestLinearProgram(unittest.TestCase):
+    def test_solve_with_bounds_and_equality(self):
+        """Prueba un programa pequeño con solución conocida."""
+        # min -x0 - 2 x1  s.a.  x0 + x1 <= 1.5,  x0 - x1 = 0,  0 <= x <= 1
+        program = LinearProgram(
+            [-1.0, -2.0],
+            A_ub=[[1.0, 1.0]],
+            A_eq=[[1.0, -1.0]],
+            bounded=[True, True],
+        )
+        solution = program.solve(b_ub=[1.5], b_eq=[0.0], lo=[0.0, 0.0], hi=[1.0, 1.0])
+
+        assert solution.is_optimal
+        np.testing.assert_allclose(solution.x, [0.75, 0.75])
+        assert abs(solution.objective + 2.25) < 1e-9
+
+    def test_negative_cost_requires_upper_bound(self):
+        """Prueba que una variable de costo negativo sin cota se rechace."""
+        with self.assertRaises(ValueError):
+            LinearProgram([-1.0], A_ub=[[1.0]])
+
+    def test_warm_start_matches_cold_start(self):
+        """Prueba que arrancar desde una base previa da el mismo óptimo."""
+        program = LinearProgram([1.0, 3.0, 2.0], A_ub=[[-1.0, -4.0, -2.0]], A_eq=[[1.0, 1.0, 1.0]])
+        first = program.solve(b_ub=[-2.0], b_eq=[1.0])
+        cold = program.solve(b_ub=[-3.0], b_eq=[1.0])
+        warm = program.solve(b_ub=[-3.0], b_eq=[1.0], warm_start=first.basis)
+
+        assert warm.is_optimal
+        assert abs(warm.objective - cold.objective) < 1e-9
+
+
+class TestBlendSolver(unittest.TestCase):
+    def setUp(self):
+        self.catalog = {
+            "arroz": {"cost": 3.0, "protein": 7.0, "carbs": 80.0, "fiber": 2.0},
+            "avena": {"cost": 2.0, "protein": 17.0, "carbs": 66.0, "fiber": 11.0},
+            "guisante": {"cost": 6.0, "protein": 80.0, "carbs": 7.0, "fiber": 6.0},
+            "goma": {"cost": 15.0, "protein": 0.0, "carbs": 0.0, "fiber": 0.0},
+        }
+        self.solver = BlendSolver(
+            IngredientMatrix.from_records(self.catalog), {"goma": (0.02, 0.05)}
+        )
+
+    def test_cheapest_blend_meets_targets(self):
+        """Prueba que la mezcla cumple los objetivos al menor costo."""
+        solution = self.solver.solve(20.0, 60.0, 8.0, 5.0)
+
+        assert solution.is_optimal
+        x = solution.x
+        assert abs(x.sum() - 1.0) < 1e-9
+        assert self.solver.protein @ x >= 20.0 - 1e-9
+        assert self.solver.carbs @ x <= 60.0 + 1e-9
+        assert self.solver.fiber @ x >= 8.0 - 1e-9
+        assert x[self.solver.keys.index("goma")] >= 0.02 - 1e-9
+        # Óptimo calculado a mano: avena y guisante ajustan los carbohidratos, goma al mínimo
+        assert abs(solution.objective - 2.5773) < 1e-4
+
+    def test_infeasible_reports_minimal_conflict(self):
+        """Prueba que la infactibilidad señale solo los objetivos en conflicto."""
+        solution = self.solver.solve(15.0, 80.0, 12.0, 10.0)
+
+        assert not solution.is_optimal
+        assert solution.status == "infeasible"
+        assert solution.conflicting_rows == ["target_fiber"]
+
+    def test_budget_conflict(self):
+        """Prueba un conflicto entre proteína y presupuesto."""
+        solution = self.solver.solve(60.0, 80.0, 0.0, 3.0)
+
+        assert solution.conflicting_rows == ["target_protein", "max_cost"]
+
+    def test_solve_many_matches_individual_solves(self):
+        """Prueba que el lote dé los mismos resultados, en orden, que resolver uno a uno."""
+        targets = np.array(
+            [
+                [protein, carbs, 5.0, 6.0]
+                for protein in (5.0, 20.0, 70.0)
+                for carbs in (10.0, 40.0, 80.0)
+            ]
+        )
+
+        batch = list(self.solver.solve_many(targets))
+
+        assert len(batch) == len(targets)
+        for row, solution in zip(targets, batch):
+            single = self.solver.solve(*row)
+            assert solution.status == single.status
+            assert solution.conflicting_rows == single.conflicting_rows
+            if single.is_optimal:
+                assert abs(solution.objective - single.objective) < 1e-9
+
+    def test_sweep_warm_starts_from_previous_point(self):
+        """Prueba que el barrido coincida con resolver cada punto y pivote poco."""
+        values = np.linspace(5.0, 60.0, 56)
+
+        sweep = list(self.solver.sweep([5.0, 80.0, 2.0, 20.0], "target_protein", values))
+
+        assert len(sweep) == len(values)
+        for value, solution in zip(values, sweep):
+            single = self.solver.solve(value, 80.0, 2.0, 20.0)
+            assert solution.status == single.status
+            if single.is_optimal:
+                assert abs(solution.objective - single.objective) < 1e-9
+        assert sum(solution.iterations for solution in sweep) < len(values)
+
+    def test_sweep_in_chunks_carries_basis(self):
+        """Prueba que un barrido por tramos pivote lo mismo que de una vez."""
+        targets = [5.0, 80.0, 2.0, 20.0]
+        values = np.linspace(5.0, 60.0, 56)
+
+        whole = list(self.solver.sweep(targets, "target_protein", values))
+        chunked, basis = [], None
+        for start in range(0, len(values), 8):
+            chunk = self.solver.sweep(targets, "target_protein", values[start : start + 8], basis)
+            chunked.extend(chunk)
+            basis = next(s.basis for s in reversed(chunked) if s.is_optimal)
+
+        assert [s.iterations for s in chunked] == [s.iterations for s in whole]
+        assert [s.objective for s in chunked] == [s.objective for s in whole]
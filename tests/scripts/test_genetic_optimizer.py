@@ -0,0 +1,175 @@
+import random
+import unittest
+from functools import partial
+
+import numpy as np
+from deap import creator, tools
+
+from scripts import genetic_optimizer as ga
+
+MASA = "C12"
+INGREDIENTES = ["water", ga.BASE_INGREDIENTS[MASA]] + ga.ADJUSTABLE_INGREDIENTS
+
+
+def evaluar_receta(individuo):
+    """Fitness de una receta con la lógica original, ingrediente a ingrediente."""
+    receta = dict(zip(INGREDIENTES, individuo))
+    if receta.get(ga.BASE_INGREDIENTS[MASA], 0) <= 0:
+        return (ga.FITNESS_INVALIDO,) * 3
+    densidad, elasticidad = ga.calcular_contribuciones(receta)
+    if ga.calcular_sodio(receta) > 400:
+        densidad += 200.0
+    if ga.calcular_proteinas(receta) < 6:
+        elasticidad -= 200.0
+    if receta.get("vinegar", 0) > 0.01:
+        elasticidad += 0.05
+    costo = sum(ga.INGREDIENT_COSTS.get(ing, 0.1) * prop for ing, prop in receta.items())
+    return (densidad, costo, -elasticidad)
+
+
+def individuos_deap(fitness):
+    """Individuos de DEAP con el fitness de cada fila, en el mismo orden."""
+    individuos = []
+    for valores in fitness.tolist():
+        individuo = creator.Individual([])
+        individuo.fitness.values = tuple(valores)
+        individuos.append(individuo)
+    return individuos
+
+
+class TestGeneticOptimizerArray(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(11)
+        # Fitness redondeado para que haya empates y duplicados, como en poblaciones reales
+        self.fitness = self.rng.normal(size=(300, 3)).round(1)
+
+    def test_evaluate_population_matches_per_recipe(self):
+        """Prueba que el fitness vectorizado coincida con la evaluación receta a receta."""
+        poblacion = ga.crear_poblacion_inicial(200, MASA, INGREDIENTES, self.rng)
+        # Recetas sin ingrediente base, con mucha sal y sin vinagre
+        poblacion[0, INGREDIENTES.index(ga.BASE_INGREDIENTS[MASA])] = 0.0
+        poblacion[1, INGREDIENTES.index("salt")] = 0.5
+        poblacion[2, INGREDIENTES.index("vinegar")] = 0.0
+
+        fitness = ga.evaluate_population(poblacion, MASA, INGREDIENTES)
+
+        esperado = np.array([evaluar_receta(individuo) for individuo in poblacion.tolist()])
+        np.testing.assert_allclose(fitness, esperado, rtol=1e-12, atol=1e-12)
+        assert np.all(fitness[0] == ga.FITNESS_INVALIDO)
+        assert ga.evaluate_individual(poblacion[5].tolist(), MASA, INGREDIENTES) == tuple(
+            fitness[5]
+        )
+
+    def test_reload_catalog_updates_costs(self):
+        """Prueba que recargar el catálogo con otros precios cambie el costo evaluado."""
+        individuo = ga.crear_poblacion_inicial(1, MASA, INGREDIENTES, self.rng)[0].tolist()
+        antes = ga.evaluate_individual(individuo, MASA, INGREDIENTES)
+        self.addCleanup(ga.cargar_catalogo, ga.INGREDIENTS_DATA, ga.INGREDIENT_COSTS)
+
+        costos = {**ga.INGREDIENT_COSTS, ga.BASE_INGREDIENTS[MASA]: 10.0}
+        ga.cargar_catalogo(ga.INGREDIENTS_DATA, costos)
+        despues = ga.evaluate_individual(individuo, MASA, INGREDIENTES)
+
+        assert despues[1] > antes[1]
+        self.assertAlmostEqual(despues[1], evaluar_receta(individuo)[1], places=12)
+
+    def test_repair_population_matches_repair_individual(self):
+        """Prueba que la reparación por matriz coincida con la de cada individuo."""
+        poblacion = self.rng.uniform(-0.2, 1.2, (50, len(INGREDIENTES)))
+        minimos, maximos = ga._limites(
+            MASA, INGREDIENTES, ga.LIMITES_REPARACION, ga.LIMITES_BASE, (0.0, 1.0)
+        )
+
+        reparada = ga.repair_population(poblacion, minimos, maximos)
+
+        esperado = [ga.repair_individual(fila, MASA, INGREDIENTES) for fila in poblacion.tolist()]
+        np.testing.assert_allclose(reparada, esperado, rtol=1e-12)
+
+    def test_fronts_match_deap(self):
+        """Prueba que los frentes de Pareto coincidan con sortNondominated de DEAP."""
+        individuos = individuos_deap(self.fitness)
+        posicion = {id(individuo): i for i, individuo in enumerate(individuos)}
+
+        frentes = ga.frentes_no_dominados(self.fitness)
+
+        esperado = np.empty(len(individuos), dtype=int)
+        for rango, frente in enumerate(tools.sortNondominated(individuos, len(individuos))):
+            for individuo in frente:
+                esperado[posicion[id(individuo)]] = rango
+        np.testing.assert_array_equal(frentes, esperado)
+
+    def test_crowding_matches_deap(self):
+        """Prueba que la distancia de crowding coincida con assignCrowdingDist de DEAP."""
+        frente = self.fitness[ga.frentes_no_dominados(self.fitness) == 0]
+        individuos = individuos_deap(frente)
+
+        tools.emo.assignCrowdingDist(individuos)
+
+        esperado = [individuo.fitness.crowding_dist for individuo in individuos]
+        np.testing.assert_allclose(ga.distancia_crowding(frente), esperado, rtol=1e-12)
+
+    def test_selection_matches_deap(self):
+        """Prueba que sel_nsga2_population elija los mismos individuos que selNSGA2."""
+        fitness = self.rng.normal(size=(300, 3))
+        individuos = individuos_deap(fitness)
+        posicion = {id(individuo): i for i, individuo in enumerate(individuos)}
+
+        for k in (1, 30, 150, 299):
+            elegidos = ga.sel_nsga2_population(fitness, k)
+
+            esperado = {posicion[id(ind)] for ind in tools.selNSGA2(individuos, k)}
+            assert len(elegidos) == k
+            assert set(elegidos.tolist()) == esperado
+
+    def test_pool_matches_serial(self):
+        """Prueba que PoolGenetico dé el mismo resultado que en serie con la misma semilla."""
+        minimos, maximos = ga._limites(
+            MASA, INGREDIENTES, ga.LIMITES_REPARACION, ga.LIMITES_BASE, (0.0, 1.0)
+        )
+
+        def ejecutar(evaluate, mapa):
+            rng = np.random.default_rng(5)
+            return ga.ea_mu_plus_lambda_array(
+                ga.crear_poblacion_inicial(60, MASA, INGREDIENTES, rng),
+                partial(evaluate, masa_name=MASA, all_ingredients=INGREDIENTES),
+                minimos,
+                maximos,
+                mu=60,
+                lambda_=60,
+                cxpb=0.7,
+                mutpb=0.3,
+                ngen=4,
+                rng=rng,
+                mapa=mapa,
+            )
+
+        serie = ejecutar(ga.evaluate_population, map)
+        # Sin mínimo de individuos para que también la evaluación se reparta
+        with ga.PoolGenetico(2, min_individuals=0) as pool:
+            paralelo = ejecutar(pool.evaluate_population, pool.map)
+            islas = [
+                ga.evolucionar_islas(MASA, INGREDIENTES, 20, 4, 3, 2, 2, 9, mapa)
+                for mapa in (map, pool.map)
+            ]
+
+        np.testing.assert_array_equal(paralelo[0], serie[0])
+        np.testing.assert_array_equal(paralelo[1], serie[1])
+        # Poblaciones y fitness de cada isla, con 1 o 2 procesos
+        for en_serie, en_paralelo in zip(*islas):
+            for a, b in zip(en_serie, en_paralelo):
+                np.testing.assert_array_equal(a, b)
+
+    def test_deap_pool_matches_serial(self):
+        """Prueba que el motor DEAP evalúe en el pool y dé lo mismo que en serie."""
+
+        def ejecutar(pool):
+            random.seed(3)
+            return ga._optimize_deap(MASA, INGREDIENTES, 20, 3, pool)
+
+        serie = ejecutar(None)
+        with ga.PoolGenetico(2, min_individuals=0) as pool:
+            paralelo = ejecutar(pool)
+
+        assert paralelo[0] == serie[0]
+        for a, b in zip(paralelo[1], serie[1]):
+            np.testing.assert_array_equal(a, b)